@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+배치 팔레트 생성 벤치마크 (단일 색상 함수 반복 vs generate_palettes())
+
+Usage:
+    python bench_batch.py [--colors 10000] [--repeat 3] [--seed 1] [--space hsl|oklch]
+
+무작위 Primary 색상 N개의 팔레트(11단계 x Primary/Secondary, 보색, 유사색)를
+세 가지 방법으로 만들어 시간을 비교하고, 결과가 모두 같은지 확인한다.
+
+- 단일: 색상마다 generate_primary_palette()/generate_complementary()/
+  generate_analogous()를 부르는 기존 경로 (generate_palette.py "#..."와 같음)
+- 배치 (Python): generate_palettes(use_numpy=False)
+- 배치 (NumPy): generate_palettes() (NumPy가 없으면 건너뜀)
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import generate_palette  # noqa: E402
+from generate_palette import (  # noqa: E402
+    generate_analogous,
+    generate_complementary,
+    generate_palettes,
+    generate_primary_palette,
+)
+
+
+def scalar_palettes(colors: list[str], space: str) -> list[dict]:
+    """단일 색상 함수로 generate_palettes()와 같은 모양의 결과를 만든다."""
+    results = []
+    for color in colors:
+        complementary = generate_complementary(color, space)
+        results.append({
+            "color": color,
+            "primary": generate_primary_palette(color, space),
+            "complementary": complementary,
+            "secondary_color": complementary,
+            "secondary": generate_primary_palette(complementary, space),
+            "analogous": generate_analogous(color, space),
+        })
+    return results
+
+
+def best_of(repeat: int, fn, *args) -> tuple[float, list[dict]]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배치 팔레트 생성 벤치마크")
+    parser.add_argument("--colors", type=int, default=10000, help="색상 수 (기본: 10000)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수, 가장 빠른 회차 사용 (기본: 3)")
+    parser.add_argument("--seed", type=int, default=1, help="난수 시드 (기본: 1)")
+    parser.add_argument("--space", choices=generate_palette.SPACES, default="hsl", help="색 공간 (기본: hsl)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    colors = [f"#{rng.randrange(1 << 24):06X}" for _ in range(args.colors)]
+
+    runs = [("단일", scalar_palettes, (colors, args.space)),
+            ("배치 (Python)", generate_palettes, (colors, None, False, args.space))]
+    if generate_palette.np is not None:
+        runs.append(("배치 (NumPy)", generate_palettes, (colors, None, True, args.space)))
+
+    print(f"색상 {args.colors}개, {args.space}, {args.repeat}회 중 최소")
+    print(f"{'방법':<14} {'초':>8} {'색상/초':>10} {'배율':>7}  결과")
+    baseline_time, baseline = None, None
+    for label, fn, fn_args in runs:
+        elapsed, result = best_of(args.repeat, fn, *fn_args)
+        if baseline is None:
+            baseline_time, baseline = elapsed, result
+        same = "기준" if result is baseline else ("같음" if result == baseline else "다름")
+        print(f"{label:<14} {elapsed:>8.3f} {args.colors / elapsed:>10.0f} {baseline_time / elapsed:>6.1f}x  {same}")
+    if generate_palette.np is None:
+        print("NumPy가 설치되어 있지 않아 배열 경로는 건너뜀")
+
+
+if __name__ == "__main__":
+    main()
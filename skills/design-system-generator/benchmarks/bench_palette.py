@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+팔레트 생성 벤치마크 (변환 함수, 색상별/배치 팔레트, 형식 출력, 24비트 전체)
+
+Usage:
+    python bench_palette.py [--sample 20000] [--space hsl] [--repeat 3] [--seed 1]
+    python bench_palette.py --exhaustive [--space hsl] [--engine batch-numpy]
+
+표본 모드는 24비트 색상 공간에서 무작위로 고른 --sample개 색상으로
+
+- 변환 함수: rgb_to_hsl(), hsl_to_rgb(), generate_shade() 호출/초
+- 팔레트: golden_palettes.py의 엔진(single = 색상별 함수, batch-python,
+  batch-numpy)별 색상/초와 출력 요약값(SHA-256)이 같은지
+- 형식 출력: format_markdown/css/tailwind와 JSON(팔레트 하나), 여러 테마
+  CSS 스트림(iter_css_themes) 처리량
+
+을 잰다. --exhaustive는 #000000부터 #FFFFFF까지 16,777,216개 색상 전부를
+CHUNK개씩 엔진에 넣어 걸린 시간과 전체 출력의 SHA-256을 구하고,
+golden/exhaustive.sha256에 적힌 값과 비교한다 (batch-numpy로 색 공간당 수 분,
+single/batch-python은 훨씬 오래 걸린다). --write-digest는 그 값을 기록한다.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from generate_palette import (  # noqa: E402
+    SPACES,
+    format_css,
+    format_markdown,
+    format_tailwind,
+    generate_palettes,
+    generate_shade,
+    get_neutral_colors,
+    get_semantic_colors,
+    hex_to_rgb,
+    hsl_to_rgb,
+    iter_css_themes,
+    rgb_to_hsl,
+)
+from golden_palettes import available_engines, load_engine, palette_line  # noqa: E402
+
+DIGESTS = Path(__file__).resolve().parent / "golden" / "exhaustive.sha256"
+# --exhaustive에서 엔진에 한 번에 넣는 색상 수
+CHUNK = 1 << 16
+ALL_COLORS = 1 << 24
+
+
+def best_of(repeat: int, fn, *args):
+    """(가장 빠른 회차의 초, 마지막 결과)"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def digest(palettes, hasher=None):
+    """팔레트 출력의 SHA-256 (golden_palettes.palette_line() 줄 단위)"""
+    hasher = hasher or hashlib.sha256()
+    hasher.update("".join(palette_line(p) + "\n" for p in palettes).encode("ascii"))
+    return hasher
+
+
+def row(label: str, seconds: float, count: int, unit: str, note: str = "") -> str:
+    return f"  {label:<24} {seconds:>8.3f}초 {count / seconds:>12,.0f} {unit}/초  {note}".rstrip()
+
+
+def bench_conversions(colors: list[str], repeat: int):
+    rgbs = [hex_to_rgb(c) for c in colors]
+    hsls = [rgb_to_hsl(*rgb) for rgb in rgbs]
+    print("변환 함수")
+    seconds, _ = best_of(repeat, lambda: [rgb_to_hsl(r, g, b) for r, g, b in rgbs])
+    print(row("rgb_to_hsl", seconds, len(rgbs), "회"))
+    seconds, _ = best_of(repeat, lambda: [hsl_to_rgb(h, s, l) for h, s, l in hsls])
+    print(row("hsl_to_rgb", seconds, len(hsls), "회"))
+    seconds, _ = best_of(repeat, lambda: [generate_shade(c, 42) for c in colors])
+    print(row("generate_shade", seconds, len(colors), "회"))
+
+
+def bench_engines(colors: list[str], space: str, repeat: int):
+    print(f"팔레트 ({space}, 11단계 + 보색 + 유사색)")
+    reference = None
+    for name in available_engines():
+        engine = load_engine(name)
+        seconds, palettes = best_of(repeat, engine, colors, space)
+        value = digest(palettes).hexdigest()
+        reference = reference or value
+        print(row(name, seconds, len(colors), "색", f"sha256 {value[:12]} "
+                  + ("같음" if value == reference else "다름")))
+
+
+def bench_formatters(colors: list[str], repeat: int):
+    neutral, semantic = get_neutral_colors(), get_semantic_colors()
+    palettes = generate_palettes(colors)
+    pairs = [(p["primary"], p["secondary"]) for p in palettes]
+    print("형식 출력 (시맨틱 포함)")
+    for label, fn in (("format_markdown", format_markdown), ("format_css", format_css),
+                      ("format_tailwind", format_tailwind)):
+        seconds, _ = best_of(repeat, lambda f=fn: [f(p, s, neutral, semantic) for p, s in pairs])
+        print(row(label, seconds, len(pairs), "개"))
+    seconds, _ = best_of(repeat, lambda: [
+        json.dumps({"primary": p, "secondary": s, "neutral": neutral, "semantic": semantic}, indent=2)
+        for p, s in pairs])
+    print(row("json", seconds, len(pairs), "개"))
+
+    def stream() -> int:
+        out = io.StringIO()
+        out.writelines(iter_css_themes(((f"t{i}", p) for i, p in enumerate(palettes)), neutral, semantic))
+        return out.tell()
+
+    seconds, size = best_of(repeat, stream)
+    print(row("iter_css_themes", seconds, len(palettes), "테마", f"{size / seconds / 1e6:.1f}MB/초"))
+
+
+def read_digests() -> dict[str, str]:
+    if not DIGESTS.exists():
+        return {}
+    return dict(line.split()[::-1] for line in DIGESTS.read_text(encoding="utf-8").splitlines() if line.strip())
+
+
+def run_exhaustive(spaces: list[str], engine_name: str, write: bool):
+    engine = load_engine(engine_name)
+    expected = read_digests()
+    found = dict(expected)
+    print(f"24비트 전체 {ALL_COLORS:,}색, 엔진 {engine_name}, {CHUNK:,}개씩")
+    for space in spaces:
+        hasher = hashlib.sha256()
+        start = time.perf_counter()
+        for first in range(0, ALL_COLORS, CHUNK):
+            digest(engine([f"#{i:06X}" for i in range(first, first + CHUNK)], space), hasher)
+        seconds = time.perf_counter() - start
+        value = hasher.hexdigest()
+        found[space] = value
+        status = "기록 없음" if space not in expected else ("같음" if expected[space] == value else "다름")
+        print(row(space, seconds, ALL_COLORS, "색", f"sha256 {value[:16]} {status}"))
+        if status == "다름" and not write:
+            print(f"  {DIGESTS.name}: {expected[space][:16]}... (golden_palettes.py로 ΔE를 확인)")
+    if write:
+        DIGESTS.write_text("".join(f"{found[space]}  {space}\n" for space in SPACES if space in found),
+                           encoding="utf-8")
+        print(f"{DIGESTS} 기록")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="팔레트 생성 벤치마크")
+    parser.add_argument("--sample", type=int, default=20000, help="표본 색상 수 (기본: 20000)")
+    parser.add_argument("--space", choices=SPACES, action="append", help="색 공간 (기본: 모두)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수, 가장 빠른 회차 사용 (기본: 3)")
+    parser.add_argument("--seed", type=int, default=1, help="난수 시드 (기본: 1)")
+    parser.add_argument("--exhaustive", action="store_true", help="24비트 색상 전체의 시간과 출력 요약값")
+    parser.add_argument("--engine", help="--exhaustive 엔진 (기본: batch-numpy, 없으면 batch-python)")
+    parser.add_argument("--write-digest", action="store_true", help=f"--exhaustive 결과를 {DIGESTS.name}에 기록")
+    args = parser.parse_args()
+    spaces = args.space or list(SPACES)
+
+    if args.exhaustive:
+        run_exhaustive(spaces, args.engine or available_engines()[-1], args.write_digest)
+        return
+
+    rng = random.Random(args.seed)
+    colors = [f"#{rng.randrange(ALL_COLORS):06X}" for _ in range(args.sample)]
+    print(f"무작위 색상 {args.sample:,}개 (시드 {args.seed}), {args.repeat}회 중 최소")
+    bench_conversions(colors, args.repeat)
+    for space in spaces:
+        bench_engines(colors, space, args.repeat)
+    bench_formatters(colors, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+팔레트 골든 출력 코퍼스 (생성, 엔진별 검증, ΔE 보고)
+
+Usage:
+    python golden_palettes.py                                 # 모든 내장 엔진을 코퍼스와 비교
+    python golden_palettes.py --engine batch-numpy --space oklch
+    python golden_palettes.py --engine my_engine:palettes     # 다른 구현 (모듈:함수)
+    python golden_palettes.py --write                         # 코퍼스 다시 만들기
+
+golden/palettes.tsv에는 시드 색상 SEED_COUNT개(웹 안전 색상 216개, 회색 단계,
+채널 경계값, 기본 팔레트 색상, 고정 난수 시드의 무작위 색상)마다 색 공간별로
+11단계 HEX, 보색, 유사색이 들어 있다. 한 줄 형식:
+
+    hsl<TAB>#3B82F6<TAB>#F1F5FD,...,#001333<TAB>#F6AF3A<TAB>#3ADFF6,#513AF6
+
+엔진은 f(colors: list[str], space: str) -> [{"color", "primary": {단계: HEX},
+"complementary", "analogous": [HEX, HEX]}] 함수다 (generate_palettes()와 같은
+모양). 엔진 출력이 코퍼스와 한 값이라도 다르면 다른 값의 수와 CIEDE2000 ΔE
+분포, 가장 큰 차이를 출력하고 종료 코드 1로 끝난다. rgb_to_hsl()/hsl_to_rgb()/
+generate_shade()를 바꾸거나 새 엔진을 만들 때 비트 단위로 같은지(또는 얼마나
+다른지) 여기서 확인한다. --write는 출력이 의도적으로 바뀌었을 때만 쓴다.
+"""
+
+import argparse
+import importlib
+import math
+import random
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import generate_palette  # noqa: E402
+from generate_palette import (  # noqa: E402
+    LIGHTNESS_MAP,
+    SPACES,
+    generate_analogous,
+    generate_complementary,
+    generate_palettes,
+    generate_primary_palette,
+    get_neutral_colors,
+    get_semantic_colors,
+    hex_to_rgb,
+)
+from oklch import SRGB_TO_LINEAR  # noqa: E402
+
+GOLDEN = Path(__file__).resolve().parent / "golden" / "palettes.tsv"
+# 코퍼스 시드 색상 수와 무작위 색상의 난수 시드
+SEED_COUNT = 3072
+SEED = 20240601
+# ΔE00 구간 (보고용): 1 미만은 대부분 구분하기 어렵고, 2 이상은 나란히 놓으면 보인다
+DELTA_E_BINS = (0.5, 1.0, 2.0, 5.0)
+
+
+def seed_colors(count: int = SEED_COUNT, seed: int = SEED) -> list[str]:
+    """코퍼스 시드 색상 (결정적, 중복 없음)"""
+    levels = (0x00, 0x33, 0x66, 0x99, 0xCC, 0xFF)
+    colors = [f"#{r:02X}{g:02X}{b:02X}" for r in levels for g in levels for b in levels]
+    colors += [f"#{v:02X}{v:02X}{v:02X}" for v in range(0, 256, 5)]
+    # 한 채널만 경계값 근처 (반올림/클램프 경계)
+    edges = (0x01, 0x02, 0x7F, 0x80, 0xFD, 0xFE)
+    colors += [f"#{e:02X}{m:02X}{m:02X}" for e in edges for m in (0x00, 0xFF)]
+    colors += [f"#{m:02X}{e:02X}{m:02X}" for e in edges for m in (0x00, 0xFF)]
+    colors += [f"#{m:02X}{m:02X}{e:02X}" for e in edges for m in (0x00, 0xFF)]
+    colors += ["#3B82F6", *get_neutral_colors().values(),
+               *(color for variants in get_semantic_colors().values() for color in variants.values())]
+    rng = random.Random(seed)
+    seen = set()
+    unique = [c for c in colors if not (c in seen or seen.add(c))]
+    while len(unique) < count:
+        color = f"#{rng.randrange(1 << 24):06X}"
+        if color not in seen:
+            seen.add(color)
+            unique.append(color)
+    return unique[:count]
+
+
+def palette_fields(palette: dict) -> tuple[str, str, str, str]:
+    """(색상, "50단계,...,950단계", 보색, "유사색,유사색")"""
+    return (palette["color"], ",".join(palette["primary"][shade] for shade in LIGHTNESS_MAP),
+            palette["complementary"], ",".join(palette["analogous"]))
+
+
+def palette_line(palette: dict) -> str:
+    """팔레트 하나의 탭 구분 줄 (색 공간 제외, 줄바꿈 없음)"""
+    return "\t".join(palette_fields(palette))
+
+
+# 엔진 ---------------------------------------------------------------------
+
+def engine_single(colors: list[str], space: str) -> list[dict]:
+    """단일 색상 함수 (CLI와 같은 경로, 코퍼스를 만드는 기준)"""
+    return [{"color": color, "primary": generate_primary_palette(color, space),
+             "complementary": generate_complementary(color, space),
+             "analogous": generate_analogous(color, space)} for color in colors]
+
+
+def engine_batch_python(colors: list[str], space: str) -> list[dict]:
+    return generate_palettes(colors, use_numpy=False, space=space)
+
+
+def engine_batch_numpy(colors: list[str], space: str) -> list[dict]:
+    return generate_palettes(colors, use_numpy=True, space=space)
+
+
+ENGINES = {"single": engine_single, "batch-python": engine_batch_python, "batch-numpy": engine_batch_numpy}
+
+
+def available_engines() -> list[str]:
+    return [name for name in ENGINES if name != "batch-numpy" or generate_palette.np is not None]
+
+
+def load_engine(name: str) -> Callable[[list[str], str], list[dict]]:
+    """내장 엔진 이름 또는 "모듈:함수" (모듈은 현재 디렉터리나 scripts/에서 찾는다)"""
+    if name in ENGINES:
+        if name == "batch-numpy" and generate_palette.np is None:
+            raise ValueError("batch-numpy 엔진에는 NumPy가 필요합니다")
+        return ENGINES[name]
+    module, _, function = name.partition(":")
+    if not function:
+        raise ValueError(f"엔진은 {', '.join(ENGINES)} 또는 모듈:함수여야 합니다: {name}")
+    sys.path.insert(0, str(Path.cwd()))
+    return getattr(importlib.import_module(module), function)
+
+
+# CIEDE2000 ----------------------------------------------------------------
+
+def hex_to_lab(hex_color: str) -> tuple[float, float, float]:
+    """sRGB HEX -> CIE L*a*b* (D65)"""
+    r, g, b = (SRGB_TO_LINEAR[v] for v in hex_to_rgb(hex_color))
+    x = (0.4123908 * r + 0.3575843 * g + 0.1804808 * b) / 0.95047
+    y = 0.2126390 * r + 0.7151687 * g + 0.0721923 * b
+    z = (0.0193308 * r + 0.1191948 * g + 0.9505322 * b) / 1.08883
+
+    def f(t: float) -> float:
+        return t ** (1 / 3) if t > 216 / 24389 else (24389 / 27 * t + 16) / 116
+
+    fx, fy, fz = f(x), f(y), f(z)
+    return 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def delta_e_2000(lab1: tuple[float, float, float], lab2: tuple[float, float, float]) -> float:
+    """CIEDE2000 색차 (kL = kC = kH = 1, Sharma et al. 2005)"""
+    L1, a1, b1 = lab1
+    L2, a2, b2 = lab2
+    c_mean = (math.hypot(a1, b1) + math.hypot(a2, b2)) / 2
+    g = 0.5 * (1 - math.sqrt(c_mean ** 7 / (c_mean ** 7 + 25 ** 7)))
+    a1p, a2p = a1 * (1 + g), a2 * (1 + g)
+    c1p, c2p = math.hypot(a1p, b1), math.hypot(a2p, b2)
+    h1p = math.degrees(math.atan2(b1, a1p)) % 360 if c1p else 0.0
+    h2p = math.degrees(math.atan2(b2, a2p)) % 360 if c2p else 0.0
+
+    dLp = L2 - L1
+    dCp = c2p - c1p
+    dhp = 0.0
+    if c1p * c2p:
+        dhp = h2p - h1p
+        if dhp > 180:
+            dhp -= 360
+        elif dhp < -180:
+            dhp += 360
+    dHp = 2 * math.sqrt(c1p * c2p) * math.sin(math.radians(dhp / 2))
+
+    Lp = (L1 + L2) / 2
+    Cp = (c1p + c2p) / 2
+    if not c1p * c2p:
+        hp = h1p + h2p
+    elif abs(h1p - h2p) <= 180:
+        hp = (h1p + h2p) / 2
+    else:
+        hp = (h1p + h2p + 360) / 2 if h1p + h2p < 360 else (h1p + h2p - 360) / 2
+    t = (1 - 0.17 * math.cos(math.radians(hp - 30)) + 0.24 * math.cos(math.radians(2 * hp))
+         + 0.32 * math.cos(math.radians(3 * hp + 6)) - 0.20 * math.cos(math.radians(4 * hp - 63)))
+    sl = 1 + 0.015 * (Lp - 50) ** 2 / math.sqrt(20 + (Lp - 50) ** 2)
+    sc = 1 + 0.045 * Cp
+    sh = 1 + 0.015 * Cp * t
+    rt = (-2 * math.sqrt(Cp ** 7 / (Cp ** 7 + 25 ** 7))
+          * math.sin(math.radians(60 * math.exp(-(((hp - 275) / 25) ** 2)))))
+    return math.sqrt((dLp / sl) ** 2 + (dCp / sc) ** 2 + (dHp / sh) ** 2
+                     + rt * (dCp / sc) * (dHp / sh))
+
+
+def delta_e(hex1: str, hex2: str) -> float:
+    return delta_e_2000(hex_to_lab(hex1), hex_to_lab(hex2))
+
+
+# 코퍼스 -------------------------------------------------------------------
+
+def write_golden(path: Path = GOLDEN):
+    """기준 엔진(single)으로 코퍼스를 만든다."""
+    colors = seed_colors()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# space\tcolor\tshades (" + ",".join(LIGHTNESS_MAP) + ")\tcomplementary\tanalogous\n")
+        for space in SPACES:
+            for palette in engine_single(colors, space):
+                f.write(f"{space}\t{palette_line(palette)}\n")
+    print(f"{path}: {len(colors)}색 x {', '.join(SPACES)}")
+
+
+def read_golden(path: Path = GOLDEN) -> dict[str, list[tuple[str, str, str, str]]]:
+    """{색 공간: [palette_fields()와 같은 튜플]} (코퍼스 순서)"""
+    golden = {space: [] for space in SPACES}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#"):
+                continue
+            space, *fields = line.rstrip("\n").split("\t")
+            golden[space].append(tuple(fields))
+    return golden
+
+
+def compare(expected: list[tuple], actual: list[dict]) -> list[tuple[str, str, str, str, float]]:
+    """다른 값마다 (시드, 항목, 코퍼스 HEX, 엔진 HEX, ΔE00)"""
+    names = [f"primary-{shade}" for shade in LIGHTNESS_MAP] + ["complementary", "analogous-1", "analogous-2"]
+    differences = []
+    if len(actual) != len(expected):
+        raise ValueError(f"엔진이 {len(expected)}개가 아니라 {len(actual)}개의 팔레트를 돌려줬습니다")
+    for fields, palette in zip(expected, actual):
+        got = palette_fields(palette)
+        if got == fields:
+            continue
+        want_values = [*fields[1].split(","), fields[2], *fields[3].split(",")]
+        got_values = [*got[1].split(","), got[2], *got[3].split(",")]
+        for name, want, value in zip(names, want_values, got_values):
+            if want != value.upper():
+                differences.append((fields[0], name, want, value, delta_e(want, value)))
+    return differences
+
+
+def format_report(differences: list[tuple], total: int, worst: int = 10) -> str:
+    """ΔE 분포와 가장 큰 차이"""
+    values = sorted(d[4] for d in differences)
+    lines = [f"  다른 값 {len(values)}/{total} ({len(values) / total:.3%}), "
+             f"ΔE00 최대 {values[-1]:.3f}, 평균 {sum(values) / len(values):.3f}, "
+             f"p95 {values[min(len(values) - 1, math.ceil(0.95 * len(values)) - 1)]:.3f}"]
+    bounds = (0.0, *DELTA_E_BINS, math.inf)
+    lines.append("  ΔE00 구간: " + ", ".join(
+        f"{low:g}~{'' if high == math.inf else f'{high:g}'} {sum(1 for v in values if low <= v < high)}"
+        for low, high in zip(bounds, bounds[1:])))
+    for seed, name, want, value, de in sorted(differences, key=lambda d: -d[4])[:worst]:
+        lines.append(f"  {seed} {name:<14} {want} -> {value}  ΔE00 {de:.3f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="팔레트 골든 코퍼스 생성/검증")
+    parser.add_argument("--engine", action="append",
+                        help=f"검증할 엔진 ({', '.join(ENGINES)} 또는 모듈:함수, 여러 번 가능, 기본: 모든 내장 엔진)")
+    parser.add_argument("--space", choices=SPACES, action="append", help="색 공간 (기본: 모두)")
+    parser.add_argument("--worst", type=int, default=10, help="출력할 가장 큰 차이 수 (기본: 10)")
+    parser.add_argument("--write", action="store_true", help="기준 엔진(single)으로 코퍼스를 다시 만든다")
+    args = parser.parse_args()
+
+    if args.write:
+        write_golden()
+        return
+    try:
+        golden = read_golden()
+        engines = {name: load_engine(name) for name in args.engine or available_engines()}
+    except (OSError, ValueError, ImportError, AttributeError) as e:
+        print(f"오류: {e}")
+        sys.exit(2)
+
+    failed = False
+    print(f"코퍼스: {GOLDEN.name}, {len(golden[SPACES[0]])}색")
+    for name, engine in engines.items():
+        for space in args.space or SPACES:
+            expected = golden[space]
+            differences = compare(expected, engine([fields[0] for fields in expected], space))
+            total = len(expected) * (len(LIGHTNESS_MAP) + 3)
+            print(f"{name:<14} {space:<6} " + ("다름" if differences else f"같음 ({total}개 값)"))
+            if differences:
+                failed = True
+                print(format_report(differences, total, args.worst))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
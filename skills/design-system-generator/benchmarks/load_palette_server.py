@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+팔레트 서버 부하 테스트 (localhost)
+
+Usage:
+    python load_palette_server.py [--requests 20000] [--concurrency 8] [--colors 500]
+    python load_palette_server.py --url http://127.0.0.1:8420 --format css
+
+기본으로 palette_server.py를 별도 프로세스(빈 포트)로 띄우고, 스레드마다
+keep-alive 연결 하나로 /palette 요청을 보낸다. 색상은 --colors개 중에서
+Zipf 분포로 고른다 (몇몇 테넌트 색상이 자주 반복되는 실제 트래픽처럼).
+클라이언트에서 잰 처리량/지연 시간 백분위와 서버 /metrics의 캐시 적중률을
+출력하고, --cli-samples건은 요청마다 generate_palette.py를 실행하는 기존
+방식으로 재서 비교한다.
+"""
+
+import argparse
+import http.client
+import json
+import math
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+
+
+def percentile(values: list[float], p: float) -> float:
+    """정렬된 values의 p 백분위 (nearest-rank, 비어 있으면 0)"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))]
+
+
+def start_server_process(cache_size: int) -> tuple[subprocess.Popen, str]:
+    """palette_server.py --port 0을 띄우고 첫 줄에서 URL을 읽는다."""
+    process = subprocess.Popen(
+        [sys.executable, str(SCRIPTS / "palette_server.py"), "--port", "0", "--cache-size", str(cache_size)],
+        stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if "http://" not in line:
+        process.kill()
+        raise RuntimeError(f"서버를 시작하지 못했습니다: {line.strip()}")
+    return process, line[line.index("http://"):].strip()
+
+
+def get_json(url: str, path: str) -> dict:
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=10)
+    try:
+        conn.request("GET", path)
+        return json.loads(conn.getresponse().read())
+    finally:
+        conn.close()
+
+
+def run_load(url: str, paths: list[str], concurrency: int) -> tuple[float, list[float], int, int]:
+    """(걸린 초, 요청별 지연 ms, 오류 수, 클라이언트가 본 캐시 적중 수)"""
+    parts = urlsplit(url)
+    local = threading.local()
+    lock = threading.Lock()
+    totals = {"errors": 0, "hits": 0}
+
+    def request(path: str) -> float:
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            conn = local.conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=10)
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            ok, hit = response.status == 200, response.getheader("X-Cache") == "HIT"
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            local.conn = None
+            ok, hit = False, False
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            totals["errors"] += not ok
+            totals["hits"] += hit
+        return elapsed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(request, paths))
+    return time.perf_counter() - start, latencies, totals["errors"], totals["hits"]
+
+
+def run_cli(colors: list[str], fmt: str) -> list[float]:
+    """기존 방식: 요청마다 generate_palette.py 프로세스 하나 (ms)"""
+    latencies = []
+    for color in colors:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(SCRIPTS / "generate_palette.py"), color, "--format", fmt],
+                       capture_output=True, check=True)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def describe(label: str, latencies: list[float], wall: float | None = None) -> str:
+    values = sorted(latencies)
+    rate = len(values) / wall if wall else 1000 / (sum(values) / len(values))
+    return (f"{label:<12} {rate:>9.0f}건/초  p50 {percentile(values, 50):>7.2f}ms  "
+            f"p95 {percentile(values, 95):>7.2f}ms  p99 {percentile(values, 99):>7.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="팔레트 서버 부하 테스트")
+    parser.add_argument("--url", help="이미 떠 있는 서버 URL (없으면 별도 프로세스로 띄움)")
+    parser.add_argument("--requests", type=int, default=20000, help="요청 수 (기본: 20000)")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 연결 수 (기본: 8)")
+    parser.add_argument("--colors", type=int, default=500, help="서로 다른 색상 수 (기본: 500)")
+    parser.add_argument("--format", choices=["json", "markdown", "css", "tailwind"], default="json",
+                        help="/palette 출력 형식 (기본: json)")
+    parser.add_argument("--cache-size", type=int, default=4096, help="띄우는 서버의 LRU 크기 (기본: 4096)")
+    parser.add_argument("--cli-samples", type=int, default=20, help="비교용 CLI 실행 횟수, 0이면 건너뜀 (기본: 20)")
+    parser.add_argument("--seed", type=int, default=1, help="난수 시드 (기본: 1)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pool = [f"#{rng.randrange(1 << 24):06X}" for _ in range(args.colors)]
+    weights = [1 / (rank + 1) for rank in range(len(pool))]
+    colors = rng.choices(pool, weights, k=args.requests)
+    paths = [f"/palette?{urlencode({'color': color, 'format': args.format})}" for color in colors]
+
+    process = None
+    url = args.url
+    if not url:
+        process, url = start_server_process(args.cache_size)
+    try:
+        print(f"{url}, 요청 {args.requests}건, 동시 {args.concurrency}, 색상 {len(pool)}개, {args.format}")
+        wall, latencies, errors, hits = run_load(url, paths, args.concurrency)
+        print(describe("서버", latencies, wall) + f"  오류 {errors}건, 적중 {hits / len(paths):.1%}")
+        metrics = get_json(url, "/metrics")
+        cache, server = metrics["cache"], metrics["endpoints"].get("/palette", {}).get("latency_ms", {})
+        print(f"서버 /metrics: 캐시 {cache['size']}/{cache['capacity']}, 적중률 {cache['hit_rate']:.1%}, "
+              f"축출 {cache['evictions']}회, 처리 시간 p50 {server.get('p50', 0):.3f}ms "
+              f"p99 {server.get('p99', 0):.3f}ms")
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    if args.cli_samples:
+        print(describe("CLI 실행", run_cli(colors[:args.cli_samples], args.format)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+WCAG 2.x 명암비 (상대 휘도, 명암비 행렬, AA/AAA 판정, 밝기 이분 탐색)
+
+상대 휘도는 8비트 sRGB -> 선형 표(oklch.SRGB_TO_LINEAR)로 계산하고 HEX마다
+한 번만 계산해 둔다. contrast_matrix()는 색상 목록의 모든 쌍의 명암비를
+한 번에 계산한다 (NumPy가 있으면 배열 연산, 없으면 순수 Python).
+contrast_matrices()는 같은 길이의 색상 목록 여러 개(테마별 팔레트)를 한
+번의 배열 연산으로 처리한다.
+
+Usage:
+    contrast_ratio("#3B82F6", "#FFFFFF")             # 3.68
+    grade(4.6)                                      # "AA"
+    parse_target("AAA")                             # 7.0
+    bisect_lightness(make, 0.62, 0.0, passes)       # 통과하는 가장 가까운 밝기
+"""
+
+import functools
+from collections.abc import Callable
+
+from oklch import SRGB_TO_LINEAR
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# WCAG 2.x 기준 명암비 (large: 18pt 이상 또는 14pt 굵은 글자)
+LEVELS = {"AAA": 7.0, "AA": 4.5, "AAA-large": 4.5, "AA-large": 3.0}
+# grade()가 돌려주는 등급 (높은 것부터, 일반 글자 기준 + 큰 글자 AA)
+GRADES = (("AAA", 7.0), ("AA", 4.5), ("AA-large", 3.0))
+
+
+@functools.lru_cache(maxsize=65536)
+def relative_luminance(hex_color: str) -> float:
+    """HEX 색상의 WCAG 상대 휘도 (0~1)"""
+    hex_color = hex_color.lstrip("#")
+    r, g, b = (SRGB_TO_LINEAR[int(hex_color[i:i + 2], 16)] for i in (0, 2, 4))
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+
+def contrast_ratio(color1: str, color2: str) -> float:
+    """두 HEX 색상의 명암비 (1~21)"""
+    l1, l2 = relative_luminance(color1), relative_luminance(color2)
+    if l1 < l2:
+        l1, l2 = l2, l1
+    return (l1 + 0.05) / (l2 + 0.05)
+
+
+def grade(ratio: float) -> str:
+    """명암비의 등급: "AAA", "AA", "AA-large" (큰 글자만 AA), "fail" """
+    return next((name for name, minimum in GRADES if ratio >= minimum), "fail")
+
+
+def parse_target(text: str) -> float:
+    """목표 명암비: LEVELS 이름("AA", "AAA", "AA-large", ...) 또는 숫자 (1~21)"""
+    if text in LEVELS:
+        return LEVELS[text]
+    try:
+        ratio = float(text)
+    except ValueError:
+        raise ValueError(f"목표 명암비는 {', '.join(LEVELS)} 또는 1~21 사이 숫자여야 합니다: {text}") from None
+    if not 1 <= ratio <= 21:
+        raise ValueError(f"목표 명암비는 1~21 사이여야 합니다: {text}")
+    return ratio
+
+
+def contrast_matrix(colors: list[str]) -> list[list[float]]:
+    """colors의 모든 쌍의 명암비 행렬 (대칭, 대각선은 1)"""
+    if np is not None and colors:
+        return contrast_matrices([colors])[0].tolist()
+    luminance = [relative_luminance(c) for c in colors]
+    return [[(max(a, b) + 0.05) / (min(a, b) + 0.05) for b in luminance] for a in luminance]
+
+
+def contrast_matrices(palettes: list[list[str]]):
+    """같은 길이의 색상 목록 T개 -> (T, N, N) 명암비 배열 (NumPy 필요)
+
+    휘도는 서로 다른 HEX마다 한 번만 계산한다 (테마 사이에 공유되는
+    뉴트럴/시맨틱 색상 포함).
+    """
+    unique = {}
+    index = np.array([[unique.setdefault(c.upper(), len(unique)) for c in colors] for colors in palettes])
+    luminance = np.array([relative_luminance(c) for c in unique])[index]
+    high = np.maximum(luminance[:, :, None], luminance[:, None, :])
+    low = np.minimum(luminance[:, :, None], luminance[:, None, :])
+    return (high + 0.05) / (low + 0.05)
+
+
+def grade_counts(matrix) -> dict[str, int]:
+    """명암비 행렬의 서로 다른 쌍(i < j)을 등급별로 센다."""
+    size = len(matrix)
+    if np is not None and size:
+        ratios = np.asarray(matrix)[np.triu_indices(size, 1)]
+        # 등급 경계마다 그 이상인 쌍의 수
+        at_least = [int(np.count_nonzero(ratios >= minimum)) for _, minimum in GRADES]
+    else:
+        ratios = [matrix[i][j] for i in range(size) for j in range(i + 1, size)]
+        at_least = [sum(1 for r in ratios if r >= minimum) for _, minimum in GRADES]
+    counts = {}
+    previous = 0
+    for (name, _), count in zip(GRADES, at_least):
+        counts[name] = count - previous
+        previous = count
+    counts["fail"] = len(ratios) - previous
+    return counts
+
+
+def bisect_lightness(make: Callable[[float], str], start: float, end: float,
+                     passes: Callable[[str], bool], tolerance: float = 1e-4) -> tuple[float, str] | None:
+    """start에서 end 쪽으로 밝기를 바꿀 때 passes()를 만족하는 가장 가까운 밝기와 색상
+
+    make(밝기)는 그 밝기의 HEX를 만든다. start는 통과하지 못하는 밝기이고,
+    end에서도 통과하지 못하면 None이다. 명암비는 배경 휘도에서 멀어질수록
+    커지므로 start에서 end까지 통과 여부는 한 번만 바뀐다 (이분 탐색).
+    """
+    best = make(end)
+    if not passes(best):
+        return None
+    fail, ok = start, end
+    while abs(ok - fail) > tolerance:
+        middle = (fail + ok) / 2
+        color = make(middle)
+        if passes(color):
+            ok, best = middle, color
+        else:
+            fail = middle
+    return ok, best
@@ -3,18 +3,92 @@
 컬러 팔레트 생성 스크립트
 
 Primary 색상 하나로 전체 디자인 시스템 컬러 팔레트를 생성한다.
+--batch로 여러 색상의 팔레트를 한 번에 만들 수 있다 (NumPy가 있으면 배열 연산,
+없으면 순수 Python으로 같은 결과). --space oklch는 HSL 대신 OKLCH(oklch.py,
+같은 디렉터리에 둔다)에서 단계를 만든다. --contrast는 모든 색상 쌍의 WCAG
+명암비를, --ensure-contrast는 배경 위에서 목표 명암비를 만족하는 가장 가까운
+밝기의 색상을 찾는다 (contrast.py). --batch의 css/tailwind 형식은 테마마다
+[data-theme="이름"] 블록 하나를 생성하는 대로 흘려 쓴다 (여러 테마 CSS 파일과
+Tailwind 플러그인).
 
 Usage:
     python generate_palette.py "#3B82F6"
     python generate_palette.py "#3B82F6" --format tailwind
     python generate_palette.py "#3B82F6" --format css
     python generate_palette.py "#3B82F6" --with-semantic
+    python generate_palette.py "#3B82F6" --space oklch
+    python generate_palette.py "#3B82F6" --contrast
+    python generate_palette.py "#3B82F6" --ensure-contrast AA --background "#FFFFFF"
+    python generate_palette.py --batch brand-colors.txt
+    python generate_palette.py --batch tenants.txt --format css --dedupe --output themes.css
 """
 
 import argparse
 import colorsys
 import json
+import math
 import re
+import sys
+from collections.abc import Iterable, Iterator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from contrast import (
+    bisect_lightness,
+    contrast_matrices,
+    contrast_matrix,
+    contrast_ratio,
+    grade,
+    grade_counts,
+    parse_target,
+)
+from oklch import oklab_to_rgb, oklab_to_rgb_array, rgb_to_oklab, rgb_to_oklab_array
+
+HEX_PATTERN = re.compile(r"^#?[0-9A-Fa-f]{6}$")
+# 배치 입력의 테마 이름 ([data-theme="이름"])
+THEME_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+# 여러 테마 출력에서 한 번에 생성하는 팔레트 수 (청크마다 배열 연산, 출력은 청크 단위로 흘려 씀)
+BATCH_CHUNK = 512
+
+# 밝기 레벨 (50이 가장 밝고, 950이 가장 어두움)
+LIGHTNESS_MAP = {
+    "50": 97,
+    "100": 94,
+    "200": 86,
+    "300": 76,
+    "400": 64,
+    "500": 50,  # 기본 색상
+    "600": 42,
+    "700": 34,
+    "800": 26,
+    "900": 18,
+    "950": 10,
+}
+
+# 단계 생성 색 공간
+SPACES = ("hsl", "oklch")
+
+# OKLCH 단계별 (OKLab 밝기, 기준 색상 대비 채도 배율): Tailwind CSS v4 기본 팔레트의 곡선을 본뜸.
+# 색상 각도는 기준 색상 그대로이고, sRGB 색역 밖이면 채도를 줄인다 (oklch.oklab_to_rgb).
+OKLCH_SHADES = {
+    "50": (0.971, 0.07),
+    "100": (0.936, 0.15),
+    "200": (0.885, 0.28),
+    "300": (0.808, 0.50),
+    "400": (0.704, 0.77),
+    "500": (0.637, 1.00),
+    "600": (0.577, 1.05),
+    "700": (0.505, 0.98),
+    "800": (0.444, 0.83),
+    "900": (0.396, 0.66),
+    "950": (0.258, 0.43),
+}
+# 유사색 (±30도) 회전: OKLab a, b 평면에서 삼각함수 없이 회전
+_COS30 = math.cos(math.radians(30))
+_SIN30 = math.sin(math.radians(30))
 
 
 def hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
@@ -46,6 +120,11 @@ def generate_shade(hex_color: str, lightness_target: float) -> str:
     """특정 밝기로 색상 생성"""
     r, g, b = hex_to_rgb(hex_color)
     h, s, l = rgb_to_hsl(r, g, b)
+    return _shade(h, s, lightness_target)
+
+
+def _shade(h: float, s: float, lightness_target: float) -> str:
+    """HSL의 색상/채도로 특정 밝기의 HEX"""
     # 채도 약간 조정 (밝을수록 채도 낮게, 어두울수록 채도 높게)
     s_adjusted = s * (0.8 + 0.4 * (1 - lightness_target / 100))
     s_adjusted = min(100, max(0, s_adjusted))
@@ -53,32 +132,37 @@ def generate_shade(hex_color: str, lightness_target: float) -> str:
     return rgb_to_hex(new_r, new_g, new_b)
 
 
-def generate_primary_palette(hex_color: str) -> dict[str, str]:
-    """Primary 색상에서 전체 팔레트 생성"""
-    # 밝기 레벨 (50이 가장 밝고, 900이 가장 어두움)
-    lightness_map = {
-        "50": 97,
-        "100": 94,
-        "200": 86,
-        "300": 76,
-        "400": 64,
-        "500": 50,  # 기본 색상
-        "600": 42,
-        "700": 34,
-        "800": 26,
-        "900": 18,
-        "950": 10,
-    }
+def _oklch_shades(L: float, a: float, b: float) -> dict[str, str]:
+    """OKLab 기준 색상의 단계별 HEX (OKLCH_SHADES)"""
+    return {shade: rgb_to_hex(*oklab_to_rgb(lightness, a * factor, b * factor))
+            for shade, (lightness, factor) in OKLCH_SHADES.items()}
+
+
+def _oklch_related(L: float, a: float, b: float) -> tuple[str, list[str]]:
+    """OKLab 기준 색상의 (보색, [유사색 -30도, +30도]) (밝기와 채도 유지)"""
+    complementary = rgb_to_hex(*oklab_to_rgb(L, -a, -b))
+    analogous = [
+        rgb_to_hex(*oklab_to_rgb(L, a * _COS30 + b * _SIN30, b * _COS30 - a * _SIN30)),
+        rgb_to_hex(*oklab_to_rgb(L, a * _COS30 - b * _SIN30, a * _SIN30 + b * _COS30)),
+    ]
+    return complementary, analogous
+
 
+def generate_primary_palette(hex_color: str, space: str = "hsl") -> dict[str, str]:
+    """Primary 색상에서 전체 팔레트 생성"""
+    if space == "oklch":
+        return _oklch_shades(*rgb_to_oklab(*hex_to_rgb(hex_color)))
     palette = {}
-    for shade, lightness in lightness_map.items():
+    for shade, lightness in LIGHTNESS_MAP.items():
         palette[shade] = generate_shade(hex_color, lightness)
 
     return palette
 
 
-def generate_complementary(hex_color: str) -> str:
+def generate_complementary(hex_color: str, space: str = "hsl") -> str:
     """보색 생성"""
+    if space == "oklch":
+        return _oklch_related(*rgb_to_oklab(*hex_to_rgb(hex_color)))[0]
     r, g, b = hex_to_rgb(hex_color)
     h, s, l = rgb_to_hsl(r, g, b)
     h_comp = (h + 180) % 360
@@ -86,8 +170,10 @@ def generate_complementary(hex_color: str) -> str:
     return rgb_to_hex(new_r, new_g, new_b)
 
 
-def generate_analogous(hex_color: str) -> list[str]:
+def generate_analogous(hex_color: str, space: str = "hsl") -> list[str]:
     """유사색 생성 (±30도)"""
+    if space == "oklch":
+        return _oklch_related(*rgb_to_oklab(*hex_to_rgb(hex_color)))[1]
     r, g, b = hex_to_rgb(hex_color)
     h, s, l = rgb_to_hsl(r, g, b)
 
@@ -100,6 +186,211 @@ def generate_analogous(hex_color: str) -> list[str]:
     return colors
 
 
+def _derive_python(rgb: tuple[int, int, int], space: str,
+                   related: bool = True) -> tuple[dict[str, str], str | None, list[str] | None]:
+    """RGB 하나의 (단계별 팔레트, 보색, 유사색) (related=False이면 팔레트만)"""
+    if space == "oklch":
+        lab = rgb_to_oklab(*rgb)
+        complementary, analogous = _oklch_related(*lab) if related else (None, None)
+        return _oklch_shades(*lab), complementary, analogous
+    h, s, l = rgb_to_hsl(*rgb)
+    palette = {shade: _shade(h, s, lightness) for shade, lightness in LIGHTNESS_MAP.items()}
+    if not related:
+        return palette, None, None
+    complementary = rgb_to_hex(*hsl_to_rgb((h + 180) % 360, s, l))
+    analogous = [rgb_to_hex(*hsl_to_rgb((h + offset) % 360, s, l)) for offset in (-30, 30)]
+    return palette, complementary, analogous
+
+
+def _palettes_python(colors: list[str], secondaries: list[str | None], space: str) -> list[dict]:
+    """generate_palettes()의 순수 Python 경로
+
+    단일 색상 함수와 같은 계산을 하되 색상마다 HEX 파싱과 색 공간 변환은 한 번만 한다.
+    """
+    results = []
+    for color, secondary_color in zip(colors, secondaries):
+        palette, complementary, analogous = _derive_python(hex_to_rgb(color), space)
+        secondary_rgb = hex_to_rgb(secondary_color or complementary)
+        secondary, _, _ = _derive_python(secondary_rgb, space, related=False)
+        results.append({"color": color, "primary": palette, "complementary": complementary,
+                        "secondary_color": rgb_to_hex(*secondary_rgb), "secondary": secondary,
+                        "analogous": analogous})
+    return results
+
+
+# colorsys와 같은 상수
+_ONE_THIRD = 1.0 / 3.0
+_ONE_SIXTH = 1.0 / 6.0
+_TWO_THIRD = 2.0 / 3.0
+
+
+def _rgb_to_hsl_array(rgb):
+    """(N, 3) 정수 RGB 배열 -> (H, S, L) 배열 (rgb_to_hsl()과 같은 연산 순서)"""
+    r, g, b = (rgb[:, i] / 255.0 for i in range(3))
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    sumc = maxc + minc
+    rangec = maxc - minc
+    l = sumc / 2.0
+    gray = minc == maxc
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # colorsys.rgb_to_hls와 같이 2.0 - sumc가 아니라 2.0 - maxc - minc (gh-106498)
+        s = np.where(l <= 0.5, rangec / sumc, rangec / (2.0 - maxc - minc))
+        rc = (maxc - r) / rangec
+        gc = (maxc - g) / rangec
+        bc = (maxc - b) / rangec
+        h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+        h = (h / 6.0) % 1.0
+    h = np.where(gray, 0.0, h)
+    s = np.where(gray, 0.0, s)
+    return h * 360, s * 100, l * 100
+
+
+def _hue_channel(m1, m2, hue):
+    hue = hue % 1.0
+    return np.where(hue < _ONE_SIXTH, m1 + (m2 - m1) * hue * 6.0,
+                    np.where(hue < 0.5, m2,
+                             np.where(hue < _TWO_THIRD, m1 + (m2 - m1) * (_TWO_THIRD - hue) * 6.0, m1)))
+
+
+def _hsl_to_rgb_array(h, s, l):
+    """(H, S, L) 배열 (브로드캐스트) -> (..., 3) 정수 RGB 배열 (hsl_to_rgb()와 같은 연산 순서)"""
+    h, s, l = np.broadcast_arrays(h / 360, s / 100, l / 100)
+    m2 = np.where(l <= 0.5, l * (1.0 + s), l + s - (l * s))
+    m1 = 2.0 * l - m2
+    rgb = np.stack([_hue_channel(m1, m2, h + _ONE_THIRD), _hue_channel(m1, m2, h),
+                    _hue_channel(m1, m2, h - _ONE_THIRD)], axis=-1)
+    rgb = np.where((s == 0.0)[..., None], l[..., None], rgb)
+    return (rgb * 255).astype(np.int64)
+
+
+def _shades_array(h, s):
+    """(N,) 색상/채도 -> (N, 11, 3) 단계별 RGB (_shade()와 같은 채도 조정)"""
+    targets = np.array(list(LIGHTNESS_MAP.values()), dtype=np.float64)
+    s_adjusted = np.clip(s[:, None] * (0.8 + 0.4 * (1 - targets / 100)), 0, 100)
+    return _hsl_to_rgb_array(h[:, None], s_adjusted, targets[None, :])
+
+
+def _parse_hex_array(colors: list[str]):
+    """"#RRGGBB" 목록 -> (N, 3) 정수 RGB 배열 (hex_to_rgb()를 한 번에)"""
+    values = np.zeros(256, dtype=np.int64)
+    for i, digit in enumerate(b"0123456789abcdef"):
+        values[digit] = values[digit - 32 if digit >= ord("a") else digit] = i
+    chars = np.frombuffer("".join(colors).encode("ascii"), dtype=np.uint8).reshape(len(colors), 7)
+    return values[chars[:, 1::2]] * 16 + values[chars[:, 2::2]]
+
+
+def _hex_array(rgb):
+    """(..., 3) RGB 배열 -> 같은 모양(마지막 축 제외)의 "#RRGGBB" 문자열 배열"""
+    digits = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)
+    chars = np.empty(rgb.shape[:-1] + (7,), dtype=np.uint8)
+    chars[..., 0] = ord("#")
+    chars[..., 1::2] = digits[rgb >> 4]
+    chars[..., 2::2] = digits[rgb & 15]
+    return np.ascontiguousarray(chars).view("S7")[..., 0].astype("U7")
+
+
+def _derive_array(rgb, space: str, related: bool = True):
+    """(N, 3) RGB 배열 -> ((N, 11, 3) 단계별 RGB, (N, 3, 3) [보색, 유사색 -30도, +30도] 또는 None)"""
+    if space == "oklch":
+        L, a, b = rgb_to_oklab_array(rgb)
+        lightness, factor = (np.array(column) for column in zip(*OKLCH_SHADES.values()))
+        shades = oklab_to_rgb_array(lightness, a[:, None] * factor, b[:, None] * factor)
+        if not related:
+            return shades, None
+        # _oklch_related()와 같은 회전
+        rotated_a = np.stack([-a, a * _COS30 + b * _SIN30, a * _COS30 - b * _SIN30], axis=-1)
+        rotated_b = np.stack([-b, b * _COS30 - a * _SIN30, a * _SIN30 + b * _COS30], axis=-1)
+        return shades, oklab_to_rgb_array(L[:, None], rotated_a, rotated_b)
+    h, s, l = _rgb_to_hsl_array(rgb)
+    if not related:
+        return _shades_array(h, s), None
+    # 보색과 유사색 (-30도, +30도): (N, 3) 색상 각도 -> (N, 3, 3) RGB
+    offsets = np.array([180.0, -30.0, 30.0])
+    return _shades_array(h, s), _hsl_to_rgb_array((h[:, None] + offsets) % 360, s[:, None], l[:, None])
+
+
+def _palettes_numpy(colors: list[str], secondaries: list[str | None], space: str) -> list[dict]:
+    """generate_palettes()의 NumPy 경로 (_palettes_python()과 같은 결과)"""
+    primary, related = _derive_array(_parse_hex_array(colors), space)
+    secondary_rgb = related[:, 0]
+    given = [i for i, color in enumerate(secondaries) if color]
+    if given:
+        secondary_rgb = secondary_rgb.copy()
+        secondary_rgb[given] = _parse_hex_array([secondaries[i] for i in given])
+    secondary, _ = _derive_array(secondary_rgb, space, related=False)
+
+    shades = len(LIGHTNESS_MAP)
+    # 색상마다 [팔레트 11, 보색, 유사색 2, Secondary 색상, Secondary 팔레트 11] 순서의 HEX
+    stacked = np.concatenate([primary, related, secondary_rgb[:, None], secondary], axis=1)
+    names = list(LIGHTNESS_MAP)
+    results = []
+    for color, row in zip(colors, _hex_array(stacked).tolist()):
+        results.append({"color": color, "primary": dict(zip(names, row[:shades])), "complementary": row[shades],
+                        "secondary_color": row[shades + 3], "secondary": dict(zip(names, row[shades + 4:])),
+                        "analogous": row[shades + 1:shades + 3]})
+    return results
+
+
+def generate_palettes(colors: list[str], secondaries: list[str | None] | None = None,
+                      use_numpy: bool = True, space: str = "hsl") -> list[dict]:
+    """여러 Primary 색상의 팔레트를 한 번에 생성 (배치 API)
+
+    secondaries[i]가 없으면 보색으로 Secondary 팔레트를 만든다. NumPy가 있고
+    use_numpy이면 모든 색상의 색 공간 변환(space: "hsl" 또는 "oklch")을 배열
+    연산으로 하고, 아니면 순수 Python으로 계산한다. 어느 쪽이든 결과는 단일
+    색상 함수(generate_primary_palette(), generate_complementary(),
+    generate_analogous())와 같다.
+
+    반환: [{"color", "primary": {단계: HEX}, "complementary", "secondary_color",
+            "secondary": {단계: HEX}, "analogous": [HEX, HEX]}] (입력 순서)
+    """
+    if space not in SPACES:
+        raise ValueError(f"알 수 없는 색 공간: {space}")
+    secondaries = secondaries or [None] * len(colors)
+    if len(secondaries) != len(colors):
+        raise ValueError("secondaries의 길이가 colors와 다릅니다")
+    for color in (*colors, *(c for c in secondaries if c)):
+        if not HEX_PATTERN.match(color):
+            raise ValueError(f"올바른 HEX 색상이 아닙니다: {color}")
+    colors = [c if c.startswith("#") else f"#{c}" for c in colors]
+    secondaries = [(c if c.startswith("#") else f"#{c}") if c else None for c in secondaries]
+    if use_numpy and np is not None and colors:
+        return _palettes_numpy(colors, secondaries, space)
+    return _palettes_python(colors, secondaries, space)
+
+
+def read_batch(lines) -> tuple[list[str], list[str | None], list[str]]:
+    """배치 입력 (한 줄에 "[테마 이름] Primary [Secondary]", 공백/쉼표 구분, 빈 줄 무시)
+
+    테마 이름이 없으면 "theme-<순번>"이다 (HEX처럼 보이는 이름은 색상으로 읽는다).
+    잘못된 색상이 있으면 줄 번호를 담은 ValueError를 던진다.
+    """
+    colors, secondaries, names = [], [], []
+    for number, line in enumerate(lines, 1):
+        fields = line.replace(",", " ").split()
+        if not fields:
+            continue
+        name = None
+        if not HEX_PATTERN.match(fields[0]) and THEME_NAME_PATTERN.match(fields[0]):
+            name = fields.pop(0)
+        if not 1 <= len(fields) <= 2 or not all(HEX_PATTERN.match(f) for f in fields):
+            raise ValueError(f"{number}번째 줄: 올바른 HEX 색상이 아닙니다: {line.strip()}")
+        colors.append(fields[0])
+        secondaries.append(fields[1] if len(fields) == 2 else None)
+        names.append(name or f"theme-{len(colors)}")
+    return colors, secondaries, names
+
+
+def iter_palettes(colors: list[str], secondaries: list[str | None] | None = None, space: str = "hsl",
+                  chunk_size: int = BATCH_CHUNK) -> Iterator[list[dict]]:
+    """generate_palettes()를 chunk_size개씩 나눠 부르는 제너레이터 (청크마다 팔레트 목록)"""
+    secondaries = secondaries or [None] * len(colors)
+    for start in range(0, len(colors), chunk_size):
+        yield generate_palettes(colors[start:start + chunk_size], secondaries[start:start + chunk_size],
+                                space=space)
+
+
 def get_semantic_colors() -> dict[str, dict]:
     """시맨틱 컬러 (고정값)"""
     return {
@@ -143,6 +434,57 @@ def get_neutral_colors() -> dict[str, str]:
     }
 
 
+def palette_colors(primary: dict, secondary: dict, neutral: dict, semantic: dict) -> dict[str, str]:
+    """명암비를 검사할 모든 색상 {"primary-500": HEX, "gray-50": HEX, "success-main": HEX, ...}"""
+    return {
+        **{f"primary-{shade}": color for shade, color in primary.items()},
+        **{f"secondary-{shade}": color for shade, color in secondary.items()},
+        **{f"gray-{shade}": color for shade, color in neutral.items()},
+        **{f"{name}-{variant}": color for name, variants in semantic.items() for variant, color in variants.items()},
+    }
+
+
+def contrast_report(colors: dict[str, str]) -> dict:
+    """모든 색상 쌍의 명암비 행렬과 등급별 쌍 수
+
+    반환: {"colors": [이름], "matrix": [[명암비]], "summary": {"AAA", "AA", "AA-large", "fail"}}
+    """
+    matrix = contrast_matrix(list(colors.values()))
+    return {
+        "colors": list(colors),
+        "matrix": [[round(ratio, 2) for ratio in row] for row in matrix],
+        "summary": grade_counts(matrix),
+    }
+
+
+def ensure_contrast(hex_color: str, background: str, target: float,
+                    space: str = "hsl") -> tuple[str, float] | None:
+    """background 위에서 target 이상의 명암비를 내는, hex_color와 밝기만 다른 가장 가까운 색상
+
+    이미 만족하면 hex_color 그대로다. 아니면 더 어두운 쪽과 더 밝은 쪽을 각각
+    이분 탐색해 (HSL 밝기 또는 OKLab L) 원래 밝기에 더 가까운 쪽을 고른다.
+    양쪽 모두 불가능하면 None.
+    """
+    ratio = contrast_ratio(hex_color, background)
+    if ratio >= target:
+        return hex_color, ratio
+    if space == "oklch":
+        lightness, a, b = rgb_to_oklab(*hex_to_rgb(hex_color))
+        make = lambda value: rgb_to_hex(*oklab_to_rgb(value, a, b))  # noqa: E731
+        bounds, tolerance = (0.0, 1.0), 1e-4
+    else:
+        h, s, lightness = rgb_to_hsl(*hex_to_rgb(hex_color))
+        make = lambda value: rgb_to_hex(*hsl_to_rgb(h, s, value))  # noqa: E731
+        bounds, tolerance = (0.0, 100.0), 1e-2
+    found = [result for result in (
+        bisect_lightness(make, lightness, end, lambda c: contrast_ratio(c, background) >= target, tolerance)
+        for end in bounds) if result]
+    if not found:
+        return None
+    color = min(found, key=lambda result: abs(result[0] - lightness))[1]
+    return color, contrast_ratio(color, background)
+
+
 def format_tailwind(primary: dict, secondary: dict, neutral: dict, semantic: dict) -> str:
     """Tailwind CSS 설정 형식으로 출력"""
     config = {
@@ -209,15 +551,277 @@ def format_markdown(primary: dict, secondary: dict, neutral: dict, semantic: dic
     return "\n".join(lines)
 
 
+def format_contrast_markdown(colors: dict[str, str], report: dict) -> str:
+    """Primary/Secondary/시맨틱 색상을 가장 밝은/어두운 뉴트럴 위에 놓았을 때의 명암비 테이블"""
+    names = report["colors"]
+    light, dark = names.index("gray-50"), names.index("gray-950")
+    lines = ["## Contrast (WCAG)", "| Color | HEX | on gray-50 | on gray-950 |", "|-------|-----|------------|-------------|"]
+    for i, name in enumerate(names):
+        if name.startswith("gray-"):
+            continue
+        row = report["matrix"][i]
+        lines.append(f"| {name} | {colors[name]} | {row[light]:.2f} {grade(row[light])} "
+                     f"| {row[dark]:.2f} {grade(row[dark])} |")
+    summary = report["summary"]
+    lines.append(f"\n전체 {len(names)}색 {sum(summary.values())}쌍: "
+                 + ", ".join(f"{name} {count}" for name, count in summary.items()))
+    return "\n".join(lines)
+
+
+def format_accessible(accessible: dict) -> str:
+    """--ensure-contrast 결과 한 줄씩"""
+    lines = [f"명암비 {accessible['target']:g}:1 이상 (배경 {accessible['background']}):"]
+    for name in ("primary", "secondary"):
+        item = accessible[name]
+        found = f"{item['color']} {item['ratio']:.2f}:1" if item["color"] else "없음"
+        lines.append(f"  {name.capitalize()}: {item['from']} {item['from_ratio']:.2f}:1 → {found}")
+    return "\n".join(lines)
+
+
+def iter_batch_markdown(palettes: Iterable[dict], contrast: bool = False,
+                        accessible: bool = False) -> Iterator[str]:
+    """배치 결과를 색상당 한 행의 마크다운 테이블로 한 줄씩 출력 (contrast, accessible: 추가 열)"""
+    shades = list(LIGHTNESS_MAP)
+    # --contrast, --ensure-contrast 결과 열
+    extra = []
+    if contrast:
+        extra.append(("AA 이상 쌍", lambda p: f"{p['contrast']['AAA'] + p['contrast']['AA']}/{sum(p['contrast'].values())}"))
+    if accessible:
+        extra.append(("Accessible", lambda p: p["accessible"]["primary"]["color"] or "-"))
+    yield "| Color | " + " | ".join(shades) + " | Secondary | Analogous |" + "".join(f" {t} |" for t, _ in extra) + "\n"
+    yield "|-------|" + "|".join("-----" for _ in shades) + "|-----------|-----------|" + "-----|" * len(extra) + "\n"
+    for p in palettes:
+        yield (f"| {p['color']} | " + " | ".join(p["primary"][shade] for shade in shades)
+               + f" | {p['secondary_color']} | {', '.join(p['analogous'])} |"
+               + "".join(f" {cell(p)} |" for _, cell in extra) + "\n")
+
+
+def theme_blocks(themes: Iterable[tuple[str, dict]], neutral: dict, semantic: dict,
+                 dedupe: bool = False) -> Iterator[tuple[str, dict[str, str]]]:
+    """(선택자, {CSS 변수: HEX})를 테마마다 하나씩 내는 제너레이터
+
+    themes는 (테마 이름, generate_palettes() 항목)의 이터러블이다. dedupe이면
+    먼저 ":root"에 첫 테마의 전체 값(모든 테마에 같은 뉴트럴/시맨틱 포함)을 한
+    번만 내고, 각 테마에는 :root와 값이 다른 변수만 남긴다 (남는 게 없으면 블록을
+    내지 않는다). 이때 테마 블록은 서로 중첩되지 않아야 한다 (생략한 변수는
+    가장 가까운 조상에서 상속되므로).
+    """
+    shared = None
+    for name, palette in themes:
+        properties = {f"--color-{key}": color for key, color
+                      in palette_colors(palette["primary"], palette["secondary"], neutral, semantic).items()}
+        if dedupe:
+            if shared is None:
+                shared = properties
+                yield ":root", shared
+            properties = {key: color for key, color in properties.items() if shared[key] != color}
+            if not properties:
+                continue
+        yield f'[data-theme="{name}"]', properties
+
+
+def iter_css_themes(themes: Iterable[tuple[str, dict]], neutral: dict, semantic: dict,
+                    dedupe: bool = False) -> Iterator[str]:
+    """여러 테마 CSS: 테마마다 [data-theme="이름"] { --color-...: HEX; } 블록 문자열 하나"""
+    for index, (selector, properties) in enumerate(theme_blocks(themes, neutral, semantic, dedupe)):
+        yield (("\n" if index else "") + f"{selector} {{\n"
+               + "".join(f"  {key}: {color};\n" for key, color in properties.items()) + "}\n")
+
+
+def iter_tailwind_themes(themes: Iterable[tuple[str, dict]], neutral: dict, semantic: dict,
+                         dedupe: bool = False) -> Iterator[str]:
+    """여러 테마 Tailwind 설정: 색상은 CSS 변수를 참조하고, 테마 블록은 플러그인의 addBase()로 넣는다.
+
+    bg-primary-500 같은 유틸리티가 가장 가까운 data-theme의 값을 따른다.
+    """
+    colors = {
+        "primary": {shade: f"var(--color-primary-{shade})" for shade in LIGHTNESS_MAP},
+        "secondary": {shade: f"var(--color-secondary-{shade})" for shade in LIGHTNESS_MAP},
+        "gray": {shade: f"var(--color-gray-{shade})" for shade in neutral},
+        **{name: f"var(--color-{name}-main)" for name in semantic},
+    }
+    yield f"""// tailwind.config.js
+const plugin = require("tailwindcss/plugin")
+
+module.exports = {{
+  theme: {{
+    extend: {{
+      colors: {json.dumps(colors, indent=8)}
+    }}
+  }},
+  plugins: [
+    plugin(({{ addBase }}) => addBase({{
+"""
+    for selector, properties in theme_blocks(themes, neutral, semantic, dedupe):
+        yield f"      '{selector}': {json.dumps(properties)},\n"
+    yield """    })),
+  ],
+}
+"""
+
+
+def accessible_colors(primary_hex: str, secondary_hex: str, background: str, target: float, space: str) -> dict:
+    """--ensure-contrast: Primary/Secondary 기준 색상을 background 위에서 target을 만족하도록 조정"""
+    result = {"background": background, "target": target}
+    for name, color in (("primary", primary_hex), ("secondary", secondary_hex)):
+        found = ensure_contrast(color, background, target, space)
+        result[name] = {
+            "from": color,
+            "from_ratio": round(contrast_ratio(color, background), 2),
+            "color": found[0] if found else None,
+            "ratio": round(found[1], 2) if found else None,
+        }
+    return result
+
+
+def add_batch_contrast(palettes: list[dict], semantic: dict, use_numpy: bool = True):
+    """배치 팔레트마다 전체 색상 쌍의 등급별 수("contrast")를 넣는다.
+
+    NumPy가 있으면 모든 테마의 명암비 행렬을 한 번의 배열 연산으로 계산한다.
+    """
+    neutral = get_neutral_colors()
+    colors = [list(palette_colors(p["primary"], p["secondary"], neutral, semantic).values()) for p in palettes]
+    if use_numpy and np is not None and colors:
+        matrices = contrast_matrices(colors)
+    else:
+        matrices = [contrast_matrix(c) for c in colors]
+    for palette, matrix in zip(palettes, matrices):
+        palette["contrast"] = grade_counts(matrix)
+
+
+def render_palette(primary_hex: str, secondary_hex: str | None = None, fmt: str = "markdown",
+                   space: str = "hsl", with_semantic: bool = False, contrast: bool = False,
+                   target: float | None = None, background: str = "#FFFFFF") -> str:
+    """단일 색상 팔레트를 fmt 형식(tailwind, css, json, markdown)의 문자열로 만든다.
+
+    secondary_hex가 없으면 보색을 쓴다. CLI 출력에서 마지막 "추가 정보"를 뺀 부분과 같다.
+    """
+    # 팔레트 생성
+    primary = generate_primary_palette(primary_hex, space)
+
+    # Secondary 색상 (지정되지 않으면 보색 사용)
+    secondary_hex = secondary_hex or generate_complementary(primary_hex, space)
+    secondary = generate_primary_palette(secondary_hex, space)
+
+    neutral = get_neutral_colors()
+    semantic = get_semantic_colors() if with_semantic else {}
+    colors = palette_colors(primary, secondary, neutral, semantic)
+    report = contrast_report(colors) if contrast else None
+    accessible = (accessible_colors(primary_hex, secondary_hex, background, target, space)
+                  if target is not None else None)
+
+    # 출력
+    if fmt == "tailwind":
+        output = format_tailwind(primary, secondary, neutral, semantic)
+    elif fmt == "css":
+        output = format_css(primary, secondary, neutral, semantic)
+    elif fmt == "json":
+        result = {
+            "primary": primary,
+            "secondary": secondary,
+            "neutral": neutral,
+        }
+        if semantic:
+            result["semantic"] = semantic
+        if report:
+            result["contrast"] = report
+        if accessible:
+            result["accessible"] = accessible
+        return json.dumps(result, indent=2)
+    else:  # markdown
+        output = format_markdown(primary, secondary, neutral, semantic)
+    if report:
+        output += "\n\n" + format_contrast_markdown(colors, report)
+    if accessible:
+        output += "\n\n" + format_accessible(accessible)
+    return output
+
+
+def run_batch(args):
+    """--batch: 파일의 모든 색상 팔레트를 생성해 출력
+
+    markdown, css, tailwind는 BATCH_CHUNK개씩 생성하면서 바로 써서 전체 출력을
+    메모리에 두지 않는다. json은 한 문서로 모아 쓴다.
+    """
+    try:
+        if args.batch == "-":
+            colors, secondaries, names = read_batch(sys.stdin)
+        else:
+            with open(args.batch, encoding="utf-8") as f:
+                colors, secondaries, names = read_batch(f)
+    except (OSError, ValueError) as e:
+        print(f"오류: {e}")
+        return
+
+    neutral = get_neutral_colors()
+    semantic = get_semantic_colors() if args.with_semantic else {}
+
+    def palettes() -> Iterator[dict]:
+        for chunk in iter_palettes(colors, secondaries, args.space):
+            if args.contrast:
+                add_batch_contrast(chunk, semantic)
+            if args.target is not None:
+                for palette in chunk:
+                    palette["accessible"] = accessible_colors(palette["color"], palette["secondary_color"],
+                                                              args.background, args.target, args.space)
+            yield from chunk
+
+    if args.format == "css":
+        output = iter_css_themes(zip(names, palettes()), neutral, semantic, args.dedupe)
+    elif args.format == "tailwind":
+        output = iter_tailwind_themes(zip(names, palettes()), neutral, semantic, args.dedupe)
+    elif args.format == "markdown":
+        output = iter_batch_markdown(palettes(), args.contrast, args.target is not None)
+    else:
+        result = {"palettes": [{"name": name, **palette} for name, palette in zip(names, palettes())],
+                  "neutral": neutral}
+        if semantic:
+            result["semantic"] = semantic
+        output = [json.dumps(result, indent=2) + "\n"]
+
+    try:
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    except OSError as e:
+        print(f"오류: {e}")
+        return
+    try:
+        out.writelines(output)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
 def main():
     parser = argparse.ArgumentParser(description="컬러 팔레트 생성")
-    parser.add_argument("color", help="Primary HEX 색상 (예: #3B82F6)")
+    parser.add_argument("color", nargs="?", help="Primary HEX 색상 (예: #3B82F6)")
     parser.add_argument(
         "--format",
         "-f",
         choices=["tailwind", "css", "markdown", "json"],
-        default="markdown",
-        help="출력 형식",
+        help="출력 형식 (기본: markdown, --batch는 json)",
+    )
+    parser.add_argument(
+        "--space",
+        choices=SPACES,
+        default="hsl",
+        help="단계/보색/유사색을 만들 색 공간 (oklch: 지각적으로 균일한 밝기, 기본: hsl)",
+    )
+    parser.add_argument(
+        "--batch",
+        "-b",
+        metavar="FILE",
+        help='한 줄에 "[테마 이름] Primary [Secondary]"가 있는 파일의 팔레트를 한 번에 생성 (-는 표준 입력)',
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        metavar="FILE",
+        help="--batch 결과를 쓸 파일 (기본: 표준 출력)",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="--batch css/tailwind: 공통 값은 :root에 한 번만 쓰고 테마에는 다른 값만 씀",
     )
     parser.add_argument(
         "--secondary",
@@ -229,50 +833,58 @@ def main():
         action="store_true",
         help="시맨틱 컬러 포함",
     )
+    parser.add_argument(
+        "--contrast",
+        action="store_true",
+        help="모든 색상 쌍의 WCAG 명암비와 AA/AAA 판정 출력",
+    )
+    parser.add_argument(
+        "--ensure-contrast",
+        metavar="TARGET",
+        help="배경 위에서 목표 명암비(AA, AAA, AA-large 또는 숫자)를 만족하는 가장 가까운 밝기의 Primary/Secondary",
+    )
+    parser.add_argument(
+        "--background",
+        default="#FFFFFF",
+        help="--ensure-contrast의 배경 HEX 색상 (기본: #FFFFFF)",
+    )
 
     args = parser.parse_args()
+    args.target = None
+    if args.ensure_contrast:
+        try:
+            args.target = parse_target(args.ensure_contrast)
+        except ValueError as e:
+            parser.error(str(e))
+        if not HEX_PATTERN.match(args.background):
+            parser.error(f"올바른 HEX 배경 색상이 아닙니다: {args.background}")
+        args.background = (args.background if args.background.startswith("#") else f"#{args.background}").upper()
+
+    if args.batch:
+        run_batch(args)
+        return
+    if not args.color:
+        parser.error("Primary HEX 색상 또는 --batch 파일을 지정하세요")
+    args.format = args.format or "markdown"
 
     # HEX 색상 검증
-    if not re.match(r"^#?[0-9A-Fa-f]{6}$", args.color):
+    if not HEX_PATTERN.match(args.color):
         print(f"오류: 올바른 HEX 색상을 입력하세요 (예: #3B82F6)")
         return
 
     primary_hex = args.color if args.color.startswith("#") else f"#{args.color}"
-
-    # 팔레트 생성
-    primary = generate_primary_palette(primary_hex)
-
-    # Secondary 색상 (지정되지 않으면 보색 사용)
     if args.secondary:
         secondary_hex = args.secondary if args.secondary.startswith("#") else f"#{args.secondary}"
     else:
-        secondary_hex = generate_complementary(primary_hex)
-    secondary = generate_primary_palette(secondary_hex)
-
-    neutral = get_neutral_colors()
-    semantic = get_semantic_colors() if args.with_semantic else {}
+        secondary_hex = generate_complementary(primary_hex, args.space)
 
-    # 출력
-    if args.format == "tailwind":
-        print(format_tailwind(primary, secondary, neutral, semantic))
-    elif args.format == "css":
-        print(format_css(primary, secondary, neutral, semantic))
-    elif args.format == "json":
-        result = {
-            "primary": primary,
-            "secondary": secondary,
-            "neutral": neutral,
-        }
-        if semantic:
-            result["semantic"] = semantic
-        print(json.dumps(result, indent=2))
-    else:  # markdown
-        print(format_markdown(primary, secondary, neutral, semantic))
+    print(render_palette(primary_hex, secondary_hex, args.format, args.space, args.with_semantic,
+                         args.contrast, args.target, args.background))
 
     # 추가 정보
     print(f"\n---\nPrimary: {primary_hex}")
     print(f"Secondary (보색): {secondary_hex}")
-    analogous = generate_analogous(primary_hex)
+    analogous = generate_analogous(primary_hex, args.space)
     print(f"유사색: {analogous[0]}, {analogous[1]}")
 
 
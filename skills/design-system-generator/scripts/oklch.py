@@ -0,0 +1,242 @@
+"""
+OKLab / OKLCH 색 공간 변환 (sRGB 감마, 색역 매핑, 8비트 반올림)
+
+8비트 sRGB -> 선형 RGB는 미리 계산한 256개 항목 표(SRGB_TO_LINEAR)로,
+선형 RGB -> 8비트 sRGB는 "반올림 경계"의 선형 값 255개를 이진 탐색하여
+구한다 (감마 공간에서 정확히 반올림한 것과 같고 pow()가 필요 없다).
+sRGB 색역 밖의 색은 CSS Color 4의 색역 매핑(밝기와 색상을 유지하고
+채도를 이분 탐색으로 줄여 ΔEOK가 JND 아래가 될 때까지)으로 맞춘다.
+
+단일 색상 함수와 같은 이름에 _array가 붙은 NumPy 배열 함수가 있다
+(NumPy가 없으면 배열 함수는 쓸 수 없다). 두 경로는 같은 연산 순서로
+계산한다.
+
+Usage:
+    L, a, b = rgb_to_oklab(59, 130, 246)
+    rgb = oklab_to_rgb(0.7, a * 0.5, b * 0.5)      # 색역 매핑 + 8비트
+    L, C, H = rgb_to_oklch(59, 130, 246)
+"""
+
+import math
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def srgb_to_linear(c: float) -> float:
+    """감마 인코딩된 sRGB 값(0~1)을 선형 값으로 (IEC 61966-2-1)"""
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def linear_to_srgb(c: float) -> float:
+    """선형 값을 감마 인코딩된 sRGB 값(0~1)으로"""
+    return c * 12.92 if c <= 0.0031308 else 1.055 * c ** (1 / 2.4) - 0.055
+
+
+# 8비트 sRGB -> 선형 RGB
+SRGB_TO_LINEAR = tuple(srgb_to_linear(i / 255) for i in range(256))
+# 8비트 값 i와 i+1의 반올림 경계 ((i + 0.5) / 255)의 선형 값: bisect_right로 반올림한 8비트 값을 구한다
+_ROUNDING_BOUNDS = tuple(srgb_to_linear((i + 0.5) / 255) for i in range(255))
+
+# CSS Color 4 색역 매핑 상수
+JND = 0.02
+EPSILON = 0.0001
+# 선형 RGB가 [0, 1] 안에 있다고 보는 허용 오차 (8비트 색을 다시 변환할 때의 부동소수점 오차)
+_GAMUT_TOLERANCE = 1e-7
+
+
+def _cbrt(x: float) -> float:
+    return x ** (1 / 3) if x >= 0 else -((-x) ** (1 / 3))
+
+
+def linear_to_oklab(r: float, g: float, b: float) -> tuple[float, float, float]:
+    """선형 sRGB -> OKLab (Björn Ottosson, 2020)"""
+    l_ = _cbrt(0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b)
+    m_ = _cbrt(0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b)
+    s_ = _cbrt(0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b)
+    return (
+        0.2104542553 * l_ + 0.7936177850 * m_ - 0.0040720468 * s_,
+        1.9779984951 * l_ - 2.4285922050 * m_ + 0.4505937099 * s_,
+        0.0259040371 * l_ + 0.7827717662 * m_ - 0.8086757660 * s_,
+    )
+
+
+def oklab_to_linear(L: float, a: float, b: float) -> tuple[float, float, float]:
+    """OKLab -> 선형 sRGB (색역 밖이면 [0, 1]을 벗어난다)"""
+    l_ = L + 0.3963377774 * a + 0.2158037573 * b
+    m_ = L - 0.1055613458 * a - 0.0638541728 * b
+    s_ = L - 0.0894841775 * a - 1.2914855480 * b
+    l, m, s = l_ * l_ * l_, m_ * m_ * m_, s_ * s_ * s_
+    return (
+        4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s,
+        -1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s,
+        -0.0041960863 * l - 0.7034186147 * m + 1.7076147010 * s,
+    )
+
+
+def rgb_to_oklab(r: int, g: int, b: int) -> tuple[float, float, float]:
+    """8비트 sRGB -> OKLab"""
+    return linear_to_oklab(SRGB_TO_LINEAR[r], SRGB_TO_LINEAR[g], SRGB_TO_LINEAR[b])
+
+
+def encode_linear(rgb: tuple[float, float, float]) -> tuple[int, int, int]:
+    """선형 RGB -> 반올림한 8비트 sRGB ([0, 1] 밖은 잘라 냄)"""
+    return tuple(bisect_right(_ROUNDING_BOUNDS, c) for c in rgb)
+
+
+def _in_gamut(rgb: tuple[float, float, float]) -> bool:
+    return all(-_GAMUT_TOLERANCE <= c <= 1 + _GAMUT_TOLERANCE for c in rgb)
+
+
+def _clip(rgb: tuple[float, float, float]) -> tuple[float, float, float]:
+    return tuple(min(1.0, max(0.0, c)) for c in rgb)
+
+
+def _delta_eok(rgb: tuple[float, float, float], L: float, a: float, b: float) -> float:
+    L2, a2, b2 = linear_to_oklab(*rgb)
+    return math.sqrt((L - L2) ** 2 + (a - a2) ** 2 + (b - b2) ** 2)
+
+
+def oklab_to_rgb(L: float, a: float, b: float) -> tuple[int, int, int]:
+    """OKLab -> 8비트 sRGB (색역 밖이면 CSS Color 4 방식으로 채도를 줄여 맞춘다)"""
+    if L >= 1:
+        return 255, 255, 255
+    if L <= 0:
+        return 0, 0, 0
+    rgb = oklab_to_linear(L, a, b)
+    if _in_gamut(rgb):
+        return encode_linear(rgb)
+    clipped = _clip(rgb)
+    if _delta_eok(clipped, L, a, b) < JND:
+        return encode_linear(clipped)
+    # 밝기와 색상(a:b 비율)을 유지한 채 채도를 이분 탐색
+    chroma0 = math.sqrt(a * a + b * b)
+    low, high, low_in_gamut = 0.0, chroma0, True
+    while high - low > EPSILON:
+        chroma = (low + high) / 2
+        scale = chroma / chroma0
+        ca, cb = a * scale, b * scale
+        rgb = oklab_to_linear(L, ca, cb)
+        if low_in_gamut and _in_gamut(rgb):
+            low = chroma
+            continue
+        clipped = _clip(rgb)
+        delta = _delta_eok(clipped, L, ca, cb)
+        if delta < JND:
+            if JND - delta < EPSILON:
+                break
+            low_in_gamut = False
+            low = chroma
+        else:
+            high = chroma
+    return encode_linear(clipped)
+
+
+def rgb_to_oklch(r: int, g: int, b: int) -> tuple[float, float, float]:
+    """8비트 sRGB -> OKLCH (밝기 0~1, 채도, 색상 각도 0~360)"""
+    L, a, b_ = rgb_to_oklab(r, g, b)
+    return L, math.sqrt(a * a + b_ * b_), math.degrees(math.atan2(b_, a)) % 360
+
+
+def oklch_to_rgb(L: float, C: float, H: float) -> tuple[int, int, int]:
+    """OKLCH -> 8비트 sRGB (색역 매핑 포함)"""
+    h = math.radians(H)
+    return oklab_to_rgb(L, C * math.cos(h), C * math.sin(h))
+
+
+# -- NumPy 배열 경로 (단일 색상 함수와 같은 연산 순서) ----------------------------
+
+
+def _cbrt_array(x):
+    return np.sign(x) * np.abs(x) ** (1 / 3)
+
+
+def linear_to_oklab_array(rgb):
+    """(..., 3) 선형 sRGB -> OKLab 배열 (L, a, b)"""
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    l_ = _cbrt_array(0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b)
+    m_ = _cbrt_array(0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b)
+    s_ = _cbrt_array(0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b)
+    return (
+        0.2104542553 * l_ + 0.7936177850 * m_ - 0.0040720468 * s_,
+        1.9779984951 * l_ - 2.4285922050 * m_ + 0.4505937099 * s_,
+        0.0259040371 * l_ + 0.7827717662 * m_ - 0.8086757660 * s_,
+    )
+
+
+def oklab_to_linear_array(L, a, b):
+    """OKLab 배열 -> (..., 3) 선형 sRGB"""
+    l_ = L + 0.3963377774 * a + 0.2158037573 * b
+    m_ = L - 0.1055613458 * a - 0.0638541728 * b
+    s_ = L - 0.0894841775 * a - 1.2914855480 * b
+    l, m, s = l_ * l_ * l_, m_ * m_ * m_, s_ * s_ * s_
+    return np.stack([
+        4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s,
+        -1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s,
+        -0.0041960863 * l - 0.7034186147 * m + 1.7076147010 * s,
+    ], axis=-1)
+
+
+def rgb_to_oklab_array(rgb):
+    """(..., 3) 8비트 sRGB 정수 배열 -> OKLab 배열 (L, a, b)"""
+    return linear_to_oklab_array(np.asarray(SRGB_TO_LINEAR)[rgb])
+
+
+def encode_linear_array(rgb):
+    """(..., 3) 선형 RGB -> 반올림한 8비트 sRGB 정수 배열"""
+    return np.searchsorted(np.asarray(_ROUNDING_BOUNDS), rgb, side="right")
+
+
+def _in_gamut_array(rgb):
+    return np.all((rgb >= -_GAMUT_TOLERANCE) & (rgb <= 1 + _GAMUT_TOLERANCE), axis=-1)
+
+
+def _delta_eok_array(rgb, L, a, b):
+    L2, a2, b2 = linear_to_oklab_array(rgb)
+    return np.sqrt((L - L2) ** 2 + (a - a2) ** 2 + (b - b2) ** 2)
+
+
+def oklab_to_rgb_array(L, a, b):
+    """OKLab 배열 (브로드캐스트) -> (..., 3) 8비트 sRGB 정수 배열 (oklab_to_rgb()와 같은 색역 매핑)"""
+    L, a, b = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (L, a, b)))
+    shape = L.shape
+    L, a, b = L.ravel(), a.ravel(), b.ravel()
+    out = oklab_to_linear_array(L, a, b)
+    pending = np.flatnonzero((L < 1) & (L > 0) & ~_in_gamut_array(out))
+    out[pending] = np.clip(out[pending], 0.0, 1.0)
+    pending = pending[_delta_eok_array(out[pending], L[pending], a[pending], b[pending]) >= JND]
+
+    # 밝기와 색상(a:b 비율)을 유지한 채 채도를 이분 탐색 (남은 색상들을 한꺼번에)
+    chroma0 = np.sqrt(a[pending] * a[pending] + b[pending] * b[pending])
+    low = np.zeros(len(pending))
+    high = chroma0
+    low_in_gamut = np.ones(len(pending), dtype=bool)
+    while pending.size:
+        keep = high - low > EPSILON
+        pending, chroma0, low, high, low_in_gamut = (
+            pending[keep], chroma0[keep], low[keep], high[keep], low_in_gamut[keep])
+        if not pending.size:
+            break
+        chroma = (low + high) / 2
+        scale = chroma / chroma0
+        cl, ca, cb = L[pending], a[pending] * scale, b[pending] * scale
+        rgb = oklab_to_linear_array(cl, ca, cb)
+        inside = low_in_gamut & _in_gamut_array(rgb)
+        clipped = np.clip(rgb, 0.0, 1.0)
+        out[pending[~inside]] = clipped[~inside]
+        delta = _delta_eok_array(clipped, cl, ca, cb)
+        close = ~inside & (delta < JND)
+        low_in_gamut = low_in_gamut & ~close
+        low = np.where(inside | close, chroma, low)
+        high = np.where(~inside & ~close, chroma, high)
+        stop = close & (JND - delta < EPSILON)
+        pending, chroma0, low, high, low_in_gamut = (
+            pending[~stop], chroma0[~stop], low[~stop], high[~stop], low_in_gamut[~stop])
+
+    result = encode_linear_array(out)
+    result[L >= 1] = 255
+    result[L <= 0] = 0
+    return result.reshape(shape + (3,))
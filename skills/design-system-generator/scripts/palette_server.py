@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+팔레트 서버 (로컬 HTTP 또는 Unix 소켓 JSON 엔드포인트, 표준 라이브러리만 사용)
+
+테넌트 요청마다 generate_palette.py를 실행하면 인터프리터 시작, argparse, 팔레트
+재계산 비용을 매번 낸다. 이 서버는 한 프로세스에 떠 있으면서 같은 함수를 HTTP로
+제공하고, 결과(응답 본문)를 정규화한 HEX, 옵션, 형식을 키로 하는 크기 제한 LRU에
+저장한다. HTTP/1.1 keep-alive를 지원한다.
+
+Usage:
+    python palette_server.py [--port 8420] [--cache-size 4096]
+    python palette_server.py --unix /tmp/palette.sock
+
+    curl "http://127.0.0.1:8420/palette?color=%233B82F6&format=css"
+    curl -d '{"color": "#3B82F6", "space": "oklch", "contrast": true}' http://127.0.0.1:8420/palette
+    curl --unix-socket /tmp/palette.sock "http://localhost/analogous?color=3B82F6"
+    curl http://127.0.0.1:8420/metrics
+
+엔드포인트 (GET 쿼리 문자열 또는 POST JSON 본문):
+    /palette        render_palette(): color, secondary, format (json, markdown, css,
+                    tailwind, 기본 json), space, with_semantic, contrast,
+                    ensure_contrast, background
+    /primary        generate_primary_palette(): color, space
+    /complementary  generate_complementary(): color, space
+    /analogous      generate_analogous(): color, space
+    /metrics        캐시 적중률, 엔드포인트별 요청 수와 지연 시간 백분위
+    /health         {"status": "ok"}
+"""
+
+import argparse
+import json
+import math
+import os
+import socketserver
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from contrast import parse_target
+from generate_palette import (
+    HEX_PATTERN,
+    SPACES,
+    generate_analogous,
+    generate_complementary,
+    generate_primary_palette,
+    render_palette,
+)
+
+# 기본 LRU 항목 수
+DEFAULT_CACHE_SIZE = 4096
+# 지연 시간 백분위를 계산하는 최근 요청 수 (엔드포인트별)
+LATENCY_WINDOW = 10000
+# POST 본문 최대 크기 (바이트)
+MAX_BODY = 64 * 1024
+
+# /palette 형식별 Content-Type
+CONTENT_TYPES = {
+    "json": "application/json",
+    "markdown": "text/markdown; charset=utf-8",
+    "css": "text/css; charset=utf-8",
+    "tailwind": "text/javascript; charset=utf-8",
+}
+_TRUE = {"1", "true", "yes", "on"}
+
+
+class LRUCache:
+    """크기 제한 LRU (여러 스레드에서 써도 된다)
+
+    같은 키가 동시에 처음 요청되면 두 스레드가 모두 계산할 수 있지만, 결과는
+    같으므로 하나만 남는다.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CACHE_SIZE):
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get_or_compute(self, key, compute):
+        """(값, 캐시 적중 여부)"""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._items[key], True
+            self.stats["misses"] += 1
+        value = compute()
+        if self.capacity <= 0:
+            return value, False
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+                self.stats["evictions"] += 1
+        return value, False
+
+    def summary(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            size = len(self._items)
+        lookups = stats["hits"] + stats["misses"]
+        return {"size": size, "capacity": self.capacity, **stats,
+                "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0}
+
+
+def percentile(values: list[float], p: float) -> float:
+    """정렬된 values의 p 백분위 (nearest-rank, 비어 있으면 0)"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))]
+
+
+class Metrics:
+    """엔드포인트별 요청 수, 오류 수, 캐시 적중 수, 최근 LATENCY_WINDOW건의 지연 시간"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, ms: float, error: bool = False, hit: bool = False):
+        with self._lock:
+            entry = self._endpoints.setdefault(
+                endpoint, {"requests": 0, "errors": 0, "hits": 0, "latencies": deque(maxlen=LATENCY_WINDOW)})
+            entry["requests"] += 1
+            entry["errors"] += error
+            entry["hits"] += hit
+            entry["latencies"].append(ms)
+
+    @staticmethod
+    def _latency(values: list[float]) -> dict:
+        values = sorted(values)
+        return {
+            "p50": round(percentile(values, 50), 3),
+            "p95": round(percentile(values, 95), 3),
+            "p99": round(percentile(values, 99), 3),
+            "max": round(values[-1], 3) if values else 0.0,
+            "mean": round(sum(values) / len(values), 3) if values else 0.0,
+        }
+
+    def summary(self, cache: LRUCache) -> dict:
+        with self._lock:
+            endpoints = {name: {**entry, "latencies": list(entry["latencies"])}
+                         for name, entry in self._endpoints.items()}
+        uptime = time.perf_counter() - self.started
+        requests = sum(entry["requests"] for entry in endpoints.values())
+        return {
+            "uptime_s": round(uptime, 3),
+            "requests": requests,
+            "errors": sum(entry["errors"] for entry in endpoints.values()),
+            "throughput": round(requests / uptime, 2) if uptime > 0 else 0.0,
+            "cache": cache.summary(),
+            "latency_ms": self._latency([ms for entry in endpoints.values() for ms in entry["latencies"]]),
+            "endpoints": {
+                name: {"requests": entry["requests"], "errors": entry["errors"], "hits": entry["hits"],
+                       "latency_ms": self._latency(entry["latencies"])}
+                for name, entry in sorted(endpoints.items())
+            },
+        }
+
+
+def _hex(value, field: str) -> str:
+    """정규화한 HEX ("#" + 대문자)"""
+    if not isinstance(value, str) or not HEX_PATTERN.match(value):
+        raise ValueError(f"{field}: 올바른 HEX 색상이 아닙니다: {value}")
+    return "#" + value.lstrip("#").upper()
+
+
+def _flag(value) -> bool:
+    return value is True or (isinstance(value, str) and value.lower() in _TRUE)
+
+
+def cache_key(endpoint: str, params: dict) -> tuple:
+    """요청 매개변수를 검증/정규화한 캐시 키 (잘못되면 ValueError)"""
+    color = _hex(params.get("color"), "color")
+    space = params.get("space") or "hsl"
+    if not isinstance(space, str) or space not in SPACES:
+        raise ValueError(f"space: {', '.join(SPACES)} 중 하나여야 합니다: {space}")
+    if endpoint != "/palette":
+        return endpoint, color, space
+    fmt = params.get("format") or "json"
+    if not isinstance(fmt, str) or fmt not in CONTENT_TYPES:
+        raise ValueError(f"format: {', '.join(CONTENT_TYPES)} 중 하나여야 합니다: {fmt}")
+    secondary = _hex(params["secondary"], "secondary") if params.get("secondary") else None
+    target = parse_target(str(params["ensure_contrast"])) if params.get("ensure_contrast") else None
+    background = _hex(params.get("background") or "#FFFFFF", "background")
+    return (endpoint, color, space, fmt, secondary, _flag(params.get("with_semantic")),
+            _flag(params.get("contrast")), target, background if target is not None else None)
+
+
+def compute(key: tuple) -> tuple[bytes, str]:
+    """캐시 키의 (응답 본문, Content-Type)"""
+    endpoint, color, space = key[:3]
+    if endpoint == "/palette":
+        _, _, _, fmt, secondary, with_semantic, contrast, target, background = key
+        output = render_palette(color, secondary, fmt, space, with_semantic, contrast, target,
+                                background or "#FFFFFF")
+        return (output + "\n").encode("utf-8"), CONTENT_TYPES[fmt]
+    if endpoint == "/primary":
+        doc = {"color": color, "primary": generate_primary_palette(color, space)}
+    elif endpoint == "/complementary":
+        doc = {"color": color, "complementary": generate_complementary(color, space)}
+    else:
+        doc = {"color": color, "analogous": generate_analogous(color, space)}
+    return json.dumps(doc).encode("utf-8"), CONTENT_TYPES["json"]
+
+
+ENDPOINTS = ("/palette", "/primary", "/complementary", "/analogous")
+
+
+class PaletteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # 헤더와 본문을 따로 쓰므로, Nagle 알고리즘이 keep-alive 응답을 40ms씩 붙잡지 않게 한다
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        self._handle(url.path.rstrip("/") or "/", params)
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length < 0:
+                raise ValueError
+        except ValueError:
+            # 본문 경계를 알 수 없으므로 이 연결은 더 쓰지 않는다
+            self.close_connection = True
+            self._send(400, {"error": f"잘못된 Content-Length: {self.headers.get('Content-Length')!r}"})
+            return
+        if length > MAX_BODY:
+            self.close_connection = True
+            self._send(413, {"error": f"본문이 너무 큽니다 (최대 {MAX_BODY}바이트)"})
+            return
+        try:
+            params = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(params, dict):
+                raise ValueError("JSON 객체가 아닙니다")
+        except ValueError as e:
+            self._send(400, {"error": f"잘못된 JSON 본문: {e}"})
+            return
+        self._handle(urlsplit(self.path).path.rstrip("/") or "/", params)
+
+    def _handle(self, path: str, params: dict):
+        start = time.perf_counter()
+        hit = error = False
+        if path == "/health":
+            self._send(200, {"status": "ok"})
+            return
+        if path == "/metrics":
+            self._send(200, self.server.metrics.summary(self.server.cache))
+            return
+        if path not in ENDPOINTS:
+            self._send(404, {"error": f"알 수 없는 엔드포인트: {path}", "endpoints": list(ENDPOINTS)})
+            return
+        try:
+            key = cache_key(path, params)
+            (body, content_type), hit = self.server.cache.get_or_compute(key, lambda: compute(key))
+            self._send_bytes(200, body, content_type, {"X-Cache": "HIT" if hit else "MISS"})
+        except ValueError as e:
+            error = True
+            self._send(400, {"error": str(e)})
+        finally:
+            self.server.metrics.record(path, (time.perf_counter() - start) * 1000, error, hit)
+
+    def _send(self, status: int, doc: dict):
+        self._send_bytes(status, json.dumps(doc, ensure_ascii=False).encode("utf-8"), CONTENT_TYPES["json"])
+
+    def _send_bytes(self, status: int, body: bytes, content_type: str, headers: dict | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix 소켓에서는 client_address가 빈 문자열이다
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PaletteServer(ThreadingHTTPServer):
+    # socketserver 기본 listen 백로그(5)로는 동시 연결이 몰릴 때 SYN이 버려져 1초씩 지연된다
+    request_queue_size = 128
+    daemon_threads = True
+
+    def __init__(self, address, cache_size: int = DEFAULT_CACHE_SIZE):
+        super().__init__(address, PaletteHandler)
+        self.cache = LRUCache(cache_size)
+        self.metrics = Metrics()
+
+
+class UnixPaletteHandler(PaletteHandler):
+    disable_nagle_algorithm = False  # TCP_NODELAY는 Unix 소켓에 쓸 수 없다
+
+
+class UnixPaletteServer(socketserver.ThreadingUnixStreamServer):
+    request_queue_size = 128
+    daemon_threads = True
+
+    def __init__(self, path: str, cache_size: int = DEFAULT_CACHE_SIZE):
+        if os.path.exists(path):
+            os.unlink(path)  # 이전 실행이 남긴 소켓 파일
+        super().__init__(path, UnixPaletteHandler)
+        self.cache = LRUCache(cache_size)
+        self.metrics = Metrics()
+
+
+def start_server(port: int = 0, cache_size: int = DEFAULT_CACHE_SIZE) -> tuple[PaletteServer, str]:
+    """백그라운드 스레드에서 서버를 띄우고 (server, URL)을 반환"""
+    server = PaletteServer(("127.0.0.1", port), cache_size)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="팔레트 서버 (HTTP/Unix 소켓 JSON 엔드포인트)")
+    parser.add_argument("--host", default="127.0.0.1", help="바인드 주소 (기본: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8420, help="포트, 0이면 빈 포트 (기본: 8420)")
+    parser.add_argument("--unix", metavar="PATH", help="TCP 대신 Unix 소켓 경로에서 대기")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"LRU 캐시 항목 수, 0이면 캐시 안 함 (기본: {DEFAULT_CACHE_SIZE})")
+    args = parser.parse_args()
+
+    if args.unix:
+        server = UnixPaletteServer(args.unix, args.cache_size)
+        print(f"팔레트 서버: unix:{args.unix}", flush=True)
+    else:
+        server = PaletteServer((args.host, args.port), args.cache_size)
+        print(f"팔레트 서버: http://{args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.unix and os.path.exists(args.unix):
+            os.unlink(args.unix)
+
+
+if __name__ == "__main__":
+    main()
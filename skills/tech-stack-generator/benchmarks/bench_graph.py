@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+의존성 그래프 확장 벤치마크 (스텁 레지스트리, 캐시 없음)
+
+Usage:
+    python bench_graph.py [--latency 20] [--concurrency 10] [--repeat 3]
+    python bench_graph.py next react react-dom @tanstack/react-query
+
+stub_registry.py를 프로세스 안에서 띄우고 get_npm_versions.py --graph와
+같은 경로(build_graph)로 그래프를 펼쳐, 노드 수와 요청 수, 소요 시간을 잰다.
+스텁의 의존성은 stub-lib-0..599로 이루어진 DAG라 기본 루트에서 수백 개
+노드가 나온다.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import get_npm_versions  # noqa: E402
+from npm_registry import RegistryClient  # noqa: E402
+from resolver import parse_spec  # noqa: E402
+from stub_registry import start_stub  # noqa: E402
+
+DEFAULT_ROOTS = ["next", "react", "react-dom", "@tanstack/react-query"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="의존성 그래프 확장 벤치마크")
+    parser.add_argument("roots", nargs="*", default=DEFAULT_ROOTS, help="루트 name@범위 (기본: next react ...)")
+    parser.add_argument("--latency", type=float, default=20.0, help="스텁 응답 지연 ms (기본: 20)")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 요청 수 (기본: 10)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (기본: 3)")
+    args = parser.parse_args()
+
+    _, registry = start_stub(latency=args.latency / 1000)
+    specs = [parse_spec(spec) for spec in args.roots]
+    print(f"루트 {len(specs)}개, 동시 {args.concurrency}, 스텁 지연 {args.latency:.0f}ms")
+    print(f"{'회차':<6} {'초':>8} {'노드':>6} {'충돌':>6} {'요청':>6}")
+    for i in range(args.repeat):
+        # 매번 새 클라이언트 (연결과 메모 없이 처음부터)
+        with RegistryClient(registry, concurrency=args.concurrency) as client:
+            get_npm_versions.CLIENT = client
+            start = time.perf_counter()
+            graph = get_npm_versions.build_graph(specs)
+            elapsed = time.perf_counter() - start
+            print(f"{i + 1:<6} {elapsed:>8.2f} {len(graph.nodes):>6} {len(graph.conflicts()):>6} "
+                  f"{client.stats['requests']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+레지스트리 조회 벤치마크: curl 서브프로세스 vs keep-alive 클라이언트
+
+Usage:
+    python bench_registry.py [--packages 150] [--latency 20] [--concurrency 10]
+    python bench_registry.py --registry https://registry.npmjs.org --packages 60
+
+기본으로 stub_registry.py를 프로세스 안에서 띄워 오프라인으로 측정한다.
+--registry를 주면 실제 레지스트리에 대해 측정한다 (이때 패키지는
+PACKAGES의 실제 이름을 앞에서부터 사용한다).
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from get_npm_versions import PACKAGES  # noqa: E402
+from npm_registry import RegistryClient, RegistryError  # noqa: E402
+from stub_registry import start_stub  # noqa: E402
+
+
+def curl_version(registry: str, name: str) -> dict:
+    """이전 구현: 패키지마다 curl 프로세스 하나"""
+    try:
+        result = subprocess.run(["curl", "-s", f"{registry}/{name}/latest"],
+                                capture_output=True, text=True, timeout=10)
+        if result.returncode == 0:
+            data = json.loads(result.stdout)
+            return {"name": name, "version": data.get("version", "unknown")}
+    except Exception:
+        pass
+    return {"name": name, "version": "error"}
+
+
+def bench_curl(registry: str, names: list[str], concurrency: int) -> tuple[float, list[dict]]:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda n: curl_version(registry, n), names))
+    return time.perf_counter() - start, results
+
+
+def bench_client(registry: str, names: list[str], concurrency: int) -> tuple[float, list[dict], str]:
+    def lookup(name: str) -> dict:
+        try:
+            return {"name": name, "version": client.latest(name).get("version", "unknown")}
+        except RegistryError:
+            return {"name": name, "version": "error"}
+
+    start = time.perf_counter()
+    with RegistryClient(registry, concurrency=concurrency) as client:
+        results = client.map(lookup, names)
+        stats = client.format_stats()
+    return time.perf_counter() - start, results, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="curl 서브프로세스와 keep-alive 클라이언트 비교")
+    parser.add_argument("--packages", type=int, default=150, help="조회할 패키지 수 (기본: 150)")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 요청 수 (기본: 10)")
+    parser.add_argument("--latency", type=float, default=20.0, help="스텁 응답 지연 ms (기본: 20)")
+    parser.add_argument("--registry", help="스텁 대신 측정할 레지스트리 URL")
+    args = parser.parse_args()
+
+    real_names = [name for pkgs in PACKAGES.values() for name in pkgs]
+    if args.registry:
+        registry = args.registry.rstrip("/")
+        names = real_names[:args.packages]
+    else:
+        _, registry = start_stub(latency=args.latency / 1000)
+        names = (real_names + [f"stub-pkg-{i}" for i in range(args.packages)])[:args.packages]
+
+    print(f"{len(names)}개 패키지, 동시 {args.concurrency}, 레지스트리 {registry}")
+    curl_time, curl_results = bench_curl(registry, names, args.concurrency)
+    client_time, client_results, stats = bench_client(registry, names, args.concurrency)
+
+    if [r["version"] for r in curl_results] != [r["version"] for r in client_results]:
+        print("경고: 두 방식의 결과가 다릅니다", file=sys.stderr)
+    print(f"{'방식':<14} {'초':>8} {'패키지/초':>10}")
+    print(f"{'curl':<14} {curl_time:>8.2f} {len(names) / curl_time:>10.1f}")
+    print(f"{'keep-alive':<14} {client_time:>8.2f} {len(names) / client_time:>10.1f}  ({stats})")
+    print(f"속도 향상: {curl_time / client_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+모노레포 스캔 벤치마크 (합성 모노레포 + 스텁 레지스트리, 캐시 없음)
+
+Usage:
+    python bench_scan.py [--workspaces 300] [--deps 25] [--latency 20] [--concurrency 16]
+
+임시 디렉터리에 워크스페이스 N개짜리 모노레포(루트 package-lock.json,
+워크스페이스마다 node_modules 더미 포함)를 만들고, get_npm_versions.py
+--scan과 같은 경로(scan_outdated)로 outdated 보고서를 만든다. 스캔 시간,
+첫 행까지의 시간, 전체 시간을 잰다. 출력 행은 버린다.
+"""
+
+import argparse
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import get_npm_versions  # noqa: E402
+from get_npm_versions import OutdatedWriter, scan_outdated  # noqa: E402
+from npm_registry import RegistryClient  # noqa: E402
+from stub_registry import STUB_LIBS, start_stub, stub_version  # noqa: E402
+from workspace_scan import scan_workspace  # noqa: E402
+
+
+def build_monorepo(root: Path, workspaces: int, deps: int, seed: int = 1) -> int:
+    """합성 모노레포를 만들고 의존성 항목 수를 돌려준다."""
+    rng = random.Random(seed)
+    names = [f"stub-lib-{i}" for i in range(STUB_LIBS)]
+    real = [name for pkgs in get_npm_versions.PACKAGES.values() for name in pkgs]
+    locked = {}
+    total = 0
+    for w in range(workspaces):
+        directory = root / "packages" / f"pkg-{w}"
+        # 스캔이 들어가지 않아야 하는 node_modules 더미
+        junk = directory / "node_modules" / "junk"
+        junk.mkdir(parents=True)
+        (junk / "package.json").write_text('{"name": "junk", "dependencies": {"x": "1"}}')
+        chosen = rng.sample(names, deps - 5) + rng.sample(real, 5)
+        dependencies = {}
+        for name in chosen:
+            major, minor, _ = stub_version(name)
+            dependencies[name] = f"^{major}.{max(0, minor - 1)}.0"
+            locked[f"node_modules/{name}"] = {"version": f"{major}.{max(0, minor - 1)}.0"}
+        (directory / "package.json").write_text(json.dumps({"name": f"@mono/pkg-{w}", "dependencies": dependencies}))
+        total += len(dependencies)
+    (root / "package.json").write_text(json.dumps({"name": "mono", "private": True, "workspaces": ["packages/*"]}))
+    (root / "package-lock.json").write_text(json.dumps({"lockfileVersion": 3, "packages": locked}))
+    return total
+
+
+class TimedWriter(OutdatedWriter):
+    """첫 행이 나온 시각을 기록하는 writer"""
+
+    def __init__(self, format: str, start: float):
+        super().__init__(format)
+        self.start = start
+        self.first = None
+
+    def write(self, row: dict):
+        if self.first is None:
+            self.first = time.perf_counter() - self.start
+        super().write(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모노레포 스캔 벤치마크")
+    parser.add_argument("--workspaces", type=int, default=300, help="워크스페이스 수 (기본: 300)")
+    parser.add_argument("--deps", type=int, default=25, help="워크스페이스당 의존성 수 (기본: 25)")
+    parser.add_argument("--latency", type=float, default=20.0, help="스텁 응답 지연 ms (기본: 20)")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 요청 수 (기본: 16)")
+    args = parser.parse_args()
+
+    _, registry = start_stub(latency=args.latency / 1000)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        entries = build_monorepo(root, args.workspaces, args.deps)
+
+        start = time.perf_counter()
+        scanned = scan_workspace(root)
+        scan_time = time.perf_counter() - start
+
+        with RegistryClient(registry, concurrency=args.concurrency) as client:
+            get_npm_versions.CLIENT = client
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                writer = TimedWriter("table", start)
+                stats = scan_outdated(root, writer, None)
+                writer.close()
+            total = time.perf_counter() - start
+            requests = client.stats["requests"]
+
+    print(f"워크스페이스 {args.workspaces}개, 의존성 {entries}개 (스캔 {len(scanned)}개), "
+          f"고유 패키지 {stats['packages']}개, 요청 {requests}건, outdated {stats['outdated']}건")
+    first = f"{writer.first:.2f}초" if writer.first is not None else "-"
+    print(f"디렉터리 스캔 {scan_time:.2f}초, 첫 행 {first}, 전체 {total:.2f}초 (스텁 지연 {args.latency:.0f}ms, "
+          f"동시 {args.concurrency})")
+
+
+if __name__ == "__main__":
+    main()
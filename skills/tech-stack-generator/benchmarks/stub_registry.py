@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+로컬 npm 레지스트리 스텁 (오프라인 테스트/벤치마크용)
+
+Usage:
+    python stub_registry.py [--port 8400] [--latency 20] [--fail-rate 0.1]
+    python ../scripts/get_npm_versions.py react next --registry http://127.0.0.1:8400
+
+GET /<name>/latest 에 {"name", "version", "description"} 문서를, GET /<name>
+에 축약 메타데이터(dist-tags: latest/next/canary, 버전별 의존성)를 돌려준다.
+버전과 의존성은 이름에서 결정적으로 만든다. 의존성은 stub-lib-0..599로
+이루어진 DAG이고 일부는 react를 peer로 요구한다 (그래프 확장/충돌 확인용). 이름이 "missing-"으로 시작하면 404를
+돌려준다. "truncated-gzip-"으로 시작하면 gzip 본문을 절반만, "corrupt-gzip-"으로
+시작하면 deflate 데이터가 깨진 gzip 본문을 보낸다 (디코딩 오류 재시도 확인용). HTTP/1.1 keep-alive를 지원하며, --latency로 네트워크 지연을,
+--fail-rate로 429/503 응답을 흉내 내어 재시도 경로를 확인할 수 있다.
+"""
+
+import argparse
+import gzip
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+
+class StubServer(ThreadingHTTPServer):
+    # socketserver 기본 listen 백로그(5)로는 동시 연결이 몰릴 때 SYN이 버려져 1초씩 지연된다
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def stub_version(name: str) -> tuple[int, int, int]:
+    """이름에서 결정적으로 만든 latest 버전 (실행마다 같은 결과)"""
+    seed = zlib.crc32(name.encode("utf-8"))
+    return seed % 20, seed // 20 % 50, seed // 1000 % 30
+
+
+# 스텁 의존성 그래프를 이루는 라이브러리 수 (stub-lib-0 .. stub-lib-599)
+STUB_LIBS = 600
+
+
+def stub_dependencies(name: str, major: int) -> dict:
+    """name의 major 버전대가 가지는 dependencies/peerDependencies (stub-lib-i는 i보다 큰 것에만 의존)"""
+    seed = zlib.crc32(f"{name}@{major}".encode("utf-8"))
+    first = int(name.rsplit("-", 1)[1]) + 1 if name.startswith("stub-lib-") else 0
+    deps = {}
+    for k in range(seed % 4):
+        index = first + (seed >> (2 + 5 * k)) % 32
+        if index >= STUB_LIBS:
+            break
+        dep = f"stub-lib-{index}"
+        dep_major, dep_minor, _ = stub_version(dep)
+        style = (seed >> (20 + 2 * k)) % 4
+        if style == 3 and dep_major > 0:
+            deps[dep] = f"^{dep_major - 1}"  # 한 메이저 아래 (같은 이름의 버전이 여럿 생긴다)
+        elif style == 2:
+            deps[dep] = f"~{dep_major}.{dep_minor}"
+        else:
+            deps[dep] = f"^{dep_major}"
+    manifest = {"dependencies": deps} if deps else {}
+    if name.startswith("stub-lib-") and seed % 5 == 0:
+        react = stub_version("react")[0]
+        manifest["peerDependencies"] = {"react": (f"^{react}", f"^{react - 1} || ^{react}", f"^{react - 1}")[seed % 3]}
+        if seed % 7 == 0:
+            manifest["peerDependenciesMeta"] = {"react": {"optional": True}}
+    return manifest
+
+
+def stub_packument(name: str) -> dict:
+    """latest 버전 아래로 최근 세 메이저의 버전과 next/canary 프리릴리스가 있는 축약 메타데이터"""
+    major, minor, patch = stub_version(name)
+    versions = []
+    for ma in range(max(0, major - 2), major + 1):
+        last_minor = minor if ma == major else 3
+        for mi in range(last_minor + 1):
+            last_patch = patch if (ma, mi) == (major, minor) else 2
+            versions.extend(f"{ma}.{mi}.{pa}" for pa in range(last_patch + 1))
+    latest = f"{major}.{minor}.{patch}"
+    tags = {"latest": latest, "next": f"{major + 1}.0.0-rc.1", "canary": f"{latest}-canary.{len(name)}"}
+    versions += [tags["next"], tags["canary"]]
+    by_major = {}
+    docs = {}
+    for v in versions:
+        ma = int(v.split(".", 1)[0])
+        if ma not in by_major:
+            by_major[ma] = stub_dependencies(name, ma)
+        docs[v] = {"name": name, "version": v, **by_major[ma], "dist": {"tarball": f"https://stub/{name}/-/{v}.tgz"}}
+    return {"name": name, "dist-tags": tags, "modified": "2024-01-01T00:00:00.000Z", "versions": docs}
+
+
+def make_handler(latency: float = 0.0, fail_rate: float = 0.0):
+    """latency(초)와 fail_rate(실패 응답 비율)가 적용된 핸들러 클래스"""
+
+    class StubRegistryHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # 헤더와 본문을 따로 쓰므로, Nagle 알고리즘이 keep-alive 응답을 40ms씩 붙잡지 않게 한다
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            path = unquote(self.path.split("?", 1)[0]).strip("/")
+            if fail_rate and random.random() < fail_rate:
+                status = random.choice((429, 503))
+                self._send(status, {"error": "stub failure"}, {"Retry-After": "0"})
+                return
+            name = path[: -len("/latest")] if path.endswith("/latest") else path
+            if not name or name.split("/")[-1].startswith("missing-"):
+                self._send(404, {"error": "Not found"})
+                return
+            if name.startswith(("truncated-gzip-", "corrupt-gzip-")):
+                self._send_broken_gzip(name, truncate=name.startswith("truncated-"))
+                return
+            if name == path:
+                self._send(200, stub_packument(name), {"Content-Type": "application/vnd.npm.install-v1+json"})
+                return
+            version = ".".join(map(str, stub_version(name)))
+            self._send(200, {"name": name, "version": version, "description": f"Stub package {name}"})
+
+        def _send(self, status: int, doc: dict, headers: dict | None = None):
+            body = json.dumps(doc).encode("utf-8")
+            headers = {"Content-Type": "application/json", **(headers or {})}
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_broken_gzip(self, name: str, truncate: bool):
+            """Content-Length는 맞지만 gzip으로 풀리지 않는 200 응답"""
+            body = bytearray(gzip.compress(json.dumps({"name": name, "version": "1.0.0"}).encode("utf-8")))
+            if truncate:
+                del body[len(body) // 2:]
+            else:
+                body[10:] = b"\xff" * (len(body) - 10)  # gzip 헤더 뒤 deflate 데이터를 깨뜨린다
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubRegistryHandler
+
+
+def start_stub(port: int = 0, latency: float = 0.0, fail_rate: float = 0.0) -> tuple[StubServer, str]:
+    """백그라운드 스레드에서 스텁을 띄우고 (server, registry URL)을 반환"""
+    server = StubServer(("127.0.0.1", port), make_handler(latency, fail_rate))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 npm 레지스트리 스텁")
+    parser.add_argument("--port", type=int, default=8400, help="포트 (기본: 8400)")
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연 ms (기본: 0)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="429/503으로 응답할 비율 0~1 (기본: 0)")
+    args = parser.parse_args()
+
+    server = StubServer(("127.0.0.1", args.port), make_handler(args.latency / 1000, args.fail_rate))
+    print(f"스텁 레지스트리: http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
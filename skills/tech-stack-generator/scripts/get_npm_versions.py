@@ -6,13 +6,36 @@ Usage:
     python get_npm_versions.py react next typescript
     python get_npm_versions.py --category frontend
     python get_npm_versions.py --all
+    python get_npm_versions.py react --registry http://127.0.0.1:8400
+    python get_npm_versions.py --all --stale-while-revalidate
+    python get_npm_versions.py react next --offline
+    python get_npm_versions.py --resolve react@^18 next@canary typescript@~5.4
+    python get_npm_versions.py --package-json path/to/package.json
+    python get_npm_versions.py --graph next react@^18 react-dom@^18 @tanstack/react-query
+    python get_npm_versions.py --scan path/to/monorepo
+    python get_npm_versions.py --all --stats --trace trace.json
+
+레지스트리 조회는 npm_registry.py의 keep-alive 클라이언트로 프로세스 안에서
+수행하고, 결과는 version_cache.py의 로컬 캐시에 TTL 동안 보관한다. 요청별
+계측은 request_trace.py가 맡는다 (모두 같은 디렉터리에 두어야 한다).
 """
 
 import argparse
 import json
-import subprocess
+import sqlite3
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, as_completed, wait
+from pathlib import Path
+
+from npm_registry import DEFAULT_REGISTRY, RegistryClient, RegistryError
+from request_trace import RequestTracer
+from resolver import DependencyGraph, Resolver, expand_graph, parse_spec, registry_target
+from semver import parse
+from version_cache import DEFAULT_TTL, TABLES, VersionCache, default_cache_dir
+from workspace_scan import scan_workspace
 
 # 카테고리별 주요 패키지
 PACKAGES = {
@@ -96,57 +119,518 @@ PACKAGES = {
 }
 
 
+# 레지스트리 클라이언트 (main()에서 옵션에 맞게 다시 만든다)
+CLIENT = RegistryClient()
+# 버전 캐시 (main()에서 옵션에 맞게 만든다, None이면 항상 레지스트리 조회)
+CACHE: VersionCache | None = None
+# stale-while-revalidate 모드에서 백그라운드로 진행 중인 재조회
+REVALIDATING: list[tuple[str, Future]] = []
+
+
 def get_npm_version(package_name: str) -> dict:
     """NPM 레지스트리에서 패키지 최신 버전 조회"""
     try:
-        result = subprocess.run(
-            ["curl", "-s", f"https://registry.npmjs.org/{package_name}/latest"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            return {
-                "name": package_name,
-                "version": data.get("version", "unknown"),
-                "description": data.get("description", "")[:60],
-            }
-    except Exception as e:
-        pass
-    return {"name": package_name, "version": "error", "description": ""}
-
-
-def get_versions_parallel(packages: list[str]) -> list[dict]:
-    """병렬로 여러 패키지 버전 조회"""
+        data = CLIENT.latest(package_name)
+        return {
+            "name": package_name,
+            "version": data.get("version", "unknown"),
+            "description": (data.get("description") or "")[:60],
+        }
+    except RegistryError as e:
+        return {"name": package_name, "version": "error", "description": "", "error": str(e)}
+
+
+def _timed(fn: Callable[[str], dict], timings: dict[str, float] | None) -> Callable[[str], dict]:
+    """timings가 있으면 fn(이름)의 소요 시간을 timings[이름]에 기록하도록 감싼다."""
+    if timings is None:
+        return fn
+
+    def timed(name: str) -> dict:
+        start = time.perf_counter()
+        result = fn(name)
+        timings[name] = time.perf_counter() - start
+        return result
+
+    return timed
+
+
+def _succeeded(result: dict) -> bool:
+    return result.get("version") != "error" and "error" not in result
+
+
+def iter_lookup(fn: Callable[[str], dict], names: list[str], table: str,
+                timings: dict[str, float] | None = None) -> Iterator[tuple[str, dict | None]]:
+    """캐시 테이블을 거쳐 fn(이름)의 결과를 준비되는 순서대로 (이름, 결과)로 내보낸다.
+
+    이름은 중복 없이 한 번씩 나온다. 신선한 캐시 항목이 먼저 나오고, 나머지는
+    레지스트리 워커 풀에서 끝나는 순서대로 나오며 성공한 결과는 마지막에 캐시에
+    저장한다. stale-while-revalidate 모드의 만료 항목은 캐시 값을 바로 내보내고
+    재조회를 백그라운드에 맡긴다 (finish_revalidation()에서 저장). offline
+    모드에서 캐시에 없는 이름의 결과는 None이다.
+    """
+    names = list(dict.fromkeys(names))
+    fetch = names
+    if CACHE is not None:
+        hits, fetch, revalidate = CACHE.partition(names, table)
+        REVALIDATING.extend((table, CLIENT.submit(fn, name)) for name in revalidate)
+        fetching = set(fetch)
+        for name in names:
+            if name not in fetching:
+                yield name, hits.get(name)
+    timed = _timed(fn, timings)
+    futures = {CLIENT.submit(timed, name): name for name in fetch}
+    fetched = []
+    for future in as_completed(futures):
+        result = future.result()
+        if _succeeded(result):
+            fetched.append(result)
+        yield futures.pop(future), result
+    if CACHE is not None and fetched:
+        CACHE.put_many(fetched, table)
+
+
+def cached_lookup(fn: Callable[[str], dict], names: list[str], table: str,
+                  timings: dict[str, float] | None = None) -> dict[str, dict]:
+    """iter_lookup()의 결과를 {이름: 결과}로 모은다 (offline 모드에서 캐시에 없는 이름은 빠진다)."""
+    return {name: result for name, result in iter_lookup(fn, names, table, timings) if result is not None}
+
+
+def iter_versions(packages: list[str], timings: dict[str, float] | None = None) -> Iterator[tuple[int, dict]]:
+    """캐시를 거쳐 버전을 조회하고 (입력 위치, 결과)를 끝나는 순서대로 내보낸다.
+
+    같은 패키지가 여러 번 있어도 한 번만 조회하고 위치마다 내보낸다. offline
+    모드에서 캐시에 없는 패키지는 version이 "uncached"이다.
+    """
+    positions = defaultdict(list)
+    for index, name in enumerate(packages):
+        positions[name].append(index)
+    for name, result in iter_lookup(get_npm_version, packages, "versions", timings):
+        result = result or {"name": name, "version": "uncached", "description": ""}
+        for index in positions.pop(name):
+            yield index, result
+
+
+def get_versions_parallel(packages: list[str], timings: dict[str, float] | None = None) -> list[dict]:
+    """캐시를 거쳐 여러 패키지 버전 조회 (입력 순서 유지)"""
+    results: list[dict] = [{}] * len(packages)
+    for index, result in iter_versions(packages, timings):
+        results[index] = result
+    return results
+
+
+def finish_revalidation():
+    """백그라운드 재조회가 끝나기를 기다려 결과를 캐시에 저장 (출력 이후에 호출)"""
+    if CACHE is not None:
+        for table in TABLES:
+            results = [future.result() for t, future in REVALIDATING if t == table]
+            if results:
+                CACHE.put_many([r for r in results if _succeeded(r)], table)
+    REVALIDATING.clear()
+
+
+# 축약 메타데이터에서 버전마다 남길 필드 (범위 해석과 의존성 확인에 필요한 것만)
+PACKUMENT_FIELDS = ("dependencies", "peerDependencies", "peerDependenciesMeta", "optionalDependencies", "deprecated")
+# package.json에서 읽는 의존성 필드
+DEPENDENCY_FIELDS = ("dependencies", "devDependencies", "optionalDependencies", "peerDependencies")
+
+
+def get_packument(package_name: str) -> dict:
+    """축약 메타데이터를 받아 dist-tags와 버전별 PACKUMENT_FIELDS만 남긴다 (실패 시 "error")"""
+    try:
+        data = CLIENT.packument(package_name)
+    except RegistryError as e:
+        return {"name": package_name, "error": str(e)}
+    return {
+        "name": package_name,
+        "dist-tags": data.get("dist-tags") or {},
+        "versions": {
+            version: {field: meta[field] for field in PACKUMENT_FIELDS if field in meta}
+            for version, meta in (data.get("versions") or {}).items()
+        },
+    }
+
+
+def load_package_json(path: Path) -> list[tuple[str, str]]:
+    """package.json의 DEPENDENCY_FIELDS에서 (이름, 지정) 목록 (중복 제거, 필드 순서)"""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    specs = {}
+    for field in DEPENDENCY_FIELDS:
+        for name, spec in (data.get(field) or {}).items():
+            specs.setdefault((name, spec), None)
+    return list(specs)
+
+
+def resolve_specs(specs: list[tuple[str, str]], timings: dict[str, float] | None = None) -> list[dict]:
+    """(이름, 범위/태그) 목록을 버전으로 해석 (입력 순서 유지)
+
+    패키지마다 축약 메타데이터를 한 번만 받아(캐시 포함) 같은 패키지의 여러
+    범위를 모두 그 문서로 해석한다. 해석하지 못한 경우 version은 "error",
+    "uncached", "invalid-range", "no-match", "unsupported" 중 하나이다.
+    """
+    targets = [registry_target(name, spec) for name, spec in specs]
+    resolver = Resolver()
+    docs = cached_lookup(get_packument, [t[0] for t in targets if t], "packuments", timings)
+    for target in targets:
+        if target:
+            resolver.add(target[0], docs.get(target[0]))
     results = []
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = {executor.submit(get_npm_version, pkg): pkg for pkg in packages}
-        for future in as_completed(futures):
-            results.append(future.result())
-    # 입력 순서대로 정렬
-    pkg_order = {pkg: i for i, pkg in enumerate(packages)}
-    results.sort(key=lambda x: pkg_order.get(x["name"], 999))
+    for (name, spec), target in zip(specs, targets):
+        result = {"name": name, "range": spec, "version": "unsupported", "latest": ""}
+        if target is not None:
+            version, status = resolver.resolve(*target)
+            result["version"] = version or status
+            result["latest"] = resolver.latest(target[0])
+        results.append(result)
     return results
 
 
+class PackumentLoader:
+    """의존성 그래프 확장용 문서 로더 (expand_graph()의 request/wait)
+
+    이름마다 한 번만 캐시를 확인하고, 없으면 레지스트리 워커 풀에 조회를
+    맡긴다. 조회가 끝나는 대로 resolver에 넣어 그래프 확장이 이어지게 하고,
+    받은 문서는 save()에서 한 번에 캐시에 저장한다.
+    """
+
+    def __init__(self, resolver: Resolver, timings: dict[str, float] | None = None):
+        self.resolver = resolver
+        self.fetch = _timed(get_packument, timings)
+        self.pending: dict[Future, str] = {}
+        self.fetched: list[dict] = []
+
+    def request(self, name: str) -> bool:
+        return bool(self.request_many([name]))
+
+    def request_many(self, names: list[str]) -> list[str]:
+        """이름들의 조회를 시작하고, 캐시로 바로 resolver에 넣은 이름을 돌려준다."""
+        fetch = names
+        ready = []
+        if CACHE is not None:
+            hits, fetch, revalidate = CACHE.partition(names, "packuments")
+            REVALIDATING.extend(("packuments", CLIENT.submit(get_packument, n)) for n in revalidate)
+            fetching = set(fetch)
+            ready = [name for name in dict.fromkeys(names) if name not in fetching]
+            for name in ready:
+                self.resolver.add(name, hits.get(name))
+        for name in fetch:
+            self.pending[CLIENT.submit(self.fetch, name)] = name
+        return ready
+
+    def wait(self) -> list[str]:
+        done, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+        names = []
+        for future in done:
+            name = self.pending.pop(future)
+            doc = future.result()
+            self.resolver.add(name, doc)
+            self.fetched.append(doc)
+            names.append(name)
+        return names
+
+    def save(self):
+        if CACHE is not None:
+            CACHE.put_many([doc for doc in self.fetched if _succeeded(doc)], "packuments")
+
+
+def build_graph(specs: list[tuple[str, str]], timings: dict[str, float] | None = None) -> DependencyGraph:
+    """요청한 (이름, 범위)의 전이 의존성/peer 그래프 (이름마다 메타데이터는 한 번만 조회)"""
+    resolver = Resolver()
+    loader = PackumentLoader(resolver, timings)
+    graph = expand_graph(specs, resolver, loader.request, loader.wait)
+    loader.save()
+    return graph
+
+
+# 조회 시간 히스토그램 구간 상한 (ms)
+HISTOGRAM_BOUNDS = (25, 50, 100, 200, 400, 800, 1600)
+
+
+def print_timing(timings: dict[str, float], wall: float, first: float | None = None):
+    """전체 소요 시간, 첫 결과까지의 시간과 패키지별 조회 시간 히스토그램을 stderr로 출력"""
+    out = sys.stderr
+    latencies = sorted(timings.values())
+    first_text = f", 첫 결과 {first:.2f}초" if first is not None else ""
+    print(f"\n전체 {wall:.2f}초{first_text}, 패키지 {len(latencies)}개 ({CLIENT.format_stats()})", file=out)
+    if not latencies:
+        return
+    print(f"조회 시간: 최소 {latencies[0] * 1000:.0f}ms, 중앙값 {latencies[len(latencies) // 2] * 1000:.0f}ms, "
+          f"최대 {latencies[-1] * 1000:.0f}ms, 합계 {sum(latencies):.2f}초", file=out)
+    counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+    for seconds in latencies:
+        ms = seconds * 1000
+        counts[next((i for i, bound in enumerate(HISTOGRAM_BOUNDS) if ms < bound), len(HISTOGRAM_BOUNDS))] += 1
+    labels = [f"< {bound}ms" for bound in HISTOGRAM_BOUNDS] + [f">= {HISTOGRAM_BOUNDS[-1]}ms"]
+    for label, count in zip(labels, counts):
+        if count:
+            print(f"  {label:>10} {count:>4} {'#' * max(1, count * 40 // len(latencies))}", file=out)
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[:5]
+    print("가장 느린 패키지: " + ", ".join(f"{name} {sec * 1000:.0f}ms" for name, sec in slowest), file=out)
+
+
+class ReorderBuffer:
+    """끝나는 순서로 들어오는 (위치, 항목)을 입력 순서대로 내보낸다.
+
+    앞부분이 모두 채워진 만큼만 내보내고, 아직 앞 위치를 기다리는 항목만 들고 있는다.
+    """
+
+    def __init__(self):
+        self.next = 0
+        self.pending: dict[int, object] = {}
+
+    def push(self, index: int, item) -> list:
+        self.pending[index] = item
+        ready = []
+        while self.next in self.pending:
+            ready.append(self.pending.pop(self.next))
+            self.next += 1
+        return ready
+
+
+class ResultWriter:
+    """버전 조회 결과를 준비되는 대로 출력
+
+    ndjson은 끝나는 순서대로 한 줄에 하나씩 (section이 있으면 "category"
+    필드로) 바로 쓴다. table/markdown/json은 ReorderBuffer로 입력 순서를 지키며
+    앞부분이 채워지는 대로 쓰고, section이 바뀔 때마다 "## SECTION" 제목과
+    새 표(json은 새 배열)를 시작한다. 출력 결과는 전체를 모아 한 번에 쓴 것과 같다.
+    """
+
+    def __init__(self, format: str = "table"):
+        self.format = format
+        self.buffer = ReorderBuffer()
+        self.section = None
+        self.count = 0  # 현재 표(배열)의 행 수
+        self.opened = False
+        self.first_at: float | None = None  # 첫 결과를 쓴 시각 (perf_counter)
+
+    def add(self, index: int, result: dict, section: str | None = None):
+        """index번째 결과가 준비됨 (순서와 관계없이 호출)"""
+        if self.first_at is None:
+            self.first_at = time.perf_counter()
+        if self.format == "ndjson":
+            record = {**result, "category": section} if section else result
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+            return
+        for ready, ready_section in self.buffer.push(index, (result, section)):
+            self._row(ready, ready_section)
+        sys.stdout.flush()
+
+    def _open(self, section: str | None):
+        if self.opened:
+            self._close_table()
+        self.opened = True
+        self.section = section
+        self.count = 0
+        if section is not None:
+            print(f"\n## {section.upper()}")
+        if self.format == "markdown":
+            print("| 패키지명 | 버전 | 설명 |")
+            print("|---------|------|------|")
+        elif self.format == "table":
+            print(f"{'패키지명':<35} {'버전':<12} 설명")
+            print("-" * 80)
+
+    def _row(self, r: dict, section: str | None):
+        if not self.opened or section != self.section:
+            self._open(section)
+        if self.format == "json":
+            item = json.dumps(r, indent=2).replace("\n", "\n  ")
+            print(("[\n  " if self.count == 0 else ",\n  ") + item, end="")
+        elif self.format == "markdown":
+            print(f"| {r['name']} | {r['version']} | {r['description']} |")
+        else:  # table
+            print(f"{r['name']:<35} {r['version']:<12} {r['description']}")
+        self.count += 1
+
+    def _close_table(self):
+        if self.format == "json":
+            print("\n]" if self.count else "[]")
+
+    def close(self):
+        if self.format == "ndjson":
+            return
+        if not self.opened:
+            self._open(None)
+        self._close_table()
+
+
 def print_results(results: list[dict], format: str = "table"):
     """결과 출력"""
-    if format == "json":
+    writer = ResultWriter(format)
+    for index, result in enumerate(results):
+        writer.add(index, result)
+    writer.close()
+
+
+def print_resolved(results: list[dict], format: str = "table"):
+    """범위 해석 결과 출력"""
+    if format == "ndjson":
+        for r in results:
+            print(json.dumps(r, ensure_ascii=False))
+    elif format == "json":
         print(json.dumps(results, indent=2))
     elif format == "markdown":
-        print("| 패키지명 | 버전 | 설명 |")
-        print("|---------|------|------|")
+        print("| 패키지명 | 범위 | 버전 | latest |")
+        print("|---------|------|------|--------|")
         for r in results:
-            print(f"| {r['name']} | {r['version']} | {r['description']} |")
+            print(f"| {r['name']} | `{r['range']}` | {r['version']} | {r['latest']} |")
     else:  # table
-        print(f"{'패키지명':<35} {'버전':<12} 설명")
+        print(f"{'패키지명':<35} {'범위':<18} {'버전':<16} latest")
         print("-" * 80)
         for r in results:
-            print(f"{r['name']:<35} {r['version']:<12} {r['description']}")
+            print(f"{r['name']:<35} {r['range']:<18} {r['version']:<16} {r['latest']}")
+
+
+def is_outdated(row: dict) -> bool:
+    """설치되지 않았거나, wanted/latest가 현재보다 높거나, 해석에 실패한 경우"""
+    current = parse(row["current"]) if row["current"] else None
+    if current is None:
+        return True
+    wanted, latest = parse(row["wanted"]), parse(row["latest"]) if row["latest"] else None
+    return wanted is None or wanted > current or (latest is not None and latest > current)
+
+
+class OutdatedWriter:
+    """outdated 보고서 행을 도착하는 대로 출력 (table/json/markdown/ndjson)
+
+    json은 행마다 바로 쓰면서도 전체가 하나의 JSON 배열이 되게 출력한다.
+    """
+
+    def __init__(self, format: str = "table"):
+        self.format = format
+        self.count = 0
+        self.first_at: float | None = None  # 첫 행을 쓴 시각 (perf_counter)
+        if format == "json":
+            print("[", end="", flush=True)
+        elif format == "markdown":
+            print("| 패키지명 | 현재 | wanted | latest | 위치 |")
+            print("|---------|------|--------|--------|------|", flush=True)
+        elif format != "ndjson":
+            print(f"{'패키지명':<35} {'현재':<12} {'wanted':<12} {'latest':<12} 위치")
+            print("-" * 90, flush=True)
+
+    def write(self, row: dict):
+        if self.first_at is None:
+            self.first_at = time.perf_counter()
+        current = row["current"] or "-"
+        location = row["location"] or "."
+        if self.format == "ndjson":
+            print(json.dumps(row, ensure_ascii=False))
+        elif self.format == "json":
+            print(("," if self.count else "") + "\n  " + json.dumps(row, ensure_ascii=False), end="")
+        elif self.format == "markdown":
+            print(f"| {row['name']} | {current} | {row['wanted']} | {row['latest']} | {location} |")
+        else:
+            print(f"{row['name']:<35} {current:<12} {row['wanted']:<12} {row['latest']:<12} {location}")
+        sys.stdout.flush()
+        self.count += 1
+
+    def close(self):
+        if self.format == "json":
+            print("\n]" if self.count else "]")
+
+
+def scan_outdated(root: Path, writer: OutdatedWriter, timings: dict[str, float] | None = None) -> dict:
+    """root 아래 모노레포를 스캔해 outdated 의존성을 writer로 흘려보낸다.
+
+    이름별로 중복을 없애 메타데이터를 한 번씩만 조회하고 (캐시 적중은 바로,
+    나머지는 워커 풀에서 끝나는 순서대로) 그 이름을 쓰는 모든 워크스페이스의
+    행을 즉시 출력한다. 반환값은 요약 통계이다.
+    """
+    deps = scan_workspace(root)
+    usages = defaultdict(list)
+    unsupported = 0
+    for dep in deps:
+        target = registry_target(dep["name"], dep["range"])
+        if target is None:
+            unsupported += 1
+        else:
+            usages[target[0]].append((dep, target[1]))
+
+    resolver = Resolver()
+    loader = PackumentLoader(resolver, timings)
+
+    def emit(package: str):
+        latest = resolver.latest(package)
+        for dep, range_text in usages[package]:
+            version, status = resolver.resolve(package, range_text)
+            row = {"name": dep["name"], "location": dep["location"], "range": dep["range"],
+                   "current": dep["current"], "wanted": version or status, "latest": latest}
+            if is_outdated(row):
+                writer.write(row)
+
+    for package in loader.request_many(list(usages)):
+        emit(package)
+    while loader.pending:
+        for package in loader.wait():
+            emit(package)
+    loader.save()
+    return {"workspaces": len({dep["location"] for dep in deps}), "dependencies": len(deps),
+            "packages": len(usages), "unsupported": unsupported, "outdated": writer.count}
+
+
+def print_graph(graph: DependencyGraph, format: str = "table"):
+    """의존성 그래프 해석 결과 (대표 버전, peer 충돌, 해석 실패) 출력
+
+    ndjson은 "type"이 root/node/conflict/missing인 레코드를 한 줄씩 쓴다.
+    """
+    if format == "json":
+        print(json.dumps(graph.to_dict(), indent=2))
+        return
+    if format == "ndjson":
+        data = graph.to_dict()
+        records = [("root", data["roots"]), ("node", [{"key": key, **node} for key, node in data["nodes"].items()]),
+                   ("conflict", data["conflicts"]), ("missing", data["missing"])]
+        for kind, items in records:
+            for item in items:
+                print(json.dumps({"type": kind, **item}, ensure_ascii=False))
+        return
+    chosen = graph.chosen()
+    versions = graph.versions()
+    conflicts = graph.conflicts()
+    markdown = format == "markdown"
+
+    print(f"## 해석된 패키지 ({len(versions)}개, name@version {len(graph.nodes)}개)")
+    if markdown:
+        print("| 패키지명 | 버전 | 다른 버전 | 의존됨 |")
+        print("|---------|------|-----------|--------|")
+    else:
+        print(f"{'패키지명':<35} {'버전':<16} {'의존됨':>6}  다른 버전")
+        print("-" * 80)
+    for name, version in sorted(chosen.items()):
+        others = ", ".join(v for v in versions[name] if v != version)
+        dependents = graph.nodes[f"{name}@{version}"]["dependents"]
+        if markdown:
+            print(f"| {name} | {version} | {others} | {dependents} |")
+        else:
+            print(f"{name:<35} {version:<16} {dependents:>6}  {others}")
+
+    print(f"\n## peer 충돌 ({len(conflicts)}건)")
+    for c in conflicts:
+        optional = " (선택적 peer)" if c["optional"] else ""
+        print(f"{'- ' if markdown else '  '}{c['package']} 는 {c['peer']}@{c['range']} 필요, 선택된 버전 {c['found']}{optional}")
+
+    if graph.missing:
+        print(f"\n## 해석 실패 ({len(graph.missing)}건)")
+        for m in graph.to_dict()["missing"]:
+            print(f"{'- ' if markdown else '  '}{m['package']} -> {m['dependency']}@{m['range']}: {m['status']}")
+
+
+def open_cache(args) -> VersionCache | None:
+    """옵션에 맞는 캐시 (--no-cache이거나 캐시 파일을 열 수 없으면 None)"""
+    if args.no_cache:
+        return None
+    path = (args.cache_dir or default_cache_dir()) / "versions.sqlite"
+    try:
+        return VersionCache(path, args.registry, args.cache_ttl, args.stale_while_revalidate,
+                            args.offline, args.refresh)
+    except (OSError, sqlite3.Error) as e:
+        print(f"경고: 캐시를 열 수 없어 캐시 없이 조회합니다 ({path}: {e})", file=sys.stderr)
+        return None
 
 
 def main():
+    global CLIENT, CACHE
     parser = argparse.ArgumentParser(description="NPM 패키지 최신 버전 조회")
     parser.add_argument("packages", nargs="*", help="조회할 패키지 이름들")
     parser.add_argument(
@@ -159,40 +643,125 @@ def main():
     parser.add_argument(
         "--format",
         "-f",
-        choices=["table", "json", "markdown"],
+        choices=["table", "json", "markdown", "ndjson"],
         default="table",
-        help="출력 형식",
+        help="출력 형식 (ndjson: 결과가 끝나는 대로 한 줄에 하나씩)",
     )
     parser.add_argument("--list", "-l", action="store_true", help="카테고리 목록 출력")
+    parser.add_argument("--resolve", "-r", action="store_true",
+                        help="패키지 인자를 name@범위/태그로 보고 맞는 버전 해석 (예: react@^18 next@canary)")
+    parser.add_argument("--package-json", "-p", type=Path, help="package.json의 의존성 범위를 해석")
+    parser.add_argument("--scan", "-s", type=Path, metavar="DIR",
+                        help="DIR 아래 모든 package.json/락파일을 스캔해 outdated 보고서 출력")
+    parser.add_argument("--graph", "-g", action="store_true",
+                        help="name@범위(또는 --package-json)의 전이 의존성/peer 그래프를 펼쳐 peer 충돌 확인")
+    parser.add_argument("--registry", default=DEFAULT_REGISTRY, help=f"레지스트리 URL (기본: {DEFAULT_REGISTRY})")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 요청 수 (기본: 10)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="요청당 타임아웃 초 (기본: 10)")
+    parser.add_argument("--retries", type=int, default=3, help="429/5xx/연결 오류 재시도 횟수 (기본: 3)")
+    parser.add_argument("--timing", action="store_true", help="전체 소요 시간과 패키지별 조회 시간 히스토그램 출력 (stderr)")
+    parser.add_argument("--stats", action="store_true",
+                        help="요청 지연 시간 p50/p95/p99, 처리량, 단계별 시간, 상태 코드/오류 분포 출력 (stderr)")
+    parser.add_argument("--trace", type=Path, metavar="FILE", help="요청마다 span 하나를 담은 JSON trace 파일 저장")
+    parser.add_argument("--cache-dir", type=Path, help=f"캐시 디렉터리 (기본: {default_cache_dir()})")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL,
+                        help=f"캐시 항목 유효 시간 초 (기본: {DEFAULT_TTL:.0f})")
+    parser.add_argument("--stale-while-revalidate", "--swr", action="store_true",
+                        help="만료된 캐시 항목을 바로 출력하고 백그라운드에서 재조회")
+    cache_mode = parser.add_mutually_exclusive_group()
+    cache_mode.add_argument("--offline", action="store_true", help="캐시만 사용 (네트워크 요청 없음)")
+    cache_mode.add_argument("--refresh", action="store_true", help="캐시를 무시하고 모두 다시 조회하여 갱신")
+    cache_mode.add_argument("--no-cache", action="store_true", help="캐시를 읽지도 쓰지도 않음")
 
     args = parser.parse_args()
 
+    tracer = RequestTracer() if args.stats or args.trace else None
+    try:
+        CLIENT = RegistryClient(args.registry, args.concurrency, args.timeout, args.retries, tracer=tracer)
+    except ValueError as e:
+        parser.error(str(e))
+
     if args.list:
         print("사용 가능한 카테고리:")
         for cat, pkgs in PACKAGES.items():
             print(f"  {cat}: {', '.join(pkgs[:3])}...")
         return
 
+    specs = []
     packages = []
-
-    if args.all:
-        for cat, pkgs in PACKAGES.items():
-            print(f"\n## {cat.upper()}")
-            results = get_versions_parallel(pkgs)
-            print_results(results, args.format)
-        return
-
-    if args.category:
+    if args.scan:
+        if not args.scan.is_dir():
+            parser.error(f"디렉터리가 아닙니다: {args.scan}")
+    elif args.package_json:
+        try:
+            specs = load_package_json(args.package_json)
+        except (OSError, ValueError) as e:
+            parser.error(f"package.json을 읽을 수 없습니다: {e}")
+    elif args.resolve or args.graph:
+        specs = [parse_spec(spec) for spec in args.packages]
+    elif args.category:
         packages = PACKAGES.get(args.category, [])
     elif args.packages:
         packages = args.packages
-    else:
+    elif not args.all and not args.scan:
         parser.print_help()
         return
+    if (args.resolve or args.graph or args.package_json) and not specs:
+        parser.error("해석할 name@범위가 없습니다")
+
+    CACHE = open_cache(args)
+    timings = {} if args.timing else None
+    start = time.perf_counter()
+    first_at = None  # 첫 결과를 출력한 시각
+
+    if args.scan:
+        writer = OutdatedWriter(args.format)
+        stats = scan_outdated(args.scan, writer, timings)
+        writer.close()
+        first_at = writer.first_at
+        first_text = f"첫 행 {first_at - start:.2f}초, " if first_at is not None else ""
+        print(f"\n스캔: 워크스페이스 {stats['workspaces']}개, 의존성 {stats['dependencies']}개 "
+              f"(고유 패키지 {stats['packages']}개, 레지스트리 외 {stats['unsupported']}개), "
+              f"outdated {stats['outdated']}건, {first_text}{time.perf_counter() - start:.2f}초 "
+              f"({CLIENT.format_stats()})", file=sys.stderr)
+    elif specs and args.graph:
+        graph = build_graph(specs, timings)
+        print_graph(graph, args.format)
+        print(f"\n그래프: name@version {len(graph.nodes)}개, 충돌 {len(graph.conflicts())}건, "
+              f"해석 실패 {len(graph.missing)}건, {time.perf_counter() - start:.2f}초 ({CLIENT.format_stats()})",
+              file=sys.stderr)
+    elif specs:
+        print_resolved(resolve_specs(specs, timings), args.format)
+    else:
+        # --all은 모든 카테고리를 (카테고리, 패키지) 한 줄로 펼쳐 하나의 풀에서 조회하고
+        # 출력할 때 카테고리별로 다시 묶는다 (중복 패키지는 한 번만 조회)
+        if args.all:
+            sequence = [(cat, pkg) for cat, pkgs in PACKAGES.items() for pkg in pkgs]
+        else:
+            sequence = [(None, pkg) for pkg in packages]
+        writer = ResultWriter(args.format)
+        for index, result in iter_versions([pkg for _, pkg in sequence], timings):
+            writer.add(index, result, sequence[index][0])
+        writer.close()
+        first_at = writer.first_at
+    sys.stdout.flush()
 
-    if packages:
-        results = get_versions_parallel(packages)
-        print_results(results, args.format)
+    if timings is not None:
+        print_timing(timings, time.perf_counter() - start, first_at - start if first_at is not None else None)
+    if CACHE is not None:
+        finish_revalidation()
+    if tracer is not None:
+        wall = time.perf_counter() - start
+        if args.stats:
+            print("\n" + tracer.format_summary(wall), file=sys.stderr)
+        if args.trace:
+            try:
+                tracer.write(args.trace, wall, registry=args.registry, concurrency=args.concurrency)
+            except OSError as e:
+                print(f"trace 파일을 쓸 수 없습니다: {e}", file=sys.stderr)
+    if CACHE is not None:
+        print(CACHE.format_stats(), file=sys.stderr)
+        CACHE.close()
 
 
 if __name__ == "__main__":
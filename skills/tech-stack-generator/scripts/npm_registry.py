@@ -0,0 +1,333 @@
+"""
+npm 레지스트리 클라이언트 (http.client keep-alive 연결 재사용)
+
+패키지마다 curl 프로세스를 띄우는 대신 워커 스레드마다 레지스트리와의
+HTTP/1.1 연결을 하나씩 유지하여, TLS 핸드셰이크는 스레드당 한 번만 한다.
+429/5xx 응답과 연결 오류는 지수 백오프(+ Retry-After)로 재시도한다.
+tracer(request_trace.RequestTracer)를 주면 요청마다 단계별 시간, 상태 코드,
+재시도 횟수, 오류 종류를 span으로 남긴다. 표준 라이브러리만 사용한다.
+
+Usage:
+    client = RegistryClient("https://registry.npmjs.org", concurrency=16)
+    docs = client.map(client.latest, ["react", "next"])
+"""
+
+import gzip
+import http.client
+import json
+import random
+import socket
+import ssl
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import quote, urlsplit
+
+from request_trace import RequestTracer
+
+DEFAULT_REGISTRY = "https://registry.npmjs.org"
+# 설치에 필요한 필드만 담긴 축약 메타데이터(abbreviated packument)의 Accept 값
+ABBREVIATED = "application/vnd.npm.install-v1+json"
+# 재시도할 HTTP 상태 코드
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Retry-After 헤더를 따르더라도 이보다 오래 기다리지 않는다 (초)
+MAX_RETRY_AFTER = 30.0
+
+# 유휴 keep-alive 연결을 서버가 닫았을 때 발생하는 예외
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+# 잘리거나 깨진 gzip 본문 (gzip.decompress가 던지는 예외)
+_GZIP_ERRORS = (EOFError, zlib.error)
+
+
+class RegistryError(Exception):
+    """레지스트리 요청 실패 (재시도 후에도 실패한 경우 포함)
+
+    kind: 오류 종류 ("http", "json", "timeout", "dns", "connect", "tls", "reset", "protocol", "gzip", "network")
+    attempts: 포기하기까지 시도한 횟수
+    """
+
+    def __init__(self, message: str, status: int | None = None, kind: str = "http"):
+        super().__init__(message)
+        self.status = status
+        self.kind = kind
+        self.attempts = 1
+
+
+def error_kind(error: Exception) -> str:
+    """연결/프로토콜 예외의 종류 (RegistryError.kind와 span의 error)"""
+    if isinstance(error, TimeoutError):
+        return "timeout"
+    if isinstance(error, socket.gaierror):
+        return "dns"
+    if isinstance(error, ssl.SSLError):
+        return "tls"
+    if isinstance(error, _STALE_ERRORS + (ConnectionError,)):
+        return "connect" if isinstance(error, ConnectionRefusedError) else "reset"
+    if isinstance(error, http.client.HTTPException):
+        return "protocol"
+    if isinstance(error, _GZIP_ERRORS):
+        return "gzip"
+    return "network"
+
+
+def _elapsed_ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+class RegistryClient:
+    """스레드별 keep-alive 연결로 npm 레지스트리를 조회하는 클라이언트
+
+    concurrency: 동시 요청 수 (= 워커 스레드와 연결 수)
+    timeout: 요청 하나의 연결/응답 타임아웃 (초)
+    retries: 429/5xx/연결 오류 시 추가 시도 횟수
+    backoff: 첫 재시도 대기 시간 (초), 시도마다 두 배 + 지터
+    tracer: 요청별 span을 받을 RequestTracer (None이면 계측하지 않음)
+    """
+
+    def __init__(self, registry: str = DEFAULT_REGISTRY, concurrency: int = 10, timeout: float = 10.0,
+                 retries: int = 3, backoff: float = 0.5, tracer: RequestTracer | None = None):
+        parts = urlsplit(registry.rstrip("/"))
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"잘못된 레지스트리 URL: {registry}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.tracer = tracer
+        self.stats = {"requests": 0, "connections": 0, "retries": 0}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[http.client.HTTPConnection] = []
+        # 연결이 스레드에 묶여 있으므로 map() 호출 간에 같은 워커 스레드를 재사용한다
+        self._executor: ThreadPoolExecutor | None = None
+        self._ssl_context = ssl.create_default_context() if self.scheme == "https" else None
+
+    # -- 연결 관리 ------------------------------------------------------------
+
+    def _open_socket(self, phases: dict[str, float]) -> socket.socket:
+        """DNS 조회, TCP 연결, TLS 핸드셰이크를 따로 재며 소켓을 연다 (phases에 ms 누적)"""
+        port = self.port or (443 if self.scheme == "https" else 80)
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self.host, port, type=socket.SOCK_STREAM)
+        finally:
+            phases["dns"] = phases.get("dns", 0.0) + _elapsed_ms(start)
+        start = time.perf_counter()
+        try:
+            # socket.create_connection()처럼 주소를 차례로 시도한다
+            error: OSError = OSError(f"{self.host}: 주소 없음")
+            for family, type_, proto, _, address in addresses:
+                sock = socket.socket(family, type_, proto)
+                try:
+                    sock.settimeout(self.timeout)
+                    sock.connect(address)
+                    break
+                except OSError as e:
+                    sock.close()
+                    error = e
+            else:
+                raise error
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        finally:
+            phases["connect"] = phases.get("connect", 0.0) + _elapsed_ms(start)
+        if self._ssl_context is None:
+            return sock
+        start = time.perf_counter()
+        try:
+            return self._ssl_context.wrap_socket(sock, server_hostname=self.host)
+        except OSError:
+            sock.close()
+            raise
+        finally:
+            phases["tls"] = phases.get("tls", 0.0) + _elapsed_ms(start)
+
+    def _connect(self, span: dict) -> http.client.HTTPConnection:
+        if self.scheme == "https":
+            conn = http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout,
+                                               context=self._ssl_context)
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        conn.sock = self._open_socket(span["phases_ms"])
+        span["new_connections"] += 1
+        with self._lock:
+            self.stats["connections"] += 1
+            self._connections.append(conn)
+        self._local.conn = conn
+        return conn
+
+    def _drop(self, conn: http.client.HTTPConnection):
+        """끊긴(또는 서버가 닫겠다고 한) 연결을 닫고 이 스레드에서 떼어낸다."""
+        conn.close()
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        if getattr(self._local, "conn", None) is conn:
+            self._local.conn = None
+
+    def close(self):
+        """워커 스레드를 정리하고 열려 있는 모든 연결을 닫는다."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- 요청 -------------------------------------------------------------------
+
+    def _send(self, path: str, accept: str, span: dict) -> tuple[int, http.client.HTTPMessage, bytes]:
+        """GET 한 번 (유휴 연결이 끊겨 있으면 새 연결로 한 번 더, 단계별 시간은 span에 누적)"""
+        headers = {"Accept": accept, "Accept-Encoding": "gzip", "User-Agent": "get-npm-versions"}
+        phases = span["phases_ms"]
+        conn = getattr(self._local, "conn", None)
+        reused = conn is not None
+        if conn is None:
+            conn = self._connect(span)
+        try:
+            start = time.perf_counter()
+            try:
+                conn.request("GET", self.base_path + path, headers=headers)
+                resp = conn.getresponse()
+            except _STALE_ERRORS:
+                if not reused:
+                    raise
+                self._drop(conn)
+                conn = self._connect(span)
+                start = time.perf_counter()
+                conn.request("GET", self.base_path + path, headers=headers)
+                resp = conn.getresponse()
+            finally:
+                phases["ttfb"] = phases.get("ttfb", 0.0) + _elapsed_ms(start)
+            start = time.perf_counter()
+            body = resp.read()
+            phases["download"] = phases.get("download", 0.0) + _elapsed_ms(start)
+            span["bytes"] += len(body)
+            if resp.headers.get("Content-Encoding", "").lower() == "gzip":
+                start = time.perf_counter()
+                try:
+                    body = gzip.decompress(body)
+                finally:
+                    phases["decode"] = phases.get("decode", 0.0) + _elapsed_ms(start)
+        except (OSError, http.client.HTTPException, *_GZIP_ERRORS):
+            self._drop(conn)
+            raise
+        if resp.will_close:
+            self._drop(conn)
+        with self._lock:
+            self.stats["requests"] += 1
+        return resp.status, resp.headers, body
+
+    def _delay(self, attempt: int, headers: http.client.HTTPMessage | None) -> float:
+        retry_after = headers.get("Retry-After") if headers is not None else None
+        if retry_after and retry_after.strip().isdigit():
+            return min(float(retry_after), MAX_RETRY_AFTER)
+        return self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    def _attempt(self, path: str, accept: str, span: dict) -> tuple[dict | None, RegistryError | None,
+                                                                     http.client.HTTPMessage | None]:
+        """시도 한 번: (JSON, None, 헤더) 또는 (None, 오류, 헤더)"""
+        try:
+            status, headers, body = self._send(path, accept, span)
+        except (OSError, http.client.HTTPException, *_GZIP_ERRORS) as e:
+            span["status"] = None
+            return None, RegistryError(f"{path}: {e.__class__.__name__}: {e}", kind=error_kind(e)), None
+        span["status"] = status
+        if status != 200:
+            return None, RegistryError(f"{path}: HTTP {status}", status), headers
+        start = time.perf_counter()
+        try:
+            return json.loads(body), None, headers
+        except ValueError as e:
+            return None, RegistryError(f"{path}: JSON 파싱 실패 ({e})", status, "json"), headers
+        finally:
+            span["phases_ms"]["decode"] = span["phases_ms"].get("decode", 0.0) + _elapsed_ms(start)
+
+    def get_json(self, path: str, accept: str = "application/json") -> dict:
+        """`path`를 조회해 JSON으로 반환 (429/5xx/연결 오류는 재시도)
+
+        404 등 재시도 대상이 아닌 오류와 재시도 소진 시 RegistryError를 던진다.
+        tracer가 있으면 성공/실패와 관계없이 span을 하나 남긴다.
+        """
+        queued = getattr(self._local, "queued", None)
+        self._local.queued = None
+        span = {"path": path, "start": time.time(), "duration_ms": 0.0,
+                "phases_ms": {"queue": queued * 1000} if queued is not None else {},
+                "status": None, "attempts": [], "retries": 0, "error": None, "bytes": 0,
+                "new_connections": 0, "thread": threading.current_thread().name}
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt_start = time.perf_counter()
+            data, error, headers = self._attempt(path, accept, span)
+            span["attempts"].append({"status": error.status if error else span["status"],
+                                     "error": error.kind if error else None,
+                                     "ms": round(_elapsed_ms(attempt_start), 2)})
+            if error is None or error.status not in (None, *RETRY_STATUSES) or attempt >= self.retries:
+                break
+            with self._lock:
+                self.stats["retries"] += 1
+            delay = self._delay(attempt, headers)
+            time.sleep(delay)
+            span["phases_ms"]["backoff"] = span["phases_ms"].get("backoff", 0.0) + delay * 1000
+            attempt += 1
+        if self.tracer is not None:
+            span["duration_ms"] = round(_elapsed_ms(start), 2)
+            span["phases_ms"] = {phase: round(ms, 2) for phase, ms in span["phases_ms"].items()}
+            span["retries"] = attempt
+            span["error"] = error.kind if error else None
+            self.tracer.record(span)
+        if error is not None:
+            error.attempts = attempt + 1
+            raise error
+        return data
+
+    def latest(self, name: str) -> dict:
+        """패키지의 latest 태그 버전 문서 (/<name>/latest)"""
+        return self.get_json(f"/{quote(name, safe='@/')}/latest")
+
+    def packument(self, name: str) -> dict:
+        """패키지의 축약 메타데이터 (/<name>, dist-tags와 모든 버전의 의존성)"""
+        return self.get_json(f"/{quote(name, safe='@/')}", ABBREVIATED)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        return self._executor
+
+    def _queued(self, fn: Callable) -> Callable:
+        """tracer가 있으면 풀에 넣은 뒤 실행되기까지의 대기 시간을 다음 span에 남기도록 감싼다."""
+        if self.tracer is None:
+            return fn
+        enqueued = time.perf_counter()
+
+        def run(*args):
+            self._local.queued = time.perf_counter() - enqueued
+            return fn(*args)
+
+        return run
+
+    def map(self, fn: Callable, items: Iterable) -> list:
+        """`fn`을 items에 동시 적용하여 입력 순서대로 반환"""
+        return list(self._pool().map(self._queued(fn), items))
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """`fn(*args)`를 같은 워커 풀에서 백그라운드로 실행"""
+        return self._pool().submit(self._queued(fn), *args)
+
+    def format_stats(self) -> str:
+        s = self.stats
+        return f"요청 {s['requests']}건, 연결 {s['connections']}개, 재시도 {s['retries']}회"
@@ -0,0 +1,128 @@
+"""
+레지스트리 요청 계측 (요청별 span 수집, 지연 시간 백분위 요약, JSON trace 파일)
+
+RegistryClient(tracer=...)는 get_json() 호출마다 span 하나를 남긴다. span에는
+단계별 소요 시간(풀 대기, DNS, TCP 연결, TLS, 첫 바이트, 본문 수신, 디코딩,
+재시도 대기), 시도별 상태 코드와 오류 종류, 재시도 횟수, 받은 바이트 수가
+들어 있다. 느린 실행이 DNS/TLS 때문인지, 레지스트리의 429 때문인지, 워커
+풀이 밀려서인지 여기서 구분할 수 있다. 표준 라이브러리만 사용한다.
+
+Usage:
+    tracer = RequestTracer()
+    client = RegistryClient(registry, tracer=tracer)
+    ...
+    print(tracer.format_summary(), file=sys.stderr)
+    tracer.write("trace.json", registry=registry)
+"""
+
+import json
+import math
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+# span의 단계 (phases_ms의 키, 출력 순서)
+PHASES = ("queue", "dns", "connect", "tls", "ttfb", "download", "decode", "backoff")
+PHASE_LABELS = {
+    "queue": "풀 대기",
+    "dns": "DNS",
+    "connect": "TCP 연결",
+    "tls": "TLS",
+    "ttfb": "첫 바이트",
+    "download": "본문 수신",
+    "decode": "디코딩",
+    "backoff": "재시도 대기",
+}
+
+
+def percentile(values: list[float], p: float) -> float:
+    """정렬된 values의 p 백분위 (nearest-rank, 비어 있으면 0)"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))]
+
+
+class RequestTracer:
+    """요청별 span을 모으고 요약한다 (여러 워커 스레드에서 record()를 불러도 된다).
+
+    span: {"path", "start" (유닉스 시각), "duration_ms" (풀 대기 제외), "phases_ms",
+           "status", "attempts": [{"status", "error", "ms"}], "retries", "error",
+           "bytes", "new_connections", "thread"}
+    """
+
+    def __init__(self):
+        self.spans: list[dict] = []
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, span: dict):
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self, wall: float | None = None) -> dict:
+        """지연 시간 백분위, 처리량, 단계별 시간, 상태 코드와 오류 분포
+
+        wall은 처리량 계산에 쓰는 전체 시간(초)이다 (없으면 tracer를 만든 뒤 지난 시간).
+        """
+        with self._lock:
+            spans = list(self.spans)
+        if wall is None:
+            wall = time.perf_counter() - self._start
+        latencies = sorted(span["duration_ms"] for span in spans)
+        phases = {}
+        for phase in PHASES:
+            values = sorted(span["phases_ms"].get(phase, 0.0) for span in spans)
+            if values and values[-1] > 0:
+                phases[phase] = {"mean": round(sum(values) / len(values), 2), "p95": percentile(values, 95)}
+        statuses = Counter(str(attempt["status"]) for span in spans for attempt in span["attempts"]
+                           if attempt["status"] is not None)
+        errors = Counter(f"{span['error']} {span['status']}" if span["error"] == "http" else span["error"]
+                         for span in spans if span["error"])
+        return {
+            "requests": len(spans),
+            "ok": sum(1 for span in spans if not span["error"]),
+            "failed": sum(1 for span in spans if span["error"]),
+            "retries": sum(span["retries"] for span in spans),
+            "new_connections": sum(span["new_connections"] for span in spans),
+            "bytes": sum(span["bytes"] for span in spans),
+            "wall_s": round(wall, 3),
+            "throughput": round(len(spans) / wall, 2) if wall > 0 else 0.0,
+            "latency_ms": {
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "max": latencies[-1] if latencies else 0.0,
+                "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            },
+            "phases_ms": phases,
+            "statuses": dict(sorted(statuses.items())),
+            "errors": dict(errors.most_common()),
+        }
+
+    def format_summary(self, wall: float | None = None) -> str:
+        s = self.summary(wall)
+        if not s["requests"]:
+            return "요청 통계: 레지스트리 요청 없음"
+        latency = s["latency_ms"]
+        lines = [
+            f"요청 통계: {s['requests']}건 (성공 {s['ok']}, 실패 {s['failed']}), 재시도 {s['retries']}회, "
+            f"새 연결 {s['new_connections']}개, {s['bytes'] / 1024:.0f}KB, 처리량 {s['throughput']:.1f}건/초",
+            f"지연 시간: p50 {latency['p50']:.0f}ms, p95 {latency['p95']:.0f}ms, p99 {latency['p99']:.0f}ms, "
+            f"최대 {latency['max']:.0f}ms (풀 대기 제외)",
+        ]
+        if s["phases_ms"]:
+            lines.append("단계별 평균 (p95): " + ", ".join(
+                f"{PHASE_LABELS[phase]} {v['mean']:.1f}ms ({v['p95']:.0f}ms)" for phase, v in s["phases_ms"].items()))
+        lines.append("상태 코드: " + (", ".join(f"{code} {n}건" for code, n in s["statuses"].items()) or "-"))
+        if s["errors"]:
+            lines.append("오류: " + ", ".join(f"{kind} {n}건" for kind, n in s["errors"].items()))
+        return "\n".join(lines)
+
+    def write(self, path: str | Path, wall: float | None = None, **meta):
+        """span 목록과 요약을 JSON trace 파일로 저장 (meta는 최상위 필드로 들어간다)"""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["start"])
+        document = {"started_at": self.started_at, **meta, "summary": self.summary(wall), "spans": spans}
+        Path(path).write_text(json.dumps(document, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
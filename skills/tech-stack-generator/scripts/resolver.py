@@ -0,0 +1,262 @@
+"""
+축약 메타데이터(abbreviated packument) 기반 버전 해석과 의존성 그래프 확장
+
+Resolver는 패키지별 문서를 한 번만 받아 두고 (이름, 범위) 질의를 그 문서로
+해석한다 (정렬된 버전 목록과 해석 결과를 메모). expand_graph()는 요청한
+패키지에서 시작해 dependencies/optionalDependencies/peerDependencies를 따라
+그래프를 넓히고, 문서 조회는 호출하는 쪽이 넘긴 request/wait 콜백에 맡긴다
+(조회 중인 문서를 기다리는 동안 이미 받은 문서의 의존성을 계속 처리한다).
+표준 라이브러리만 사용한다.
+
+Usage:
+    resolver = Resolver()
+    resolver.add("react", packument)
+    resolver.resolve("react", "^18")    # ("18.3.1", "ok")
+"""
+
+import functools
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterable
+
+from semver import Range, max_satisfying, parse, sort_versions
+
+# 레지스트리 범위가 아닌 의존성 지정 (로컬 경로, git, URL 등)
+UNSUPPORTED_PREFIXES = ("file:", "link:", "workspace:", "portal:", "patch:", "git+", "git:", "github:",
+                        "gitlab:", "bitbucket:", "http:", "https:")
+# 그래프에서 따라가는 의존성 필드와 간선 종류
+EDGE_FIELDS = (("dependencies", "prod"), ("optionalDependencies", "optional"), ("peerDependencies", "peer"))
+
+
+def parse_spec(spec: str) -> tuple[str, str]:
+    """"name@range" (범위 생략 시 "latest" 태그)를 (이름, 범위)로 나눈다."""
+    at = spec.rfind("@")
+    if at > 0:
+        return spec[:at], spec[at + 1:].strip() or "latest"
+    return spec, "latest"
+
+
+def registry_target(name: str, spec: str) -> tuple[str, str] | None:
+    """의존성 지정을 (레지스트리 패키지, 범위)로 (npm: 별칭 포함, 로컬/git/URL이면 None)"""
+    spec = spec.strip()
+    if spec.startswith("npm:"):
+        return parse_spec(spec[len("npm:"):])
+    if spec.startswith(UNSUPPORTED_PREFIXES) or ("/" in spec and not spec.startswith("@")):
+        return None
+    return name, spec or "*"
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_range(text: str) -> Range:
+    return Range(text)
+
+
+def resolve_version(doc: dict, ordered: Callable[[], list], range_text: str) -> str | None:
+    """dist-tag 또는 범위에 맞는 버전 (ordered()는 sort_versions() 결과를 돌려준다)
+
+    npm과 같이 latest 태그가 범위를 만족하면 그것을, 아니면 만족하는 가장 높은
+    버전을 고른다. 대부분 latest에서 끝나므로 버전 정렬은 필요할 때만 한다.
+    잘못된 범위면 ValueError를 던진다.
+    """
+    tags = doc.get("dist-tags") or {}
+    if range_text in tags:
+        return tags[range_text]
+    range_ = parse_range(range_text)
+    latest = tags.get("latest")
+    if latest in doc["versions"] and range_.test(latest):
+        return latest
+    return max_satisfying(ordered(), range_)
+
+
+class Resolver:
+    """이름별 축약 메타데이터와 (이름, 범위) 해석 결과 메모
+
+    문서가 None이면 캐시에 없는 것(offline), "error" 키가 있으면 조회 실패로 본다.
+    """
+
+    def __init__(self):
+        self.docs: dict[str, dict | None] = {}
+        self._ordered: dict[str, list] = {}
+        self._memo: dict[tuple[str, str], tuple[str | None, str]] = {}
+
+    def add(self, name: str, doc: dict | None):
+        self.docs[name] = doc
+
+    def has(self, name: str) -> bool:
+        return name in self.docs
+
+    def latest(self, name: str) -> str:
+        doc = self.docs.get(name)
+        return (doc.get("dist-tags") or {}).get("latest", "") if doc and "error" not in doc else ""
+
+    def manifest(self, name: str, version: str) -> dict:
+        """버전의 의존성 필드 (get_packument()가 남긴 것)"""
+        return self.docs[name]["versions"].get(version) or {}
+
+    def _sorted(self, name: str) -> list:
+        if name not in self._ordered:
+            self._ordered[name] = sort_versions(self.docs[name]["versions"])
+        return self._ordered[name]
+
+    def resolve(self, name: str, range_text: str) -> tuple[str | None, str]:
+        """(버전, 상태): 상태는 "ok", "uncached", "error", "invalid-range", "no-match" 중 하나"""
+        key = (name, range_text)
+        if key in self._memo:
+            return self._memo[key]
+        doc = self.docs[name]
+        if doc is None:
+            result = (None, "uncached")
+        elif "error" in doc:
+            result = (None, "error")
+        else:
+            try:
+                version = resolve_version(doc, lambda: self._sorted(name), range_text)
+            except ValueError:
+                result = (None, "invalid-range")
+            else:
+                result = (version, "ok") if version else (None, "no-match")
+        self._memo[key] = result
+        return result
+
+
+class DependencyGraph:
+    """해석된 name@version 노드와 간선, peer 요구사항
+
+    nodes: "name@version" -> {"name", "version", "dependencies": {의존 이름: 버전 또는 상태},
+                              "peers": {이름: 범위}, "optional_peers": [이름], "dependents": 들어오는 간선 수}
+    """
+
+    def __init__(self, roots: list[tuple[str, str]]):
+        # 문서가 도착하는 순서와 관계없이 결과가 같도록 루트는 요청 순서대로 자리를 잡아 둔다
+        self.roots = [{"name": name, "range": spec, "version": None} for name, spec in roots]
+        self._root_index = {(name, spec): i for i, (name, spec) in reversed(list(enumerate(roots)))}
+        self.nodes: dict[str, dict] = {}
+        self.missing: list[dict] = []
+
+    def add_node(self, name: str, version: str, manifest: dict) -> str:
+        key = f"{name}@{version}"
+        optional = [peer for peer, meta in (manifest.get("peerDependenciesMeta") or {}).items()
+                    if isinstance(meta, dict) and meta.get("optional")]
+        self.nodes[key] = {"name": name, "version": version, "dependencies": {},
+                           "peers": dict(manifest.get("peerDependencies") or {}),
+                           "optional_peers": optional, "dependents": 0}
+        return key
+
+    def link(self, parent: str | None, dep_name: str, spec: str, kind: str, key: str | None, status: str):
+        """parent(None이면 루트)에서 dep_name으로 가는 간선 (key는 해석된 노드, 실패 시 None)"""
+        if key is not None:
+            self.nodes[key]["dependents"] += 1
+        resolved = self.nodes[key]["version"] if key is not None else status
+        if parent is None:
+            self.roots[self._root_index[(dep_name, spec)]]["version"] = resolved
+        elif kind != "peer":
+            self.nodes[parent]["dependencies"][dep_name] = resolved
+        if key is None and kind != "optional":
+            self.missing.append({"package": parent or "(root)", "dependency": dep_name, "range": spec,
+                                 "kind": kind, "status": status})
+
+    def versions(self) -> dict[str, list[str]]:
+        """이름별 해석된 버전 (높은 버전부터)"""
+        by_name = defaultdict(list)
+        for node in self.nodes.values():
+            by_name[node["name"]].append(node["version"])
+        return {name: sorted(vs, key=lambda v: parse(v) or (), reverse=True) for name, vs in sorted(by_name.items())}
+
+    def chosen(self) -> dict[str, str]:
+        """이름별로 peer 요구사항을 비교할 대표 버전
+
+        루트로 요청한 패키지는 그 버전, 나머지는 가장 많이 의존되는 버전
+        (같으면 높은 버전)이다.
+        """
+        chosen = {}
+        for root in self.roots:
+            if f"{root['name']}@{root['version']}" in self.nodes:
+                chosen.setdefault(root["name"], root["version"])
+        for name, versions in self.versions().items():
+            if name not in chosen:
+                chosen[name] = max(versions, key=lambda v: (self.nodes[f"{name}@{v}"]["dependents"], parse(v) or ()))
+        return chosen
+
+    def conflicts(self) -> list[dict]:
+        """대표 버전이 peerDependencies 범위를 만족하지 않는 경우들"""
+        chosen = self.chosen()
+        found = []
+        for key, node in sorted(self.nodes.items()):
+            for peer, range_text in sorted(node["peers"].items()):
+                version = chosen.get(peer)
+                if version is None:
+                    continue  # 선택적 peer이거나 해석 실패 (missing에 기록됨)
+                try:
+                    satisfied = parse_range(range_text).test(version)
+                except ValueError:
+                    satisfied = False
+                if not satisfied:
+                    found.append({"package": key, "peer": peer, "range": range_text, "found": version,
+                                  "optional": peer in node["optional_peers"]})
+        return found
+
+    def to_dict(self) -> dict:
+        """JSON 출력용 (노드/간선/실패 목록을 정렬하여 실행마다 같은 결과)"""
+        nodes = {key: {**node, "dependencies": dict(sorted(node["dependencies"].items()))}
+                 for key, node in sorted(self.nodes.items())}
+        return {
+            "roots": self.roots,
+            "resolved": dict(sorted(self.chosen().items())),
+            "versions": self.versions(),
+            "conflicts": self.conflicts(),
+            "missing": sorted(self.missing, key=lambda m: (m["package"], m["dependency"], m["range"])),
+            "nodes": nodes,
+        }
+
+
+def expand_graph(roots: list[tuple[str, str]], resolver: Resolver, request: Callable[[str], bool],
+                 wait: Callable[[], Iterable[str]]) -> DependencyGraph:
+    """루트 (이름, 범위)에서 시작해 의존성/peer 그래프를 넓힌다.
+
+    request(이름)은 문서 조회를 시작하고, 문서가 이미 resolver에 들어 있으면
+    True를 돌려준다 (이름마다 한 번만 불린다). wait()는 조회 중인 문서가 하나
+    이상 끝날 때까지 기다려 resolver에 넣고 그 이름들을 돌려준다.
+
+    name@version 노드마다 의존성은 한 번만 펼친다. 루트로 요청한 이름에 대한
+    peer 간선은 새 노드를 만들지 않고(루트 버전이 제공) 충돌 검사에만 쓰며,
+    선택적 peer(peerDependenciesMeta.optional)는 따라가지 않는다.
+    """
+    graph = DependencyGraph(roots)
+    root_names = {name for name, _ in roots}
+    requested: set[str] = set()
+    waiting: dict[str, list] = defaultdict(list)
+    work = deque((name, spec, None, "root") for name, spec in roots)
+
+    while True:
+        while work:
+            item = work.popleft()
+            dep_name, spec, parent, kind = item
+            target = registry_target(dep_name, spec)
+            if target is None:
+                graph.link(parent, dep_name, spec, kind, None, "unsupported")
+                continue
+            package, range_text = target
+            if not resolver.has(package):
+                if package in requested or not request(package):
+                    requested.add(package)
+                    waiting[package].append(item)
+                    continue
+                requested.add(package)
+            version, status = resolver.resolve(package, range_text)
+            if version is None:
+                graph.link(parent, dep_name, spec, kind, None, status)
+                continue
+            key = f"{package}@{version}"
+            if key not in graph.nodes:
+                manifest = resolver.manifest(package, version)
+                graph.add_node(package, version, manifest)
+                for field, edge in EDGE_FIELDS:
+                    for child, child_spec in (manifest.get(field) or {}).items():
+                        if edge == "peer" and (child in root_names or child in graph.nodes[key]["optional_peers"]):
+                            continue
+                        work.append((child, child_spec, key, edge))
+            graph.link(parent, dep_name, spec, kind, key, status)
+
+        if not waiting:
+            return graph
+        for name in wait():
+            work.extend(waiting.pop(name, ()))
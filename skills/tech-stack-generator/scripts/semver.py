@@ -0,0 +1,211 @@
+"""
+npm 방식 semver 버전/범위 매처 (표준 라이브러리만 사용)
+
+지원하는 범위 문법 (node-semver와 같은 의미):
+    1.2.3, =1.2.3, v1.2.3         정확히 일치
+    >1.2 <=2 >=1.0.0-rc.1         비교 연산자 (부분 버전 포함, 공백은 AND)
+    ^1.2.3, ~1.2, ~>1.2           캐럿/틸드
+    1.x, 1.2.*, *, "" (빈 문자열)  X-범위
+    1.2 - 2.3.4                   하이픈 범위
+    A || B                        OR
+
+프리릴리스 버전(1.2.3-beta.1)은 같은 [major, minor, patch]에 프리릴리스가
+붙은 비교자가 범위에 있을 때만 일치한다 (npm의 기본 동작).
+
+Usage:
+    r = Range("^18.2")
+    r.test("18.3.1")                           # True
+    max_satisfying(["17.0.2", "18.3.1"], r)    # "18.3.1"
+"""
+
+import re
+from collections.abc import Iterable
+
+# 비교용 키: (major, minor, patch, 릴리스면 1/프리릴리스면 0, 프리릴리스 식별자들)
+Key = tuple
+
+_VERSION_RE = re.compile(
+    r"^\s*[v=]?\s*(\d+)\.(\d+)\.(\d+)(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?(?:\+[0-9A-Za-z.-]+)?\s*$")
+# 부분 버전 (1, 1.2, 1.x, 1.2.*, 1.2.3-rc.1)
+_PARTIAL_RE = re.compile(
+    r"^[v=]?(\d+|[xX*])(?:\.(\d+|[xX*])(?:\.(\d+|[xX*])(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?"
+    r"(?:\+[0-9A-Za-z.-]+)?)?)?$")
+_COMPARATOR_RE = re.compile(r"^(<=|>=|<|>|=|\^|~>?)?(.*)$")
+# 연산자와 버전 사이의 공백 (">= 1.2")
+_OP_SPACE_RE = re.compile(r"(<=|>=|<|>|=|\^|~>?)\s+")
+_HYPHEN_RE = re.compile(r"^\s*(\S+)\s+-\s+(\S+)\s*$")
+
+
+def _prerelease_key(prerelease: str | None) -> tuple:
+    # 숫자 식별자는 숫자로, 나머지는 문자열로 비교하며 숫자가 항상 앞선다
+    if not prerelease:
+        return ()
+    return tuple((0, int(p), "") if p.isdigit() else (1, 0, p) for p in prerelease.split("."))
+
+
+def _key(major: int, minor: int, patch: int, prerelease: str | None = None) -> Key:
+    return (major, minor, patch, 0 if prerelease else 1, _prerelease_key(prerelease))
+
+
+def parse(version: str) -> Key | None:
+    """정확한 버전 문자열의 비교용 키 (semver가 아니면 None)"""
+    m = _VERSION_RE.match(version)
+    if not m:
+        return None
+    return _key(int(m[1]), int(m[2]), int(m[3]), m[4])
+
+
+# 범위 문법을 풀면서 만든 경계의 프리릴리스 식별자 (실제 어떤 프리릴리스보다도 작다)
+_FLOOR = ((0, -1, ""),)
+
+
+def _lower(major: int, minor: int = 0, patch: int = 0) -> Key:
+    """X.Y.Z의 어떤 프리릴리스보다도 작은 키 (npm의 X.Y.Z-0 경계에 해당)"""
+    return (major, minor, patch, 0, _FLOOR)
+
+
+def _partial(text: str) -> tuple[int | None, int | None, int | None, str | None]:
+    m = _PARTIAL_RE.match(text)
+    if not m:
+        raise ValueError(f"잘못된 버전: {text!r}")
+    parts = [None if p is None or p in "xX*" else int(p) for p in m.groups()[:3]]
+    # 앞 자리가 와일드카드면 뒤 자리도 와일드카드
+    for i in range(1, 3):
+        if parts[i - 1] is None:
+            parts[i] = None
+    return parts[0], parts[1], parts[2], m[4] if parts[2] is not None else None
+
+
+def _desugar(op: str, text: str) -> list[tuple[str, Key]]:
+    """비교자 하나를 (연산자, 키) 목록으로 바꾼다 (연산자는 <, <=, >, >=, =)"""
+    if text in ("", "*", "x", "X") and op in ("", "=", "^", "~", "~>", ">="):
+        return [(">=", _lower(0))]
+    major, minor, patch, pre = _partial(text)
+    if major is None:
+        # <* , >*: 아무것도 일치하지 않음 / <=*: 모두
+        return [(">=", _lower(0))] if op == "<=" else [("<", _lower(0))]
+
+    if op in ("", "="):
+        if minor is None:
+            return [(">=", _lower(major)), ("<", _lower(major + 1))]
+        if patch is None:
+            return [(">=", _lower(major, minor)), ("<", _lower(major, minor + 1))]
+        return [("=", _key(major, minor, patch, pre))]
+
+    if op in ("~", "~>"):
+        low = _key(major, minor or 0, patch or 0, pre)
+        if minor is None:
+            return [(">=", low), ("<", _lower(major + 1))]
+        return [(">=", low), ("<", _lower(major, minor + 1))]
+
+    if op == "^":
+        low = _key(major, minor or 0, patch or 0, pre)
+        if major > 0 or minor is None:
+            return [(">=", low), ("<", _lower(major + 1))]
+        if minor > 0 or patch is None:
+            return [(">=", low), ("<", _lower(0, minor + 1))]
+        return [(">=", low), ("<", _lower(0, 0, patch + 1))]
+
+    # 비교 연산자 + 부분 버전
+    if minor is None:
+        bumped, base = _lower(major + 1), _lower(major)
+    elif patch is None:
+        bumped, base = _lower(major, minor + 1), _lower(major, minor)
+    else:
+        full = _key(major, minor, patch, pre)
+        return [(op, full)]
+    if op == ">":
+        return [(">=", bumped)]
+    if op == ">=":
+        return [(">=", base)]
+    if op == "<":
+        return [("<", base)]
+    return [("<", bumped)]  # <=
+
+
+def _hyphen(low: str, high: str) -> list[tuple[str, Key]]:
+    major, minor, patch, pre = _partial(low)
+    lower = [(">=", _lower(0))] if major is None else [(">=", _key(major, minor or 0, patch or 0, pre))]
+    major, minor, patch, pre = _partial(high)
+    if major is None:
+        return lower
+    if minor is None:
+        return lower + [("<", _lower(major + 1))]
+    if patch is None:
+        return lower + [("<", _lower(major, minor + 1))]
+    return lower + [("<=", _key(major, minor, patch, pre))]
+
+
+_OPS = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "=": lambda a, b: a == b,
+}
+
+
+class Range:
+    """npm semver 범위. 잘못된 문법이면 ValueError를 던진다."""
+
+    __slots__ = ("raw", "sets")
+
+    def __init__(self, text: str):
+        self.raw = text
+        self.sets: list[list[tuple[str, Key]]] = []
+        for part in text.split("||"):
+            m = _HYPHEN_RE.match(part)
+            if m:
+                self.sets.append(_hyphen(m[1], m[2]))
+                continue
+            comparators = []
+            for token in _OP_SPACE_RE.sub(r"\1", part).split() or [""]:
+                op, version = _COMPARATOR_RE.match(token).groups()
+                comparators.extend(_desugar(op or "", version))
+            self.sets.append(comparators)
+
+    def test(self, version: str | Key | None) -> bool:
+        """버전(문자열 또는 parse() 키)이 범위를 만족하는지"""
+        key = parse(version) if isinstance(version, str) else version
+        if key is None:
+            return False
+        for comparators in self.sets:
+            if not all(_OPS[op](key, bound) for op, bound in comparators):
+                continue
+            if key[3] == 1:
+                return True
+            # 프리릴리스는 같은 major.minor.patch의 프리릴리스 비교자가 있을 때만
+            if any(bound[3] == 0 and bound[:3] == key[:3] and bound[4] != _FLOOR
+                   for _, bound in comparators):
+                return True
+        return False
+
+    def __repr__(self) -> str:
+        return f"Range({self.raw!r})"
+
+
+def is_valid_range(text: str) -> bool:
+    try:
+        Range(text)
+    except ValueError:
+        return False
+    return True
+
+
+def sort_versions(versions: Iterable[str]) -> list[tuple[Key, str]]:
+    """semver인 버전만 (키, 문자열)로 높은 버전부터 정렬"""
+    keyed = [(key, v) for v in versions if (key := parse(v)) is not None]
+    keyed.sort(reverse=True)
+    return keyed
+
+
+def max_satisfying(versions: Iterable[str] | list[tuple[Key, str]], range_: Range | str) -> str | None:
+    """범위를 만족하는 가장 높은 버전 (sort_versions() 결과를 주면 다시 정렬하지 않는다)"""
+    if isinstance(range_, str):
+        range_ = Range(range_)
+    versions = list(versions)
+    ordered = versions if versions and isinstance(versions[0], tuple) else sort_versions(versions)
+    for key, version in ordered:
+        if range_.test(key):
+            return version
+    return None
@@ -0,0 +1,138 @@
+"""
+npm 버전 조회 결과 로컬 캐시 (SQLite)
+
+레지스트리 URL과 패키지 이름을 키로 마지막 조회 결과를 저장한다.
+latest 조회 결과(versions)와 범위 해석용 축약 메타데이터(packuments)를
+별도 테이블에 둔다.
+TTL이 지나지 않은 항목은 네트워크 없이 바로 쓰고, 만료된 항목은
+다시 조회한다. stale-while-revalidate 모드에서는 만료된 항목도 일단
+바로 돌려주고 백그라운드에서 다시 조회해 다음 실행에 반영한다.
+표준 라이브러리만 사용한다.
+
+Usage:
+    cache = VersionCache(default_cache_dir() / "versions.sqlite", DEFAULT_REGISTRY, ttl=3600)
+    hits, fetch, revalidate = cache.partition(["react", "next"])
+"""
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+# 기본 TTL (초)
+DEFAULT_TTL = 3600.0
+# 한 번의 SELECT에 넣는 이름 수 (SQLite 변수 개수 제한 아래로)
+_CHUNK = 500
+
+# 캐시 테이블 (같은 구조)
+TABLES = ("versions", "packuments")
+
+_SCHEMA = "".join(f"""
+CREATE TABLE IF NOT EXISTS {table} (
+    registry   TEXT NOT NULL,
+    name       TEXT NOT NULL,
+    result     TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (registry, name)
+);""" for table in TABLES)
+
+
+def default_cache_dir() -> Path:
+    """$XDG_CACHE_HOME/get-npm-versions (없으면 ~/.cache/get-npm-versions)"""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "get-npm-versions"
+
+
+class VersionCache:
+    """패키지별 조회 결과 캐시
+
+    ttl: 항목이 신선한 것으로 보는 시간 (초)
+    stale_while_revalidate: 만료된 항목을 바로 쓰고 백그라운드에서 갱신
+    offline: 캐시만 사용 (만료 여부와 관계없이, 없는 패키지는 조회하지 않음)
+    refresh: 캐시를 읽지 않고 모두 다시 조회하여 덮어씀
+
+    SQLite 연결은 만든 스레드(메인 스레드)에서만 사용한다.
+    """
+
+    def __init__(self, path: str | Path, registry: str, ttl: float = DEFAULT_TTL,
+                 stale_while_revalidate: bool = False, offline: bool = False, refresh: bool = False):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=10)
+        self._db.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;" + _SCHEMA)
+        self.registry = registry.rstrip("/")
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.offline = offline
+        self.refresh = refresh
+        self.stats = {"hits": 0, "stale": 0, "misses": 0, "stored": 0}
+
+    def get_many(self, names: list[str], table: str = "versions") -> dict[str, tuple[dict, float]]:
+        """캐시에 있는 패키지의 {이름: (결과, 경과 초)}"""
+        if table not in TABLES:
+            raise ValueError(f"알 수 없는 캐시 테이블: {table}")
+        now = time.time()
+        found = {}
+        for i in range(0, len(names), _CHUNK):
+            chunk = names[i:i + _CHUNK]
+            rows = self._db.execute(
+                f"SELECT name, result, fetched_at FROM {table} WHERE registry = ? "
+                f"AND name IN ({', '.join('?' * len(chunk))})",
+                [self.registry, *chunk],
+            )
+            for name, result, fetched_at in rows:
+                found[name] = (json.loads(result), now - fetched_at)
+        return found
+
+    def partition(self, names: list[str], table: str = "versions") -> tuple[dict[str, dict], list[str], list[str]]:
+        """(바로 쓸 결과, 지금 조회할 이름, 백그라운드에서 갱신할 이름)으로 나눈다.
+
+        offline 모드에서 캐시에 없는 이름은 조회 목록 대신 어디에도 넣지 않는다.
+        """
+        names = list(dict.fromkeys(names))
+        if self.refresh:
+            self.stats["misses"] += len(names)
+            return {}, names, []
+
+        hits, fetch, revalidate = {}, [], []
+        cached = self.get_many(names, table)
+        for name in names:
+            entry = cached.get(name)
+            if entry is None:
+                self.stats["misses"] += 1
+                if not self.offline:
+                    fetch.append(name)
+                continue
+            result, age = entry
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                hits[name] = result
+            elif self.offline or self.stale_while_revalidate:
+                self.stats["stale"] += 1
+                hits[name] = result
+                if not self.offline:
+                    revalidate.append(name)
+            else:
+                self.stats["misses"] += 1
+                fetch.append(name)
+        return hits, fetch, revalidate
+
+    def put_many(self, results: list[dict], table: str = "versions"):
+        """조회 결과를 이름별로 저장 (실패한 결과는 호출하는 쪽에서 걸러 낸다)"""
+        if table not in TABLES:
+            raise ValueError(f"알 수 없는 캐시 테이블: {table}")
+        now = time.time()
+        rows = [(self.registry, r["name"], json.dumps(r, ensure_ascii=False, separators=(",", ":")), now)
+                for r in results]
+        with self._db:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {table} (registry, name, result, fetched_at) VALUES (?, ?, ?, ?)", rows)
+        self.stats["stored"] += len(rows)
+
+    def close(self):
+        self._db.close()
+
+    def format_stats(self) -> str:
+        s = self.stats
+        return f"캐시 적중 {s['hits']}, 만료 {s['stale']}, 누락 {s['misses']}, 저장 {s['stored']}"
@@ -0,0 +1,199 @@
+"""
+모노레포 package.json / 락파일 스캔 (표준 라이브러리만 사용)
+
+os.scandir로 디렉터리를 훑어 모든 package.json을 찾고 (node_modules와
+점으로 시작하는 디렉터리는 건너뜀), 각 의존성의 현재 설치 버전을 가장
+가까운 락파일(package-lock.json / npm-shrinkwrap.json / pnpm-lock.yaml)에서,
+없으면 node_modules/<이름>/package.json에서 읽는다.
+
+pnpm-lock.yaml은 YAML 라이브러리 없이 importers(없으면 최상위
+dependencies) 구역만 들여쓰기 기준으로 읽는다 (lockfile v5~v9).
+
+Usage:
+    deps = scan_workspace("path/to/monorepo")
+    # [{"name", "range", "location", "current"}, ...]
+"""
+
+import json
+import os
+from pathlib import Path
+
+# 스캔하지 않는 디렉터리 (점으로 시작하는 디렉터리도 건너뜀)
+SKIP_DIRS = frozenset({"node_modules", "bower_components", "dist", "build", "coverage"})
+# 락파일 (같은 디렉터리에 여럿이면 앞의 것을 쓴다)
+LOCKFILES = ("package-lock.json", "npm-shrinkwrap.json", "pnpm-lock.yaml")
+# outdated 확인 대상 의존성 필드 (peerDependencies는 설치되지 않으므로 제외)
+SCAN_FIELDS = ("dependencies", "devDependencies", "optionalDependencies")
+# pnpm-lock.yaml importer 안의 의존성 구역
+_PNPM_SECTIONS = ("dependencies:", "devDependencies:", "optionalDependencies:")
+
+
+def find_manifests(root: str | Path) -> tuple[list[Path], dict[Path, Path]]:
+    """root 아래의 (package.json 목록, {디렉터리: 락파일})"""
+    manifests = []
+    lockfiles = {}
+    stack = [Path(root)]
+    while stack:
+        directory = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                names = {}
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS and not entry.name.startswith("."):
+                            subdirs.append(entry.path)
+                    elif entry.is_file():
+                        names[entry.name] = entry.path
+        except OSError:
+            continue
+        if "package.json" in names:
+            manifests.append(Path(names["package.json"]))
+        lock = next((names[name] for name in LOCKFILES if name in names), None)
+        if lock:
+            lockfiles[directory] = Path(lock)
+        stack.extend(Path(p) for p in sorted(subdirs, reverse=True))
+    return manifests, lockfiles
+
+
+def _clean_version(version: str) -> str | None:
+    """락파일 버전 표기에서 semver만 (pnpm peer 접미사 제거, link:/file: 등은 None)"""
+    version = version.strip().strip("'\"")
+    if not version or ":" in version.split("(", 1)[0]:
+        return None
+    return version.split("(", 1)[0].split("_", 1)[0]
+
+
+def read_package_lock(path: Path) -> dict[str, dict[str, str]]:
+    """package-lock.json -> {importer 상대 경로: {이름: 버전}} (호이스팅된 것은 "" 아래)"""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    importers: dict[str, dict[str, str]] = {}
+    packages = data.get("packages")
+    if isinstance(packages, dict):  # lockfileVersion 2, 3
+        for key, meta in packages.items():
+            prefix, sep, name = key.rpartition("node_modules/")
+            if not sep or "node_modules/" in prefix or not isinstance(meta, dict) or "version" not in meta:
+                continue
+            version = _clean_version(str(meta["version"]))
+            if version:
+                importers.setdefault(prefix.rstrip("/"), {})[name] = version
+        return importers
+    for name, meta in (data.get("dependencies") or {}).items():  # lockfileVersion 1
+        version = _clean_version(str(meta.get("version", ""))) if isinstance(meta, dict) else None
+        if version:
+            importers.setdefault("", {})[name] = version
+    return importers
+
+
+def _yaml_key(text: str) -> str:
+    return text.strip().rstrip(":").strip().strip("'\"")
+
+
+def read_pnpm_lock(path: Path) -> dict[str, dict[str, str]]:
+    """pnpm-lock.yaml -> {importer 상대 경로: {이름: 버전}} (루트 importer는 "")"""
+    importers: dict[str, dict[str, str]] = {}
+    # 구역 들여쓰기: importers 아래는 importer(2) / 구역(4) / 이름(6) / 필드(8)
+    base = None
+    importer = section = name = None
+    for raw in path.read_text(encoding="utf-8").splitlines():
+        if not raw.strip() or raw.lstrip().startswith("#"):
+            continue
+        indent = len(raw) - len(raw.lstrip(" "))
+        line = raw.strip()
+        if indent == 0:
+            importer = section = name = None
+            if line == "importers:":
+                base = 2
+            elif line in _PNPM_SECTIONS:  # importers가 없는 단일 프로젝트 락파일
+                base, importer, section = 0, "", line
+            else:
+                base = None
+            continue
+        if base is None:
+            continue
+        level = indent - base
+        if base == 2 and level == 0:
+            importer = _yaml_key(line)
+            importer = "" if importer == "." else importer
+            section = name = None
+        elif level == 2 and importer is not None and base == 2:
+            section = line if line in _PNPM_SECTIONS else None
+        elif section is not None and level == (4 if base == 2 else 2):
+            key, _, value = line.partition(":")
+            name = _yaml_key(key)
+            if value.strip():  # v5: 이름: 버전
+                version = _clean_version(value)
+                if version:
+                    importers.setdefault(importer, {})[name] = version
+                name = None
+        elif section is not None and name is not None and level == (6 if base == 2 else 4):
+            key, _, value = line.partition(":")
+            if key.strip() == "version":
+                version = _clean_version(value)
+                if version:
+                    importers.setdefault(importer, {})[name] = version
+    return importers
+
+
+def read_lockfile(path: Path) -> dict[str, dict[str, str]]:
+    """락파일 종류에 맞게 읽는다 (읽을 수 없으면 빈 dict)"""
+    try:
+        return read_pnpm_lock(path) if path.name.endswith(".yaml") else read_package_lock(path)
+    except (OSError, ValueError, UnicodeDecodeError):
+        return {}
+
+
+def _installed_version(directory: Path, name: str, root: Path) -> str | None:
+    """directory에서 root까지 올라가며 node_modules/<name>/package.json의 버전"""
+    while True:
+        try:
+            data = json.loads((directory / "node_modules" / name / "package.json").read_text(encoding="utf-8"))
+            return data.get("version") or None
+        except (OSError, ValueError):
+            pass
+        if directory == root or directory.parent == directory:
+            return None
+        directory = directory.parent
+
+
+def scan_workspace(root: str | Path) -> list[dict]:
+    """root 아래 모든 package.json의 의존성과 현재 설치 버전
+
+    반환: [{"name", "range", "location" (root 기준 package.json 디렉터리), "current"}]
+    워크스페이스 안의 패키지(스캔한 package.json의 name)끼리의 의존성은 제외한다.
+    """
+    root = Path(root).resolve()
+    manifests, lockfiles = find_manifests(root)
+    parsed_locks: dict[Path, dict[str, dict[str, str]]] = {}
+    documents = []
+    for manifest in manifests:
+        try:
+            data = json.loads(manifest.read_text(encoding="utf-8"))
+        except (OSError, ValueError, UnicodeDecodeError):
+            continue
+        if isinstance(data, dict):
+            documents.append((manifest.parent, data))
+    local = {data.get("name") for _, data in documents if data.get("name")}
+
+    deps = []
+    for directory, data in documents:
+        lock_dir = next((d for d in (directory, *directory.parents) if d in lockfiles), None)
+        locked = {}
+        if lock_dir is not None:
+            if lock_dir not in parsed_locks:
+                parsed_locks[lock_dir] = read_lockfile(lockfiles[lock_dir])
+            importers = parsed_locks[lock_dir]
+            relative = directory.relative_to(lock_dir).as_posix()
+            relative = "" if relative == "." else relative
+            # 워크스페이스 자신의 node_modules에 있는 버전이 호이스팅된 버전보다 우선
+            locked = {**importers.get("", {}), **importers.get(relative, {})} if relative else importers.get("", {})
+        location = directory.relative_to(root).as_posix()
+        seen = set()
+        for field in SCAN_FIELDS:
+            for name, spec in (data.get(field) or {}).items():
+                if name in local or name in seen or not isinstance(spec, str):
+                    continue
+                seen.add(name)
+                current = locked.get(name) or _installed_version(directory, name, root)
+                deps.append({"name": name, "range": spec, "location": location, "current": current})
+    return deps
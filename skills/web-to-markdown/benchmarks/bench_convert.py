@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Offline conversion benchmark with a fixture corpus and regression gate.
+
+Usage:
+    python bench_convert.py [--repeat 7] [--scale 1] [--only regex]
+    python bench_convert.py --save baseline.json
+    python bench_convert.py --compare baseline.json [--threshold 0.25]
+
+Runs html_to_markdown (both engines), extract_main_content and strip_tag
+over every page in corpus/ plus synthetic pathological fixtures, and
+reports MB/s, p50/p99 latency and peak traced memory per case.
+
+--save writes the results as a JSON baseline; --compare exits with status
+1 when any case's p50 latency or peak memory grew by more than
+--threshold (a fraction) over that baseline; changes under 0.5 ms or
+64 KB are ignored as noise. Baselines are only meaningful on the machine
+that recorded them. Fully offline.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_engines import build_page, build_unclosed_page, load_corpus  # noqa: E402
+from fetch_markdown import STRIP_TAGS, extract_main_content, html_to_markdown, strip_tag  # noqa: E402
+
+
+def build_deep_nesting(depth: int) -> str:
+    """`depth` nested <div>s around a paragraph, repeated in a <main>."""
+    block = "<div>" * depth + "<p>deep <b>text</b></p>" + "</div>" * depth
+    return "<html><body><main>" + block * 4 + "</main></body></html>"
+
+
+def build_huge_table(rows: int, cols: int = 8) -> str:
+    header = "<thead><tr>" + "".join(f"<th>col {c}</th>" for c in range(cols)) + "</tr></thead>"
+    body = "".join(
+        "<tr>" + "".join(f"<td>r{r}c{c} <code>v</code></td>" for c in range(cols)) + "</tr>" for r in range(rows)
+    )
+    return f"<html><body><main><table>{header}<tbody>{body}</tbody></table></main></body></html>"
+
+
+def build_many_pre(blocks: int) -> str:
+    block = ('<p>Example {i}:</p><pre><code class="language-python">def f{i}(x):\n'
+             '    return x &lt; {i} and x &gt; 0\n</code></pre>')
+    return "<html><body><main>" + "".join(block.format(i=i) for i in range(blocks)) + "</main></body></html>"
+
+
+def build_script_heavy(scripts: int) -> str:
+    """Chrome-heavy page: many <script>/<style>/<nav> blocks around a small <main>."""
+    chrome = ("<script>var a = '<div>' + 1;</script><style>.x{color:red}</style>"
+              "<nav><a href='/'>home</a></nav>")
+    return f"<html><head>{chrome * scripts}</head><body>{chrome * scripts}<main><p>content</p></main></body></html>"
+
+
+def load_fixtures(scale: float) -> dict[str, str]:
+    """Saved corpus pages plus synthetic pathological pages, sized by `scale`."""
+    corpus = load_corpus()
+    fixtures = {f"corpus/{name}": page for name, page in corpus.items()}
+    n = lambda base: max(1, int(base * scale))  # noqa: E731
+    fixtures.update({
+        "synthetic/docs-1m": build_page(corpus, n(1024 * 1024)),
+        "synthetic/deep-nesting": build_deep_nesting(n(2000)),
+        "synthetic/huge-table": build_huge_table(n(5000)),
+        "synthetic/many-pre": build_many_pre(n(2000)),
+        "synthetic/script-heavy": build_script_heavy(n(2000)),
+        # Regex engine time grows quadratically here, so keep it small
+        "synthetic/unclosed": build_unclosed_page(n(32 * 1024)),
+    })
+    return fixtures
+
+
+def _strip_all(page: str) -> str:
+    for tag in STRIP_TAGS:
+        page = strip_tag(page, tag)
+    return page
+
+
+TARGETS = {
+    "html_to_markdown[stream]": lambda page: html_to_markdown(page, "stream"),
+    "html_to_markdown[regex]": lambda page: html_to_markdown(page, "regex"),
+    "extract_main_content": extract_main_content,
+    "strip_tag": _strip_all,
+}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples`."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))]
+
+
+def measure(fn, page: str, repeat: int) -> dict[str, float]:
+    """Latency percentiles, throughput and peak traced memory of fn(page)."""
+    fn(page)  # warm up caches (compiled patterns, lazily built rules)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(page)
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn(page)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    p50 = percentile(samples, 50)
+    mb = len(page.encode("utf-8")) / (1024 * 1024)
+    return {"kb": round(mb * 1024, 1), "p50": p50, "p99": percentile(samples, 99), "mb_s": mb / p50,
+            "peak_kb": peak / 1024}
+
+
+# Differences below these are noise on sub-millisecond cases and never count as regressions
+NOISE_FLOOR = {"p50": 0.0005, "peak_kb": 64}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Describe every case whose p50 or peak memory regressed past `threshold`."""
+    regressions = []
+    for key, now in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        for metric in ("p50", "peak_kb"):
+            if now[metric] > before[metric] * (1 + threshold) and now[metric] - before[metric] > NOISE_FLOOR[metric]:
+                change = now[metric] / before[metric] - 1 if before[metric] else float("inf")
+                regressions.append(f"{key}: {metric} {before[metric]:.4g} -> {now[metric]:.4g} (+{change:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML to Markdown conversion offline")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed runs per case (default: 7)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for synthetic fixture sizes (default: 1)")
+    parser.add_argument("--only", help="Run only targets/fixtures whose name contains this text")
+    parser.add_argument("--save", metavar="FILE", help="Write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Fail if results regress against this baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed p50/peak-memory growth over the baseline (default: 0.25)")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.scale)
+    results = {}
+    print(f"{'case':<58} {'KB':>7} {'MB/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'peak KB':>9}")
+    for target, fn in TARGETS.items():
+        for name, page in fixtures.items():
+            key = f"{target} {name}"
+            if args.only and args.only not in key:
+                continue
+            r = results[key] = measure(fn, page, args.repeat)
+            print(f"{key:<58} {r['kb']:>7.0f} {r['mb_s']:>8.2f} {r['p50'] * 1000:>9.2f} "
+                  f"{r['p99'] * 1000:>9.2f} {r['peak_kb']:>9.0f}")
+
+    if args.save:
+        data = {"python": platform.python_version(), "machine": platform.machine(),
+                "scale": args.scale, "results": results}
+        Path(args.save).write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline: {args.save}", file=sys.stderr)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if baseline.get("scale") != args.scale:
+            parser.error(f"baseline was recorded with --scale {baseline.get('scale')}")
+        regressions = compare(results, baseline["results"], args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions over {args.threshold:.0%} against {args.compare}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
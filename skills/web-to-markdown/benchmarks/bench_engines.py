@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Compare the stream and regex HTML to Markdown engines.
+
+Usage:
+    python bench_engines.py --check
+    python bench_engines.py [--sizes 100k,1m,5m,20m] [--repeat 3]
+    python bench_engines.py --shape unclosed --sizes 16k,64k,256k
+
+Modes:
+    --check   Convert every file in corpus/ with both engines and fail if the
+              Markdown differs (output-equivalence gate)
+    default   Build synthetic pages of the requested sizes from the corpus and
+              report wall time and throughput for each engine
+
+Shapes:
+    docs      Well-formed documentation markup repeated from the corpus
+    unclosed  Unclosed <p>/<li>/<b> tags, which make the regex engine's
+              non-greedy patterns scan to the end of the page for every tag
+"""
+
+import argparse
+import difflib
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from fetch_markdown import ENGINES  # noqa: E402
+
+
+def parse_size(value: str) -> int:
+    """Parse sizes like 100k, 5m or 2048 into bytes."""
+    value = value.strip().lower()
+    units = {"k": 1024, "m": 1024 * 1024}
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def load_corpus() -> dict[str, str]:
+    """Read corpus/*.html keyed by file name."""
+    return {p.name: p.read_text(encoding="utf-8") for p in sorted(CORPUS_DIR.glob("*.html"))}
+
+
+def check_equivalence(corpus: dict[str, str]) -> bool:
+    """Convert each corpus page with every engine and report differences."""
+    ok = True
+    for name, page in corpus.items():
+        outputs = {engine: fn(page) for engine, fn in ENGINES.items()}
+        expected = outputs["regex"]
+        for engine, output in outputs.items():
+            if output == expected:
+                continue
+            ok = False
+            print(f"MISMATCH {name}: {engine} != regex", file=sys.stderr)
+            diff = difflib.unified_diff(
+                expected.splitlines(), output.splitlines(), "regex", engine, lineterm=""
+            )
+            print("\n".join(diff), file=sys.stderr)
+        if all(output == expected for output in outputs.values()):
+            print(f"ok   {name}")
+    return ok
+
+
+def build_page(corpus: dict[str, str], size: int) -> str:
+    """Repeat the <main> sections of the corpus until the page reaches `size` bytes."""
+    sections = []
+    for page in corpus.values():
+        start, end = page.find("<main"), page.find("</main>")
+        if start != -1 and end != -1:
+            sections.append(page[page.index(">", start) + 1:end])
+    chunk = "\n".join(sections)
+    body = [chunk] * max(1, size // max(1, len(chunk.encode("utf-8"))))
+    return "<html><body><main>\n" + "\n".join(body) + "\n</main></body></html>"
+
+
+def build_unclosed_page(size: int) -> str:
+    """Build a page of unclosed inline/block tags of roughly `size` bytes."""
+    unit = "<p>paragraph {i} <li>item <b>bold "
+    count = max(1, size // len(unit.format(i=0)))
+    return "<html><body><main>" + "".join(unit.format(i=i) for i in range(count)) + "</main></body></html>"
+
+
+SHAPES = {
+    "docs": build_page,
+    "unclosed": lambda corpus, size: build_unclosed_page(size),
+}
+
+
+def bench(page: str, repeat: int) -> dict[str, float]:
+    """Best-of-`repeat` wall time per engine, in seconds."""
+    timings = {}
+    for engine, fn in ENGINES.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(page)
+            best = min(best, time.perf_counter() - start)
+        timings[engine] = best
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML to Markdown engines")
+    parser.add_argument("--check", action="store_true", help="Run the output-equivalence corpus only")
+    parser.add_argument("--sizes", default="100k,1m,5m", help="Comma-separated page sizes (default: 100k,1m,5m)")
+    parser.add_argument("--shape", choices=list(SHAPES), default="docs", help="Synthetic page shape (default: docs)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per engine, best is reported (default: 3)")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    if args.check:
+        sys.exit(0 if check_equivalence(corpus) else 1)
+
+    print(f"{'size':>10} " + " ".join(f"{e + ' s':>10} {e + ' MB/s':>12}" for e in ENGINES) + "  speedup")
+    for size_arg in args.sizes.split(","):
+        page = SHAPES[args.shape](corpus, parse_size(size_arg))
+        mb = len(page.encode("utf-8")) / (1024 * 1024)
+        timings = bench(page, args.repeat)
+        cols = " ".join(f"{timings[e]:>10.3f} {mb / timings[e]:>12.2f}" for e in ENGINES)
+        speedup = timings["regex"] / timings["stream"]
+        print(f"{size_arg:>10} {cols}  {speedup:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Measure how HTML to Markdown conversion scales across worker processes.
+
+Usage:
+    python bench_workers.py [--pages 200] [--size 256k] [--workers 1,2,4,8]
+    python bench_workers.py --html-dir saved_pages/ [--engine regex]
+
+Converts a local corpus of saved HTML files (or synthetic pages built from
+corpus/) with the same convert_worker() used by `fetch_markdown.py
+--workers N`, once in-process and once per worker count, and reports
+pages/s, MB/s and speedup over the in-process run. Fully offline.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_engines import build_page, load_corpus, parse_size  # noqa: E402
+from fetch_markdown import ENGINES, convert_worker  # noqa: E402
+
+
+def load_pages(html_dir: str | None, pages: int, size: int) -> list[str]:
+    """Saved *.html files from `html_dir`, or `pages` synthetic pages of `size` bytes."""
+    if html_dir:
+        return [p.read_text(encoding="utf-8", errors="replace") for p in sorted(Path(html_dir).rglob("*.html"))]
+    page = build_page(load_corpus(), size)
+    # Distinct strings so no worker can benefit from another page's work
+    return [f"<!-- page {i} -->{page}" for i in range(pages)]
+
+
+def run(pages: list[str], engine: str, workers: int) -> float:
+    """Wall time to convert every page; 0 workers converts in-process."""
+    if workers == 0:
+        start = time.perf_counter()
+        for page in pages:
+            convert_worker(page, engine)
+        return time.perf_counter() - start
+
+    with ProcessPoolExecutor(workers) as pool:
+        # Start every worker before timing so process spawn is not measured
+        list(pool.map(convert_worker, ["<p>warm-up</p>"] * workers, [engine] * workers))
+        start = time.perf_counter()
+        list(pool.map(convert_worker, pages, [engine] * len(pages), chunksize=1))
+        return time.perf_counter() - start
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    default_workers = ",".join(str(n) for n in sorted({1, 2, 4, 8, cpus}) if n <= cpus)
+    parser = argparse.ArgumentParser(description="Benchmark conversion scaling across processes")
+    parser.add_argument("--html-dir", help="Directory of saved HTML files (default: synthetic pages)")
+    parser.add_argument("--pages", type=int, default=200, help="Synthetic page count (default: 200)")
+    parser.add_argument("--size", default="256k", help="Synthetic page size (default: 256k)")
+    parser.add_argument("--workers", default=default_workers, help=f"Worker counts to try (default: {default_workers})")
+    parser.add_argument("--engine", choices=list(ENGINES), default="regex", help="Conversion engine (default: regex)")
+    args = parser.parse_args()
+
+    pages = load_pages(args.html_dir, args.pages, parse_size(args.size))
+    if not pages:
+        parser.error(f"no .html files under {args.html_dir}")
+    mb = sum(len(p.encode("utf-8")) for p in pages) / (1024 * 1024)
+    print(f"{len(pages)} pages, {mb:.1f} MB, engine={args.engine}, {cpus} CPUs")
+
+    baseline = run(pages, args.engine, 0)
+    print(f"{'workers':>8} {'seconds':>9} {'pages/s':>9} {'MB/s':>8} {'speedup':>8}")
+    print(f"{'in-proc':>8} {baseline:>9.2f} {len(pages) / baseline:>9.1f} {mb / baseline:>8.2f} {1.0:>7.2f}x")
+    for workers in (int(n) for n in args.workers.split(",")):
+        elapsed = run(pages, args.engine, workers)
+        print(f"{workers:>8} {elapsed:>9.2f} {len(pages) / elapsed:>9.1f} {mb / elapsed:>8.2f} "
+              f"{baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Local HTTP/1.1 stand-in server for exercising fetch_markdown.py offline.
+
+Usage:
+    python local_server.py [--port 8765] [--directory corpus]
+
+Serves files with keep-alive connections (unlike `python -m http.server`,
+which answers with HTTP/1.0 and closes every socket), so connection reuse
+can be observed. Responses carry Last-Modified and honour If-Modified-Since.
+When a request accepts text/markdown and `page.md` exists next to
+`page.html`, the Markdown file is served instead, mimicking Markdown for
+Agents:
+
+    python fetch_markdown.py http://127.0.0.1:8765/docs-page.html
+    # Connections: 3 requests over 1 connections (2 reused, 0 evicted idle)
+"""
+
+import argparse
+import functools
+import os
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+class KeepAliveHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    extensions_map = {**SimpleHTTPRequestHandler.extensions_map, ".md": "text/markdown; charset=utf-8"}
+
+    def translate_path(self, path):
+        fs_path = super().translate_path(path)
+        if "text/markdown" in self.headers.get("Accept", "") and fs_path.endswith(".html"):
+            md_path = fs_path[: -len(".html")] + ".md"
+            if os.path.isfile(md_path):
+                return md_path
+        return fs_path
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a directory over HTTP/1.1 keep-alive")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--directory", default=str(Path(__file__).resolve().parent / "corpus"),
+                        help="Directory to serve (default: corpus/)")
+    args = parser.parse_args()
+
+    handler = functools.partial(KeepAliveHandler, directory=args.directory)
+    with ThreadingHTTPServer(("127.0.0.1", args.port), handler) as server:
+        print(f"Serving {args.directory} on http://127.0.0.1:{args.port}/")
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
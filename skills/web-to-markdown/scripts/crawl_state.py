@@ -0,0 +1,240 @@
+"""Resumable crawl frontier and URL index for fetch_markdown.py --crawl.
+
+State lives in one SQLite file with a row per discovered URL:
+    queued     Waiting to be fetched (the frontier)
+    done       Saved; `sha256` is the hash of the Markdown written
+    failed     Fetch or conversion error, kept so the URL is not retried this pass
+
+Every completed page is committed together with the links it discovered,
+so an interrupted crawl resumes from the remaining frontier. Once a pass
+has no queued URLs left, the next run starts a new pass (generation) that
+revisits known pages and only rewrites those whose content changed.
+
+Each URL is assigned an output file name once and keeps it across runs;
+names are unique (case-insensitively, for macOS/Windows file systems).
+Stdlib only.
+"""
+
+import hashlib
+import itertools
+import json
+import re
+import sqlite3
+import time
+from collections import deque
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Inline Markdown links, excluding images: [text](href "title")
+_LINK_RE = re.compile(r"(?<!!)\[[^\]]*\]\(\s*<?([^)\s>]+)>?(?:\s+\"[^\"]*\")?\s*\)")
+# Links to files that are not pages
+_ASSET_RE = re.compile(
+    r"\.(?:png|jpe?g|gif|svg|webp|ico|css|js|mjs|json|xml|txt|pdf|zip|gz|tgz|tar|whl|exe|dmg"
+    r"|mp3|mp4|webm|woff2?|ttf|otf|eot)$",
+    re.IGNORECASE,
+)
+# Query parameters that never change page content
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS pages (
+    url        TEXT PRIMARY KEY,
+    depth      INTEGER NOT NULL,
+    generation INTEGER NOT NULL,
+    status     TEXT NOT NULL,
+    sha256     TEXT,
+    filename   TEXT,
+    error      TEXT,
+    updated_at REAL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS pages_filename ON pages (filename COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS pages_frontier ON pages (generation, status, depth);
+"""
+
+
+def _remove_dot_segments(path: str) -> str:
+    segments = path.split("/")
+    out: list[str] = []
+    for segment in segments:
+        if segment == ".":
+            continue
+        if segment == "..":
+            if len(out) > 1:
+                out.pop()
+            continue
+        out.append(segment)
+    if segments[-1] in (".", ".."):
+        out.append("")
+    return "/".join(out)
+
+
+def normalize_url(url: str, base: str | None = None) -> str | None:
+    """Canonical form of `url` (resolved against `base`) for deduplication.
+
+    Lowercases scheme and host, drops default ports, fragments and
+    tracking parameters, resolves dot segments and sorts the query.
+    Returns None for anything that is not an http(s) URL.
+    """
+    try:
+        parts = urlsplit(urljoin(base, url) if base else url)
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if scheme not in DEFAULT_PORTS or not host:
+        return None
+    if ":" in host:
+        host = f"[{host}]"
+    netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, netloc, _remove_dot_segments(parts.path) or "/", urlencode(query), ""))
+
+
+def extract_links(markdown: str, base: str) -> list[str]:
+    """Normalised page URLs linked from `markdown`, in order, without repeats."""
+    links = {}
+    for m in _LINK_RE.finditer(markdown):
+        url = normalize_url(m.group(1), base)
+        if url and not _ASSET_RE.search(urlsplit(url).path):
+            links[url] = None
+    return list(links)
+
+
+def default_prefix(root: str) -> str:
+    """Path prefix a crawl from `root` stays under: the root's directory."""
+    path = urlsplit(root).path
+    return path[:path.rfind("/") + 1] or "/"
+
+
+class CrawlState:
+    """SQLite-backed frontier, visited set and URL -> file name index.
+
+    Used from a single thread; call commit() after each completed page.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;" + _SCHEMA)
+        self.generation = 0
+        self._seen: set[str] = set()
+        self._frontier: deque[tuple[str, int]] = deque()
+
+    def _meta(self, key: str) -> str | None:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def begin(self, root: str) -> bool:
+        """Resume the unfinished pass for `root`, or start a new one.
+
+        Returns True when resuming. Raises ValueError if the state file
+        belongs to a crawl of a different root URL.
+        """
+        stored_root = self._meta("root")
+        if stored_root is not None and stored_root != root:
+            raise ValueError(f"{self.path} holds the crawl state of {stored_root}; use a different state file")
+        self.generation = int(self._meta("generation") or 0)
+        self._frontier = deque(self._db.execute(
+            "SELECT url, depth FROM pages WHERE generation = ? AND status = 'queued' ORDER BY depth, rowid",
+            (self.generation,),
+        ))
+        if self._frontier:
+            self._seen = {url for (url,) in self._db.execute(
+                "SELECT url FROM pages WHERE generation = ?", (self.generation,))}
+            return True
+
+        self.generation += 1
+        self._set_meta("root", root)
+        self._set_meta("generation", str(self.generation))
+        self._seen = set()
+        self.add(root, 0)
+        self.commit()
+        return False
+
+    def add(self, url: str, depth: int) -> bool:
+        """Queue `url` unless it was already seen in this pass."""
+        if url in self._seen:
+            return False
+        self._seen.add(url)
+        self._db.execute(
+            "INSERT INTO pages (url, depth, generation, status) VALUES (?, ?, ?, 'queued') "
+            "ON CONFLICT (url) DO UPDATE SET depth = excluded.depth, "
+            "generation = excluded.generation, status = 'queued', error = NULL",
+            (url, depth, self.generation),
+        )
+        self._frontier.append((url, depth))
+        return True
+
+    def next(self) -> tuple[str, int] | None:
+        """Pop the shallowest queued (url, depth), or None when the frontier is empty."""
+        return self._frontier.popleft() if self._frontier else None
+
+    @property
+    def queued(self) -> int:
+        return len(self._frontier)
+
+    def filename(self, url: str, name: str) -> str:
+        """The file name for `url`: its existing one, else `name` made unique."""
+        row = self._db.execute("SELECT filename FROM pages WHERE url = ?", (url,)).fetchone()
+        if row and row[0]:
+            return row[0]
+        stem, dot, ext = name.rpartition(".")
+        if not dot:
+            stem, ext = name, ""
+        suffix = hashlib.sha1(url.encode("utf-8")).hexdigest()[:8]
+        candidate = name
+        for attempt in itertools.count(1):
+            try:
+                self._db.execute("UPDATE pages SET filename = ? WHERE url = ?", (candidate, url))
+                return candidate
+            except sqlite3.IntegrityError:
+                # Taken by another URL: try the URL hash, then the hash plus a counter
+                candidate = f"{stem}-{suffix}{dot}{ext}" if attempt == 1 else f"{stem}-{suffix}-{attempt}{dot}{ext}"
+
+    def sha256(self, url: str) -> str | None:
+        """Hash of the Markdown last saved for `url`."""
+        row = self._db.execute("SELECT sha256 FROM pages WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def mark_done(self, url: str, sha256: str):
+        self._db.execute(
+            "UPDATE pages SET status = 'done', sha256 = ?, error = NULL, updated_at = ? WHERE url = ?",
+            (sha256, time.time(), url),
+        )
+
+    def mark_failed(self, url: str, error: str):
+        self._db.execute(
+            "UPDATE pages SET status = 'failed', error = ?, updated_at = ? WHERE url = ?",
+            (error, time.time(), url),
+        )
+
+    def commit(self):
+        self._db.commit()
+
+    def counts(self) -> dict[str, int]:
+        """Number of URLs per status in the current pass."""
+        return dict(self._db.execute(
+            "SELECT status, COUNT(*) FROM pages WHERE generation = ? GROUP BY status", (self.generation,)))
+
+    def write_index(self, path: str | Path):
+        """Write {url: file name} for every saved page as JSON."""
+        index = dict(self._db.execute(
+            "SELECT url, filename FROM pages WHERE sha256 IS NOT NULL AND filename IS NOT NULL ORDER BY rowid"))
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(index, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    def close(self):
+        self._db.commit()
+        self._db.close()
@@ -0,0 +1,276 @@
+"""On-disk HTTP response and conversion cache for fetch_markdown.py.
+
+Layout under the cache directory:
+    responses/<key>.json   Validators and metadata per (URL, Accept variant)
+    bodies/<sha256>        Response bodies, content-addressed
+    markdown/<sha256>.<engine key>.md
+                           Converted Markdown keyed by the HTML body hash and
+                           the engine (plus a hash of its rules, see
+                           fetch_markdown.engine_cache_key)
+    hosts.json             Which hosts answer Accept: text/markdown (HostCapabilities)
+
+Revalidation uses ETag / Last-Modified (If-None-Match / If-Modified-Since),
+and responses still fresh under Cache-Control max-age are served without a
+request. Files are touched on every hit and the least recently used are
+removed once the directory grows past `max_bytes`. Stdlib only.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "fetch_markdown"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_HOST_TTL = 7 * 24 * 3600
+
+_MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Write via a temp file and rename so concurrent readers never see partial files."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _touch(path: Path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+class CacheEntry:
+    """Metadata of one cached response; the body is read on demand."""
+
+    def __init__(self, cache: "ResponseCache", path: Path, meta: dict):
+        self._cache = cache
+        self.path = path
+        self.meta = meta
+
+    @property
+    def content_type(self) -> str:
+        return self.meta.get("content_type", "")
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        """True while Cache-Control max-age allows serving without revalidation."""
+        cache_control = self.meta.get("cache_control", "")
+        if "no-cache" in cache_control.lower():
+            return False
+        m = _MAX_AGE_RE.search(cache_control)
+        if not m:
+            return False
+        return (now or time.time()) - self.meta["stored_at"] < int(m.group(1))
+
+    def validators(self) -> dict:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.meta.get("etag"):
+            headers["If-None-Match"] = self.meta["etag"]
+        if self.meta.get("last_modified"):
+            headers["If-Modified-Since"] = self.meta["last_modified"]
+        return headers
+
+    @property
+    def sha256(self) -> str:
+        return self.meta["body_sha256"]
+
+    def has_body(self) -> bool:
+        return (self._cache.root / "bodies" / self.sha256).is_file()
+
+    def iter_body(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Yield the stored body in chunks and mark it as recently used."""
+        path = self._cache.root / "bodies" / self.sha256
+        _touch(path)
+        _touch(self.path)
+        with open(path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+
+class ResponseCache:
+    """Conditional-request cache for fetched pages plus their converted Markdown."""
+
+    def __init__(self, root: str | Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root).expanduser()
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "conversions_saved": 0}
+        self._lock = threading.Lock()
+
+    def count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    @staticmethod
+    def _key(url: str, variant: str) -> str:
+        return hashlib.sha256(f"{variant}\n{url}".encode("utf-8")).hexdigest()
+
+    # -- responses ----------------------------------------------------------
+
+    def lookup(self, url: str, variant: str) -> CacheEntry | None:
+        path = self.root / "responses" / f"{self._key(url, variant)}.json"
+        try:
+            meta = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        return CacheEntry(self, path, meta)
+
+    def store_stream(self, url: str, variant: str, headers, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Pass `chunks` through while writing them to the cache.
+
+        The body is spooled to a temp file and only committed once the
+        stream is fully consumed, so an aborted download never leaves a
+        partial entry. Responses with no-store or without validators or
+        max-age are passed through untouched.
+        """
+        cache_control = headers.get("Cache-Control", "")
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if "no-store" in cache_control.lower() or not (etag or last_modified or _MAX_AGE_RE.search(cache_control)):
+            yield from chunks
+            return
+
+        bodies = self.root / "bodies"
+        bodies.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=bodies, prefix=".tmp-")
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+                    yield chunk
+            os.replace(tmp, bodies / digest.hexdigest())
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        meta = {
+            "url": url,
+            "variant": variant,
+            "etag": etag,
+            "last_modified": last_modified,
+            "cache_control": cache_control,
+            "content_type": headers.get("Content-Type", ""),
+            "body_sha256": digest.hexdigest(),
+            "stored_at": time.time(),
+        }
+        path = self.root / "responses" / f"{self._key(url, variant)}.json"
+        _atomic_write(path, json.dumps(meta).encode("utf-8"))
+
+    def refresh(self, entry: CacheEntry, headers):
+        """Record a 304: keep the body, update validators and freshness."""
+        meta = dict(entry.meta)
+        for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified"), ("cache_control", "Cache-Control")):
+            if headers.get(header):
+                meta[key] = headers[header]
+        meta["stored_at"] = time.time()
+        _atomic_write(entry.path, json.dumps(meta).encode("utf-8"))
+        entry.meta = meta
+
+    # -- converted markdown -----------------------------------------------------
+
+    def _markdown_path(self, body_sha256: str, engine_key: str) -> Path:
+        return self.root / "markdown" / f"{body_sha256}.{engine_key}.md"
+
+    def get_markdown(self, body_sha256: str, engine_key: str) -> str | None:
+        path = self._markdown_path(body_sha256, engine_key)
+        try:
+            markdown = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        _touch(path)
+        self.count("conversions_saved")
+        return markdown
+
+    def put_markdown(self, body_sha256: str, engine_key: str, markdown: str):
+        _atomic_write(self._markdown_path(body_sha256, engine_key), markdown.encode("utf-8"))
+
+    # -- eviction -----------------------------------------------------------------
+
+    def prune(self) -> int:
+        """Delete least recently used files until the cache fits `max_bytes`.
+
+        Returns the number of files removed.
+        """
+        files = []
+        total = 0
+        for sub in ("responses", "bodies", "markdown"):
+            directory = self.root / sub
+            if not directory.is_dir():
+                continue
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_file():
+                        st = entry.stat()
+                        files.append((st.st_mtime, st.st_size, entry.path))
+                        total += st.st_size
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def format_stats(self) -> str:
+        s = self.stats
+        return (f"{s['hits']} fresh hits, {s['revalidated']} revalidated (304), "
+                f"{s['misses']} misses, {s['conversions_saved']} conversions skipped")
+
+
+class HostCapabilities:
+    """Per-host memory of whether the server answers with text/markdown.
+
+    Entries expire after `ttl` seconds so a host that enables (or drops)
+    Markdown for Agents is probed again. Changes are written by save().
+    """
+
+    def __init__(self, path: str | Path, ttl: float = DEFAULT_HOST_TTL):
+        self.path = Path(path).expanduser()
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            self._hosts = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            self._hosts = {}
+
+    def serves_markdown(self, host: str) -> bool | None:
+        """True/False when known and not expired, None when the host must be probed."""
+        with self._lock:
+            entry = self._hosts.get(host)
+        if entry is None or time.time() - entry["checked_at"] > self.ttl:
+            return None
+        return entry["markdown"]
+
+    def record(self, host: str, markdown: bool):
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry and entry["markdown"] == markdown and time.time() - entry["checked_at"] <= self.ttl:
+                return
+            self._hosts[host] = {"markdown": markdown, "checked_at": time.time()}
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._hosts, indent=1, sort_keys=True).encode("utf-8")
+            self._dirty = False
+        _atomic_write(self.path, data)
@@ -3,40 +3,163 @@
 
 Usage:
     python fetch_markdown.py <url> [--output <path>] [--api-key <key>] [--zone-id <id>]
+                             [--engine regex|stream]
+    python fetch_markdown.py --urls-file <file|-> [--concurrency N] [--per-host N] [--workers N]
+    python fetch_markdown.py --crawl <url> [--max-depth N] [--path-prefix /docs/] [--max-pages N]
 
 Strategy:
-    1. If Cloudflare credentials provided, try `Accept: text/markdown` first
-    2. Fall back to fetching HTML and converting with basic heuristics
+    1. Send one request with `Accept: text/markdown, text/html;q=0.9`
+       (plus the Cloudflare API key when provided)
+    2. If HTML comes back, convert it with basic heuristics
     3. Save result to docs/ directory as .md file
+
+Whether a host answered with markdown is remembered (hosts.json in the cache
+directory), so later fetches to it skip straight to the right Accept header.
+
+Batch mode (--urls-file) runs the same strategy for many URLs in one process
+through a bounded thread pool, limited per host, and prints a throughput
+summary at the end. With --workers N, HTML conversion moves to N worker
+processes fed through a bounded queue.
+
+Crawl mode (--crawl) follows the Markdown links of each page within the
+same origin and path prefix, keeping its frontier in a SQLite state file so
+an interrupted crawl resumes where it stopped (see crawl_state.py).
+
+Conversion engines:
+    regex   Multi-pass re.sub pipeline (default); fastest on well-formed pages
+    stream  Single pass over the document on top of html.parser; slower on
+            ordinary pages but linear on unclosed tags that make regex rescan
 """
 
 import argparse
+import hashlib
 import html
+import json
 import os
 import re
 import sys
-import urllib.request
+import threading
+import time
 import urllib.error
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from datetime import datetime
+from html.parser import HTMLParser
 from pathlib import Path
 from urllib.parse import urlparse
 
+from crawl_state import CrawlState, default_prefix, extract_links, normalize_url
+from fetch_cache import DEFAULT_CACHE_DIR, DEFAULT_HOST_TTL, DEFAULT_MAX_BYTES, HostCapabilities, ResponseCache
+from http_pool import ACCEPT_ENCODING, ConnectionPool, iter_body, iter_text
 
-def fetch_with_cloudflare_markdown(url: str, api_key: str | None = None) -> str | None:
-    """Try fetching markdown via Cloudflare's text/markdown Accept header."""
+# Tags removed together with their contents before conversion
+STRIP_TAGS = ("script", "style", "nav", "footer", "header", "aside", "noscript", "svg", "iframe")
+
+# Shared keep-alive connections for every request made in this process
+POOL = ConnectionPool(timeout=15)
+# Response/conversion cache and host capability store; set up by main(), None disables them
+CACHE: ResponseCache | None = None
+HOSTS: HostCapabilities | None = None
+# Upper bound on a decompressed response body; overridden by --max-bytes
+MAX_BYTES = 50 * 1024 * 1024
+# Per-rule conversion timings collected with --profile
+PROFILE: "RuleProfile | None" = None
+
+
+class FetchedBody:
+    """A response body read lazily, chunk by chunk, from the network or the cache.
+
+    `nbytes` counts bytes consumed so far; `sha256` is known up front for
+    cached bodies and filled in once a downloaded body has been read.
+    """
+
+    def __init__(self, content_type: str, chunks: Iterator[bytes], sha256: str | None = None):
+        self.content_type = content_type
+        self._chunks = chunks
+        self.sha256 = sha256
+        self.nbytes = 0
+
+    @property
+    def is_markdown(self) -> bool:
+        return "text/markdown" in self.content_type
+
+    def chunks(self) -> Iterator[bytes]:
+        digest = hashlib.sha256() if self.sha256 is None else None
+        for chunk in self._chunks:
+            self.nbytes += len(chunk)
+            if digest:
+                digest.update(chunk)
+            yield chunk
+        if digest:
+            self.sha256 = digest.hexdigest()
+
+    def iter_text(self) -> Iterator[str]:
+        return iter_text(self.chunks(), self.content_type)
+
+    def text(self) -> str:
+        return "".join(self.iter_text())
+
+
+@contextmanager
+def open_url(url: str, headers: dict, variant: str) -> Iterator[FetchedBody]:
+    """GET through the response cache and yield the body for streaming.
+
+    A stored response still fresh under max-age is served without a
+    request; otherwise its validators are sent and a 304 is served from
+    disk. New bodies are decompressed, capped at MAX_BYTES and written to
+    the cache as they are consumed.
+    """
+    entry = CACHE.lookup(url, variant) if CACHE else None
+    if entry and not entry.has_body():
+        entry = None
+    if entry and entry.is_fresh():
+        CACHE.count("hits")
+        yield FetchedBody(entry.content_type, entry.iter_body(), entry.sha256)
+        return
+    headers = {"Accept-Encoding": ACCEPT_ENCODING, **headers}
+    if entry:
+        headers.update(entry.validators())
+
+    with POOL.request(url, headers) as resp:
+        if resp.status == 304 and entry:
+            CACHE.refresh(entry, resp.headers)
+            CACHE.count("revalidated")
+            yield FetchedBody(entry.content_type, entry.iter_body(), entry.sha256)
+            return
+        chunks = iter_body(resp, MAX_BYTES)
+        if CACHE:
+            CACHE.count("misses")
+            chunks = CACHE.store_stream(url, variant, resp.headers, chunks)
+        try:
+            yield FetchedBody(resp.headers.get("Content-Type", ""), chunks)
+        finally:
+            # Abandoned bodies must not leave half-written cache files behind
+            chunks.close()
+
+
+def request_markdown(url: str, api_key: str | None = None) -> str | None:
+    """Request `url` with `Accept: text/markdown` only.
+
+    Returns None when the server answered with another Content-Type;
+    transport errors, 4xx/5xx and ResponseTooLarge are raised, since they
+    say nothing about whether the host serves markdown.
+    """
     headers = {"Accept": "text/markdown", "User-Agent": "Claude-Code-Skill/1.0"}
     if api_key:
         headers["Authorization"] = f"Bearer {api_key}"
+    with open_url(url, headers, "markdown") as body:
+        if body.is_markdown:
+            return body.text()
+    return None
+
 
-    req = urllib.request.Request(url, headers=headers)
+def fetch_with_cloudflare_markdown(url: str, api_key: str | None = None) -> str | None:
+    """Try fetching markdown via Cloudflare's text/markdown Accept header."""
     try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            content_type = resp.headers.get("Content-Type", "")
-            if "text/markdown" in content_type:
-                return resp.read().decode("utf-8")
+        return request_markdown(url, api_key)
     except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError):
-        pass
-    return None
+        return None
 
 
 def fetch_html(url: str) -> str:
@@ -45,130 +168,627 @@ def fetch_html(url: str) -> str:
         "User-Agent": "Mozilla/5.0 (compatible; Claude-Code-Skill/1.0)",
         "Accept": "text/html,application/xhtml+xml",
     }
-    req = urllib.request.Request(url, headers=headers)
-    with urllib.request.urlopen(req, timeout=15) as resp:
-        return resp.read().decode("utf-8", errors="replace")
+    with open_url(url, headers, "html") as body:
+        return body.text()
+
+
+_DOTALL_I = re.DOTALL | re.IGNORECASE
+
+_STRIP_PATTERNS = {tag: re.compile(rf"<{tag}[\s>].*?</{tag}>", _DOTALL_I) for tag in STRIP_TAGS}
+_ROLE_MAIN_RE = re.compile(r"""\brole\s*=\s*["']?main\b""", re.IGNORECASE)
+# Content roots in the order extract_main_content() prefers them
+_CONTENT_ROOTS = ("main", "article", "div", "body")
+# Start and end tags of each content root kind. Separate patterns keep the
+# literal "<main" / "</main" prefix, which the regex engine finds with a fast
+# substring search instead of trying every "<".
+_ROOT_TAG_RES = {
+    tag: (re.compile(rf"<{tag}(?=[\s/>])([^>]*)>", re.IGNORECASE), re.compile(rf"</{tag}\s*>", re.IGNORECASE))
+    for tag in _CONTENT_ROOTS
+}
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_LINK_TEXT_RE = re.compile(r"<a(?=[\s>])[^>]*>(.*?)</a\s*>", _DOTALL_I)
+# Text of a single candidate root is counted in slices growing from the first
+# to the last size, only until its link density is decided
+_SCORE_CHUNKS = (4 * 1024, 64 * 1024)
+# Candidate roots whose text is mostly link text (menus, link lists) are passed over
+MAX_LINK_DENSITY = 0.5
+_CODE_LANG_RE = re.compile(r'class="[^"]*(?:language|lang)-(\w+)')
+_CODE_INNER_RE = re.compile(r"<code[^>]*>(.*?)</code>", _DOTALL_I)
+_TAG_RE = re.compile(r"<[^>]+>")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_TRAILING_WS_RE = re.compile(r"[ \t]+\n")
+_LEADING_WS_RE = re.compile(r"\n[ \t]+")
 
 
 def strip_tag(html_str: str, tag: str) -> str:
     """Remove a tag and its contents entirely."""
-    return re.sub(rf"<{tag}[\s>].*?</{tag}>", "", html_str, flags=re.DOTALL | re.IGNORECASE)
+    pattern = _STRIP_PATTERNS.get(tag) or re.compile(rf"<{tag}[\s>].*?</{tag}>", _DOTALL_I)
+    return pattern.sub("", html_str)
+
+
+def _outer_roots(html_str: str, tag: str) -> Iterator[tuple[int, int]]:
+    """Inner (start, end) offsets of each outermost closed <tag> in `html_str`.
+
+    Only tags of this one kind are matched and nested by depth, so the
+    Python loop runs over a handful of tokens; tags inside comments are
+    ignored and a <div> must carry role="main" to count.
+    """
+    has_comments = "<!--" in html_str
+    start_re, end_re = _ROOT_TAG_RES[tag]
+    tokens = sorted([(m.start(), m.end(), m.group(1)) for m in start_re.finditer(html_str)]
+                    + [(m.start(), m.end(), None) for m in end_re.finditer(html_str)])
+    depth = 0
+    opened = None
+    for start, end, attrs in tokens:
+        if has_comments and html_str.rfind("<!--", 0, start) > html_str.rfind("-->", 0, start):
+            continue
+        if attrs is not None:
+            if attrs.endswith("/"):
+                continue
+            depth += 1
+            if opened is None and (tag != "div" or _ROLE_MAIN_RE.search(attrs)):
+                opened = (end, depth)
+        elif depth:
+            if opened is not None and opened[1] == depth:
+                yield opened[0], start
+                opened = None
+            depth -= 1
+
+
+def _count_text(fragment: str) -> int:
+    """Non-whitespace characters of `fragment` outside markup."""
+    return len("".join(_TAG_RE.sub("", fragment).split()))
+
+
+def _root_scores(html_str: str, start: int, end: int, exact: bool = True) -> tuple[int, int]:
+    """(text, link text) counts of the candidate root html_str[start:end], comments excluded.
+
+    With `exact=False` text counting stops once the root passes the
+    choose_content_root() density test, which is all a lone candidate needs.
+    """
+    if html_str.find("<!--", start, end) != -1:
+        html_str, start, end = _COMMENT_RE.sub("", html_str[start:end]), 0, None
+    end = len(html_str) if end is None else end
+    links = _count_text("".join(_LINK_TEXT_RE.findall(html_str, start, end)))
+    if exact:
+        return _count_text(html_str[start:end]), links
+    text, pos = 0, start
+    chunk, max_chunk = _SCORE_CHUNKS
+    while pos < end:
+        # Cut after a ">" so no tag is split between slices
+        cut = html_str.find(">", pos + chunk, end) + 1 or end
+        text += _count_text(html_str[pos:cut])
+        pos = cut
+        if text and links <= text * MAX_LINK_DENSITY:
+            break
+        chunk = min(chunk * 2, max_chunk)
+    return text, links
+
+
+def choose_content_root(candidates: list[tuple[str, int, int, object]]):
+    """Pick the content root among (tag, text, links, value) candidates.
+
+    Tags are tried in _CONTENT_ROOTS order. Within one tag the candidate
+    with the most non-link text wins; empty candidates and those whose
+    link density exceeds MAX_LINK_DENSITY are skipped, except <body>.
+    Returns the winner's value, or None.
+    """
+    for root in _CONTENT_ROOTS:
+        best, best_score = None, -1
+        for tag, text, links, value in candidates:
+            if tag != root:
+                continue
+            if root == "body":
+                return value
+            if not text or links > text * MAX_LINK_DENSITY:
+                continue
+            if text - links > best_score:
+                best, best_score = value, text - links
+        if best is not None:
+            return best
+    return None
 
 
 def extract_main_content(html_str: str) -> str:
-    """Extract main content area from HTML."""
-    for tag in ["main", "article", r'div[^>]*role=["\']main["\']']:
-        m = re.search(rf"<{tag}[^>]*>(.*?)</(?:{tag.split('[')[0]})>", html_str, re.DOTALL | re.IGNORECASE)
-        if m:
-            return m.group(1)
-    # fallback: body
-    m = re.search(r"<body[^>]*>(.*?)</body>", html_str, re.DOTALL | re.IGNORECASE)
-    if m:
-        return m.group(1)
+    """Extract main content area from HTML.
+
+    Picks the outermost <main>, <article>, <div role="main"> or <body> by
+    text and link density (see choose_content_root), matching start and
+    end tags by nesting so nested elements of the same kind do not cut the
+    content short. Each kind is scanned on its own and only until one
+    yields a root. STRIP_TAGS are expected to be gone already, as the
+    regex engine removes them before this step.
+    """
+    for root in _CONTENT_ROOTS:
+        if root == "div" and not _ROLE_MAIN_RE.search(html_str):
+            continue
+        spans = list(_outer_roots(html_str, root))
+        candidates = []
+        for start, end in spans:
+            # <body> wins without a density check, so its text is never counted
+            text, links = _root_scores(html_str, start, end, exact=len(spans) > 1) if root != "body" else (0, 0)
+            candidates.append((root, text, links, (start, end)))
+        span = choose_content_root(candidates)
+        if span is not None:
+            return html_str[span[0]:span[1]]
     return html_str
 
 
-def html_to_markdown(raw_html: str) -> str:
-    """Convert HTML to Markdown using regex-based approach (no external deps)."""
-    text = raw_html
+def normalize_markdown(text: str) -> str:
+    """Collapse blank lines and trailing/leading spaces left over from conversion."""
+    text = _BLANK_LINES_RE.sub("\n\n", text)
+    text = _TRAILING_WS_RE.sub("\n", text)
+    text = _LEADING_WS_RE.sub("\n", text)
+    return text.strip()
 
-    # Remove unwanted tags entirely
-    for tag in ["script", "style", "nav", "footer", "header", "aside", "noscript", "svg", "iframe"]:
-        text = strip_tag(text, tag)
-
-    # Extract main content
-    text = extract_main_content(text)
-
-    # Remove HTML comments
-    text = re.sub(r"<!--.*?-->", "", text, flags=re.DOTALL)
-
-    # Headings
-    for i in range(6, 0, -1):
-        text = re.sub(
-            rf"<h{i}[^>]*>(.*?)</h{i}>",
-            lambda m, level=i: f"\n\n{'#' * level} {m.group(1).strip()}\n\n",
-            text, flags=re.DOTALL | re.IGNORECASE
-        )
-
-    # Code blocks (pre > code)
-    def convert_code_block(m):
-        code_tag = m.group(1)
-        lang = ""
-        lang_m = re.search(r'class="[^"]*(?:language|lang)-(\w+)', code_tag)
-        if lang_m:
-            lang = lang_m.group(1)
-        # Extract inner text
-        code_m = re.search(r"<code[^>]*>(.*?)</code>", code_tag, re.DOTALL | re.IGNORECASE)
-        content = code_m.group(1) if code_m else code_tag
-        content = html.unescape(re.sub(r"<[^>]+>", "", content))
-        return f"\n\n```{lang}\n{content.strip()}\n```\n\n"
-
-    text = re.sub(r"<pre[^>]*>(.*?)</pre>", convert_code_block, text, flags=re.DOTALL | re.IGNORECASE)
-
-    # Inline code
-    text = re.sub(r"<code[^>]*>(.*?)</code>", r"`\1`", text, flags=re.DOTALL | re.IGNORECASE)
-
-    # Links
-    text = re.sub(
-        r'<a[^>]*href="([^"]*)"[^>]*>(.*?)</a>',
-        r"[\2](\1)",
-        text, flags=re.DOTALL | re.IGNORECASE
-    )
 
-    # Images
-    text = re.sub(
-        r'<img[^>]*src="([^"]*)"[^>]*alt="([^"]*)"[^>]*/?>',
-        r"![\2](\1)",
-        text, flags=re.IGNORECASE
-    )
-    text = re.sub(
-        r'<img[^>]*src="([^"]*)"[^>]*/?>',
-        r"![](\1)",
-        text, flags=re.IGNORECASE
-    )
+def _convert_code_block(m: re.Match) -> str:
+    """Render <pre> contents as a fenced code block."""
+    code_tag = m.group(1)
+    lang = ""
+    lang_m = _CODE_LANG_RE.search(code_tag)
+    if lang_m:
+        lang = lang_m.group(1)
+    # Extract inner text
+    code_m = _CODE_INNER_RE.search(code_tag)
+    content = code_m.group(1) if code_m else code_tag
+    content = html.unescape(_TAG_RE.sub("", content))
+    return f"\n\n```{lang}\n{content.strip()}\n```\n\n"
+
+
+def _quote_block(m: re.Match) -> str:
+    return "\n" + "\n".join(f"> {line}" for line in m.group(1).strip().split("\n")) + "\n"
+
 
-    # Bold / Italic
-    text = re.sub(r"<(?:strong|b)[^>]*>(.*?)</(?:strong|b)>", r"**\1**", text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<(?:em|i)[^>]*>(.*?)</(?:em|i)>", r"*\1*", text, flags=re.DOTALL | re.IGNORECASE)
+class Rule:
+    """One step of the regex engine.
 
-    # Lists
-    text = re.sub(r"<li[^>]*>(.*?)</li>", r"\n- \1", text, flags=re.DOTALL | re.IGNORECASE)
+    Either a precompiled pattern applied with `subn(repl, text)`, or a
+    `func(text) -> (text, matches)` for steps that are not substitutions.
+    """
 
-    # Blockquotes
-    text = re.sub(
-        r"<blockquote[^>]*>(.*?)</blockquote>",
-        lambda m: "\n" + "\n".join(f"> {line}" for line in m.group(1).strip().split("\n")) + "\n",
-        text, flags=re.DOTALL | re.IGNORECASE
+    def __init__(self, name: str, pattern: re.Pattern | None = None,
+                 repl: str | Callable[[re.Match], str] = "",
+                 func: Callable[[str], tuple[str, int]] | None = None):
+        self.name = name
+        self.pattern = pattern
+        self.repl = repl
+        self.func = func
+
+    def apply(self, text: str) -> tuple[str, int]:
+        if self.func is not None:
+            return self.func(text)
+        return self.pattern.subn(self.repl, text)
+
+    def __repr__(self):
+        return f"Rule({self.name!r})"
+
+
+def _heading_rule(level: int) -> Rule:
+    return Rule(
+        f"h{level}",
+        re.compile(rf"<h{level}[^>]*>(.*?)</h{level}>", _DOTALL_I),
+        lambda m: f"\n\n{'#' * level} {m.group(1).strip()}\n\n",
     )
 
-    # Paragraphs / line breaks
-    text = re.sub(r"<br\s*/?>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"<p[^>]*>(.*?)</p>", r"\n\n\1\n\n", text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<hr[^>]*/?>", "\n\n---\n\n", text, flags=re.IGNORECASE)
 
-    # Tables
-    text = re.sub(r"</?thead[^>]*>", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"</?tbody[^>]*>", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"<th[^>]*>(.*?)</th>", r"| \1 ", text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<td[^>]*>(.*?)</td>", r"| \1 ", text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<tr[^>]*>(.*?)</tr>", r"\1|\n", text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"</?table[^>]*>", "\n", text, flags=re.IGNORECASE)
+def _extract_rule(text: str) -> tuple[str, int]:
+    content = extract_main_content(text)
+    return content, int(content is not text)
+
+
+# (name, pattern, replacement, flags) in application order; compiled once below
+_RULE_SPECS = [
+    ("comments", r"<!--.*?-->", "", re.DOTALL),
+    # h6..h1 and the code block are inserted here by _build_rules()
+    ("code", r"<code[^>]*>(.*?)</code>", r"`\1`", _DOTALL_I),
+    ("link", r'<a[^>]*href="([^"]*)"[^>]*>(.*?)</a>', r"[\2](\1)", _DOTALL_I),
+    ("img-alt", r'<img[^>]*src="([^"]*)"[^>]*alt="([^"]*)"[^>]*/?>', r"![\2](\1)", re.IGNORECASE),
+    ("img", r'<img[^>]*src="([^"]*)"[^>]*/?>', r"![](\1)", re.IGNORECASE),
+    ("bold", r"<(?:strong|b)[^>]*>(.*?)</(?:strong|b)>", r"**\1**", _DOTALL_I),
+    ("italic", r"<(?:em|i)[^>]*>(.*?)</(?:em|i)>", r"*\1*", _DOTALL_I),
+    ("li", r"<li[^>]*>(.*?)</li>", r"\n- \1", _DOTALL_I),
+    ("blockquote", r"<blockquote[^>]*>(.*?)</blockquote>", _quote_block, _DOTALL_I),
+    ("br", r"<br\s*/?>", "\n", re.IGNORECASE),
+    ("p", r"<p[^>]*>(.*?)</p>", r"\n\n\1\n\n", _DOTALL_I),
+    ("hr", r"<hr[^>]*/?>", "\n\n---\n\n", re.IGNORECASE),
+    ("thead", r"</?thead[^>]*>", "", re.IGNORECASE),
+    ("tbody", r"</?tbody[^>]*>", "", re.IGNORECASE),
+    ("th", r"<th[^>]*>(.*?)</th>", r"| \1 ", _DOTALL_I),
+    ("td", r"<td[^>]*>(.*?)</td>", r"| \1 ", _DOTALL_I),
+    ("tr", r"<tr[^>]*>(.*?)</tr>", r"\1|\n", _DOTALL_I),
+    ("table", r"</?table[^>]*>", "\n", re.IGNORECASE),
+    ("strip-tags", r"<[^>]+>", "", 0),
+]
+
+
+def _build_rules() -> list[Rule]:
+    rules = [Rule(f"strip:{tag}", pattern, "") for tag, pattern in _STRIP_PATTERNS.items()]
+    rules.append(Rule("extract-main", func=_extract_rule))
+    for name, pattern, repl, flags in _RULE_SPECS:
+        rules.append(Rule(name, re.compile(pattern, flags), repl))
+        if name == "comments":
+            rules.extend(_heading_rule(level) for level in range(6, 0, -1))
+            rules.append(Rule("pre", re.compile(r"<pre[^>]*>(.*?)</pre>", _DOTALL_I), _convert_code_block))
+    rules.append(Rule("unescape", func=lambda text: (html.unescape(text), 0)))
+    rules.append(Rule("normalize", func=lambda text: (normalize_markdown(text), 0)))
+    return rules
+
+
+# The regex engine's pipeline, compiled once at import; see register_rule()
+REGEX_RULES: list[Rule] = _build_rules()
+
+
+def register_rule(name: str, pattern: str, repl: str | Callable[[re.Match], str] = "",
+                  flags: int = 0, before: str = "strip-tags") -> Rule:
+    """Add a custom substitution to the regex engine ahead of rule `before`.
+
+    The default position sees the document after every built-in conversion
+    but while unknown tags are still present.
+    """
+    names = [rule.name for rule in REGEX_RULES]
+    if name in names:
+        raise ValueError(f"rule {name!r} already exists")
+    if before not in names:
+        raise ValueError(f"unknown rule {before!r}; choose one of: {', '.join(names)}")
+    rule = Rule(name, re.compile(pattern, flags), repl)
+    REGEX_RULES.insert(names.index(before), rule)
+    return rule
+
+
+def load_rules(path: str | Path) -> list[Rule]:
+    """Register rules from a JSON list of {name, pattern, replace, flags, before}.
+
+    `flags` is a list of re flag names such as ["IGNORECASE", "DOTALL"].
+    """
+    specs = json.loads(Path(path).read_text(encoding="utf-8"))
+    rules = []
+    for spec in specs:
+        flags = 0
+        for flag in spec.get("flags", []):
+            flags |= getattr(re, flag.upper())
+        rules.append(register_rule(
+            spec["name"], spec["pattern"], spec.get("replace", ""), flags, spec.get("before", "strip-tags"),
+        ))
+    return rules
 
-    # Strip remaining tags
-    text = re.sub(r"<[^>]+>", "", text)
 
-    # Decode HTML entities
-    text = html.unescape(text)
+class RuleProfile:
+    """Per-rule wall time, match count and UTF-8 bytes in/out, summed across documents."""
 
-    # Clean up whitespace
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = re.sub(r"[ \t]+\n", "\n", text)
-    text = re.sub(r"\n[ \t]+", "\n", text)
-    text = text.strip()
+    def __init__(self):
+        self.rows: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
 
+    def record(self, name: str, seconds: float, matches: int, bytes_in: int, bytes_out: int):
+        with self._lock:
+            row = self.rows.setdefault(name, [0.0, 0, 0, 0])
+            row[0] += seconds
+            row[1] += matches
+            row[2] += bytes_in
+            row[3] += bytes_out
+
+    def format(self) -> str:
+        total = sum(row[0] for row in self.rows.values()) or 1e-9
+        lines = [f"{'rule':<16} {'ms':>9} {'%':>6} {'matches':>9} {'KB in':>10} {'KB out':>10}", "-" * 64]
+        for name, (seconds, matches, bytes_in, bytes_out) in sorted(self.rows.items(), key=lambda r: -r[1][0]):
+            lines.append(
+                f"{name:<16} {seconds * 1000:>9.2f} {seconds / total * 100:>5.1f}% {matches:>9} "
+                f"{bytes_in / 1024:>10.1f} {bytes_out / 1024:>10.1f}"
+            )
+        lines.append(f"{'total':<16} {total * 1000:>9.2f}")
+        return "\n".join(lines)
+
+
+def html_to_markdown_regex(raw_html: str, profile: RuleProfile | None = None) -> str:
+    """Convert HTML to Markdown using regex-based approach (no external deps).
+
+    Applies REGEX_RULES in order; with `profile`, each rule's cost is recorded.
+    """
+    text = raw_html
+    if profile is None:
+        for rule in REGEX_RULES:
+            text, _ = rule.apply(text)
+        return text
+
+    for rule in REGEX_RULES:
+        bytes_in = len(text.encode("utf-8", errors="surrogatepass"))
+        start = time.perf_counter()
+        text, matches = rule.apply(text)
+        elapsed = time.perf_counter() - start
+        profile.record(rule.name, elapsed, matches, bytes_in, len(text.encode("utf-8", errors="surrogatepass")))
     return text
 
 
+_LANG_CLASS_RE = re.compile(r".*(?:language|lang)-(\w+)", re.DOTALL)
+
+
+class StreamingMarkdownConverter(HTMLParser):
+    """Single-pass HTML to Markdown converter built on html.parser events.
+
+    Produces the same Markdown as html_to_markdown_regex() for well-formed
+    pages, but walks the document once instead of running a re.sub pass per
+    rule. Markdown is emitted into a list buffer as tags arrive, so the
+    document can be fed in chunks via feed().
+
+    Intentional differences from the regex engine: elements nest properly
+    (a nested <article> or <nav> is not cut at the first closing tag),
+    <img alt> is honoured regardless of attribute order, and entities inside
+    <pre> are decoded once rather than twice.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._out: list[str] = []
+        # Elements whose inner Markdown is rewritten on close (headings, blockquotes)
+        self._frames: list[tuple[str, list[str]]] = []
+        self._skip: list[str] = []
+        self._links: list[str | None] = []
+        self._pre: dict | None = None
+        # Candidate content roots: [tag, start, end, text, links], offsets into self._out
+        self._roots: list[list] = []
+        self._open_roots: list[list] = []  # [root, depth of same-tag nesting]
+
+    # -- output -------------------------------------------------------------
+
+    def _emit(self, text: str):
+        if self._frames:
+            self._frames[-1][1].append(text)
+        else:
+            self._out.append(text)
+
+    def _close_frame(self, tag: str):
+        """Pop frames up to and including `tag`, flushing unmatched ones as-is."""
+        if not any(name == tag for name, _ in self._frames):
+            return
+        while True:
+            name, buf = self._frames.pop()
+            inner = "".join(buf)
+            if name != tag:
+                self._emit(inner)
+                continue
+            if name == "blockquote":
+                quoted = "\n".join(f"> {line}" for line in inner.strip().split("\n"))
+                self._emit(f"\n{quoted}\n")
+            else:
+                self._emit(f"\n\n{'#' * int(name[1])} {inner.strip()}\n\n")
+            return
+
+    # -- content root tracking ------------------------------------------------
+
+    def _track_open(self, tag: str, attrs: dict):
+        nested = False
+        for entry in self._open_roots:
+            if entry[0][0] == tag:
+                entry[1] += 1
+                nested = True
+        if nested or tag not in _CONTENT_ROOTS or self._frames or self._pre is not None:
+            return
+        if tag == "div" and (attrs.get("role") or "").lower() != "main":
+            return
+        root = [tag, len(self._out), None, 0, 0]
+        self._roots.append(root)
+        self._open_roots.append([root, 1])
+
+    def _track_close(self, tag: str):
+        for entry in self._open_roots[:]:
+            if entry[0][0] != tag:
+                continue
+            entry[1] -= 1
+            if entry[1] == 0:
+                entry[0][2] = len(self._out)
+                self._open_roots.remove(entry)
+
+    def _track_text(self, data: str):
+        """Count text (and link text) for the density scores of open roots, as extract_main_content() does."""
+        n = len("".join(data.split()))
+        if n:
+            for root, _ in self._open_roots:
+                root[3] += n
+                if self._links:
+                    root[4] += n
+
+    # -- parser events --------------------------------------------------------
+
+    def handle_starttag(self, tag, attrs):
+        if tag in STRIP_TAGS:
+            self._skip.append(tag)
+            return
+        if self._skip:
+            return
+        attrs = dict(attrs)
+        self._track_open(tag, attrs)
+
+        pre = self._pre
+        if pre is not None:
+            if tag == "code" and not pre["code_seen"]:
+                pre["code_seen"] = pre["in_code"] = True
+            if pre["lang"] is None:
+                m = _LANG_CLASS_RE.match(attrs.get("class") or "")
+                if m:
+                    pre["lang"] = m.group(1)
+            return
+
+        if tag in ("h1", "h2", "h3", "h4", "h5", "h6", "blockquote"):
+            self._frames.append((tag, []))
+        elif tag == "pre":
+            self._pre = {"lang": None, "code_seen": False, "in_code": False, "text": [], "code": []}
+        elif tag == "a":
+            href = attrs.get("href")
+            self._links.append(href)
+            if href is not None:
+                self._emit("[")
+        elif tag == "img":
+            src = attrs.get("src")
+            if src is not None:
+                self._emit(f"![{attrs.get('alt') or ''}]({src})")
+        elif tag == "code":
+            self._emit("`")
+        elif tag in ("strong", "b"):
+            self._emit("**")
+        elif tag in ("em", "i"):
+            self._emit("*")
+        elif tag == "li":
+            self._emit("\n- ")
+        elif tag == "p":
+            self._emit("\n\n")
+        elif tag == "br":
+            self._emit("\n")
+        elif tag == "hr":
+            self._emit("\n\n---\n\n")
+        elif tag in ("th", "td"):
+            self._emit("| ")
+        elif tag == "table":
+            self._emit("\n")
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in ("img", "br", "hr"):
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._skip:
+            if tag == self._skip[-1]:
+                self._skip.pop()
+            return
+        if tag in STRIP_TAGS:
+            return
+
+        pre = self._pre
+        if pre is not None:
+            if tag == "code":
+                pre["in_code"] = False
+            elif tag == "pre":
+                self._pre = None
+                content = "".join(pre["code"] if pre["code_seen"] else pre["text"])
+                self._emit(f"\n\n```{pre['lang'] or ''}\n{content.strip()}\n```\n\n")
+            self._track_close(tag)
+            return
+
+        if tag in ("h1", "h2", "h3", "h4", "h5", "h6", "blockquote"):
+            self._close_frame(tag)
+        elif tag == "a":
+            if self._links:
+                href = self._links.pop()
+                if href is not None:
+                    self._emit(f"]({href})")
+        elif tag == "code":
+            self._emit("`")
+        elif tag in ("strong", "b"):
+            self._emit("**")
+        elif tag in ("em", "i"):
+            self._emit("*")
+        elif tag == "p":
+            self._emit("\n\n")
+        elif tag in ("th", "td"):
+            self._emit(" ")
+        elif tag == "tr":
+            self._emit("|\n")
+        elif tag == "table":
+            self._emit("\n")
+        self._track_close(tag)
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        if self._open_roots:
+            self._track_text(data)
+        pre = self._pre
+        if pre is not None:
+            pre["text"].append(data)
+            if pre["in_code"]:
+                pre["code"].append(data)
+            return
+        self._emit(data)
+
+    # -- result -----------------------------------------------------------------
+
+    def finish(self) -> str:
+        """Flush the parser and return the normalised Markdown."""
+        self.close()
+        while self._frames:
+            _, buf = self._frames.pop()
+            self._emit("".join(buf))
+        root = choose_content_root([(tag, text, links, (start, end))
+                                    for tag, start, end, text, links in self._roots if end is not None])
+        if root is not None:
+            return normalize_markdown("".join(self._out[root[0]:root[1]]))
+        return normalize_markdown("".join(self._out))
+
+
+def html_to_markdown_stream(raw_html: str, profile: RuleProfile | None = None) -> str:
+    """Convert HTML to Markdown in a single streaming pass.
+
+    With `profile`, the whole pass is recorded as one "stream" row.
+    """
+    start = time.perf_counter()
+    converter = StreamingMarkdownConverter()
+    converter.feed(raw_html)
+    markdown = converter.finish()
+    if profile is not None:
+        profile.record("stream", time.perf_counter() - start, 0,
+                       len(raw_html.encode("utf-8", errors="surrogatepass")), len(markdown.encode("utf-8")))
+    return markdown
+
+
+ENGINES = {
+    "regex": html_to_markdown_regex,
+    "stream": html_to_markdown_stream,
+}
+
+
+def engine_cache_key(engine: str) -> str:
+    """Name converted Markdown is cached under for `engine`.
+
+    The regex engine's key carries a hash of REGEX_RULES (name, pattern,
+    flags, replacement), so Markdown converted with other --rules, or by an
+    older pipeline, is never served for the current one.
+    """
+    if engine != "regex":
+        return engine
+    digest = hashlib.sha256()
+    for rule in REGEX_RULES:
+        pattern = rule.pattern
+        repl = rule.func or rule.repl
+        digest.update(repr((
+            rule.name,
+            pattern.pattern if pattern is not None else None,
+            pattern.flags if pattern is not None else None,
+            repl if isinstance(repl, str) else getattr(repl, "__qualname__", repr(repl)),
+        )).encode("utf-8"))
+    return f"{engine}-{digest.hexdigest()[:16]}"
+
+
+def html_to_markdown(raw_html: str, engine: str = "regex", profile: RuleProfile | None = None) -> str:
+    """Convert HTML to Markdown with the selected engine (see ENGINES)."""
+    return ENGINES[engine](raw_html, profile)
+
+
+def convert_body(body: FetchedBody, engine: str = "regex") -> str:
+    """Convert an HTML response body, reusing cached Markdown for a known body hash.
+
+    With the stream engine the decoded chunks are fed straight into the
+    converter, so the page is never held in memory as a single string.
+    """
+    if PROFILE is not None:
+        # Profiling times the conversion on its own, away from network reads and the cache
+        return html_to_markdown(body.text(), engine, PROFILE)
+    if CACHE and body.sha256:
+        markdown = CACHE.get_markdown(body.sha256, engine_cache_key(engine))
+        if markdown is not None:
+            return markdown
+    if engine == "stream":
+        converter = StreamingMarkdownConverter()
+        for text in body.iter_text():
+            converter.feed(text)
+        markdown = converter.finish()
+    else:
+        markdown = html_to_markdown(body.text(), engine)
+    if CACHE:
+        CACHE.put_markdown(body.sha256, engine_cache_key(engine), markdown)
+    return markdown
+
+
 def url_to_filename(url: str) -> str:
     """Generate a filename from URL."""
     parsed = urlparse(url)
@@ -180,59 +800,447 @@ def url_to_filename(url: str) -> str:
     name = re.sub(r"[^a-zA-Z0-9_-]", "", name)
     if not name:
         name = "page"
-    return name[:80]
+    if len(name) > 80:
+        # Keep truncated names distinct: two long URLs sharing 80 chars must not overwrite each other
+        name = name[:71] + "-" + hashlib.sha1(url.encode("utf-8")).hexdigest()[:8]
+    return name
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Fetch web page as Markdown")
-    parser.add_argument("url", help="URL to fetch")
-    parser.add_argument("--output", "-o", help="Output file path (default: docs/<name>.md)")
-    parser.add_argument("--api-key", help="Cloudflare API key (or set CLOUDFLARE_API_KEY env)")
-    parser.add_argument("--zone-id", help="Cloudflare Zone ID (or set CLOUDFLARE_ZONE_ID env)")
-    args = parser.parse_args()
+class FetchedPage:
+    """Result of fetch_page(): Markdown, or HTML still waiting for a conversion worker."""
 
-    api_key = args.api_key or os.environ.get("CLOUDFLARE_API_KEY")
+    def __init__(self, url: str, nbytes: int, source: str, markdown: str | None = None,
+                 raw_html: str | None = None, sha256: str | None = None):
+        self.url = url
+        self.nbytes = nbytes
+        self.source = source  # "markdown" or "html"
+        self.markdown = markdown
+        self.raw_html = raw_html
+        self.sha256 = sha256
 
-    # Try Cloudflare markdown-for-agents first
-    markdown = None
-    if api_key:
-        print(f"Trying Cloudflare Markdown for Agents...", file=sys.stderr)
-        markdown = fetch_with_cloudflare_markdown(args.url, api_key)
-        if markdown:
-            print(f"Got markdown from Cloudflare ({len(markdown)} chars)", file=sys.stderr)
-
-    # Fallback: fetch HTML and convert
-    if not markdown:
-        # Also try without API key - some sites support it natively
-        markdown = fetch_with_cloudflare_markdown(args.url)
-        if markdown:
-            print(f"Got markdown via Accept header ({len(markdown)} chars)", file=sys.stderr)
-
-    if not markdown:
-        print("Fetching HTML and converting...", file=sys.stderr)
-        raw_html = fetch_html(args.url)
-        markdown = html_to_markdown(raw_html)
-        print(f"Converted HTML to markdown ({len(markdown)} chars)", file=sys.stderr)
 
+def fetch_page(url: str, api_key: str | None = None, engine: str = "regex",
+               verbose: bool = True, convert: bool = True) -> FetchedPage:
+    """Fetch a URL as Markdown, preferring text/markdown over HTML conversion.
+
+    Hosts remembered in HOSTS go straight to the Markdown or HTML path;
+    unknown hosts get a single negotiated request and the outcome is
+    recorded. A response cached from that negotiated request keeps being
+    used (and revalidated) once the host is known. Only a successful answer
+    changes what is recorded for a host; network errors leave it as is.
+    With `convert=False`, HTML that has no cached conversion is returned in
+    `raw_html` for the caller to convert (see convert_worker).
+    """
+    def log(message: str):
+        if verbose:
+            print(message, file=sys.stderr)
+
+    host = urlparse(url).netloc
+    serves_markdown = HOSTS.serves_markdown(host) if HOSTS else None
+    stored = CACHE.lookup(url, "negotiated") if CACHE and serves_markdown is not None else None
+    negotiate = serves_markdown is None or (stored is not None and stored.has_body())
+
+    if serves_markdown and not negotiate:
+        try:
+            markdown = request_markdown(url, api_key)
+        except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError) as e:
+            # Not an answer about markdown support; retry negotiated without recording anything
+            log(f"Markdown request failed ({e}), retrying with HTML accepted...")
+            serves_markdown, negotiate = None, True
+        else:
+            if markdown is not None:
+                # text/markdown, even with an empty body
+                log(f"Got markdown via Accept header ({len(markdown)} chars)")
+                return FetchedPage(url, len(markdown.encode("utf-8")), "markdown", markdown)
+            # The host answered with another Content-Type; forget it and fall back to HTML
+            HOSTS.record(host, False)
+            serves_markdown = False
+
+    headers = {"User-Agent": "Mozilla/5.0 (compatible; Claude-Code-Skill/1.0)"}
+    if negotiate:
+        log("Requesting markdown (HTML accepted as fallback)...")
+        headers["Accept"] = "text/markdown, text/html;q=0.9, application/xhtml+xml;q=0.9"
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        variant = "negotiated"
+    else:
+        log("Fetching HTML (host does not serve markdown)...")
+        headers["Accept"] = "text/html,application/xhtml+xml"
+        variant = "html"
+
+    with open_url(url, headers, variant) as body:
+        if negotiate and HOSTS:
+            HOSTS.record(host, body.is_markdown)
+        if body.is_markdown:
+            markdown = body.text()
+            log(f"Got markdown via Accept header ({len(markdown)} chars)")
+            return FetchedPage(url, body.nbytes, "markdown", markdown)
+        if not convert:
+            markdown = CACHE.get_markdown(body.sha256, engine_cache_key(engine)) if CACHE and body.sha256 else None
+            if markdown is not None:
+                return FetchedPage(url, body.nbytes, "html", markdown)
+            raw_html = body.text()
+            return FetchedPage(url, body.nbytes, "html", raw_html=raw_html, sha256=body.sha256)
+        markdown = convert_body(body, engine)
+    log(f"Converted HTML to markdown ({len(markdown)} chars)")
+    return FetchedPage(url, body.nbytes, "html", markdown, sha256=body.sha256)
+
+
+def init_worker(rules_path: str | None = None):
+    """ProcessPoolExecutor initializer: register --rules in each worker process."""
+    if rules_path:
+        load_rules(rules_path)
+
+
+def convert_worker(raw_html: str, engine: str = "regex") -> str:
+    """Convert one page inside a worker process."""
+    return html_to_markdown(raw_html, engine)
+
+
+def save_markdown(url: str, markdown: str, output: str | None = None) -> Path:
+    """Write Markdown with a source header to `output` or docs/<name>.md."""
     # Add source metadata header
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
-    header = f"<!-- Source: {args.url} -->\n<!-- Fetched: {now} -->\n\n"
+    header = f"<!-- Source: {url} -->\n<!-- Fetched: {now} -->\n\n"
     markdown = header + markdown
 
     # Determine output path
-    if args.output:
-        out_path = Path(args.output)
+    if output:
+        out_path = Path(output)
     else:
-        docs_dir = Path("docs")
-        docs_dir.mkdir(exist_ok=True)
-        filename = url_to_filename(args.url) + ".md"
-        out_path = docs_dir / filename
+        out_path = Path("docs") / (url_to_filename(url) + ".md")
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(markdown, encoding="utf-8")
     print(f"Saved: {out_path} ({len(markdown)} bytes)", file=sys.stderr)
-    print(str(out_path))
+    return out_path
 
 
+def read_urls(source: str) -> list[str]:
+    """Read URLs one per line from a file or stdin ("-"), skipping blanks, comments and repeats."""
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        lines = Path(source).read_text(encoding="utf-8").splitlines()
+    urls = (line.strip() for line in lines)
+    return list(dict.fromkeys(u for u in urls if u and not u.startswith("#")))
+
+
+def interleave_by_host(urls: list[str]) -> list[str]:
+    """Round-robin URLs across hosts so one large site does not starve the pool."""
+    by_host: dict[str, list[str]] = {}
+    for url in urls:
+        by_host.setdefault(urlparse(url).netloc, []).append(url)
+    queues = list(by_host.values())
+    ordered = []
+    for i in range(max((len(q) for q in queues), default=0)):
+        ordered.extend(q[i] for q in queues if i < len(q))
+    return ordered
+
+
+def run_batch(urls: list[str], api_key: str | None = None, engine: str = "regex",
+              concurrency: int = 8, per_host: int = 2, workers: int = 0,
+              rules_path: str | None = None, manifest: str | None = None) -> int:
+    """Fetch and convert many URLs with a bounded thread pool.
+
+    At most `concurrency` pages are in flight overall and at most `per_host`
+    against any single host. With `workers`, HTML is converted in a
+    ProcessPoolExecutor instead of the fetch threads; fetchers block once
+    2 * workers pages are queued for conversion, so memory stays flat.
+    Pages are written as they complete and `manifest` lists every URL in
+    input order. Returns the number of failed URLs.
+    """
+    host_limits = {urlparse(u).netloc: threading.Semaphore(per_host) for u in urls}
+    converters = ProcessPoolExecutor(workers, initializer=init_worker, initargs=(rules_path,)) if workers else None
+    backlog = threading.BoundedSemaphore(workers * 2) if workers else None
+
+    def work(url: str) -> FetchedPage:
+        with host_limits[urlparse(url).netloc]:
+            page = fetch_page(url, api_key, engine, verbose=False, convert=converters is None)
+        if page.markdown is None:
+            # Wait for room in the conversion queue before handing the page over
+            backlog.acquire()
+        return page
+
+    print(f"Fetching {len(urls)} URLs ({concurrency} fetchers, {per_host} per host"
+          + (f", {workers} conversion processes)..." if workers else ")..."), file=sys.stderr)
+    start = time.perf_counter()
+    entries = {url: {"url": url, "status": "pending"} for url in urls}
+    done = failed = total_bytes = 0
+
+    def fail(url: str, error: Exception):
+        nonlocal failed
+        failed += 1
+        entries[url].update(status="failed", error=str(error))
+        print(f"Failed: {url} ({error})", file=sys.stderr)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        fetches = {executor.submit(work, url): url for url in interleave_by_host(urls)}
+        conversions: dict = {}
+        pending = set(fetches)
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                if future in conversions:
+                    page = conversions.pop(future)
+                    backlog.release()
+                    try:
+                        page.markdown = future.result()
+                    except Exception as e:
+                        fail(page.url, e)
+                        continue
+                    if CACHE and page.sha256:
+                        CACHE.put_markdown(page.sha256, engine_cache_key(engine), page.markdown)
+                else:
+                    try:
+                        page = future.result()
+                    except Exception as e:
+                        fail(fetches[future], e)
+                        continue
+                    if page.markdown is None:
+                        try:
+                            conversion = converters.submit(convert_worker, page.raw_html, engine)
+                        except Exception as e:
+                            backlog.release()
+                            fail(page.url, e)
+                            continue
+                        page.raw_html = None
+                        conversions[conversion] = page
+                        pending.add(conversion)
+                        continue
+
+                try:
+                    out_path = save_markdown(page.url, page.markdown)
+                except OSError as e:
+                    fail(page.url, e)
+                    continue
+                entries[page.url].update(status="ok", path=str(out_path), source=page.source,
+                                         bytes=page.nbytes, chars=len(page.markdown))
+                done += 1
+                total_bytes += page.nbytes
+                print(str(out_path))
+    if converters:
+        converters.shutdown()
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(
+        f"Done: {done}/{len(urls)} pages in {elapsed:.1f}s "
+        f"({done / elapsed:.2f} pages/s, {total_bytes / elapsed / 1024:.1f} KB/s)"
+        + (f", {failed} failed" if failed else ""),
+        file=sys.stderr,
+    )
+    print(f"Connections: {POOL.format_stats()}", file=sys.stderr)
+    if manifest:
+        manifest_path = Path(manifest)
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(list(entries.values()), indent=2, ensure_ascii=False) + "\n",
+                                 encoding="utf-8")
+        print(f"Manifest: {manifest_path}", file=sys.stderr)
+    return failed
+
+
+def run_crawl(root: str, api_key: str | None = None, engine: str = "regex", parallel: int = 2,
+              max_depth: int = 3, path_prefix: str | None = None, max_pages: int = 0,
+              state_path: str = "docs/.crawl-state.sqlite", index: str = "docs/index.json",
+              out_dir: str = "docs") -> int:
+    """Mirror the pages reachable from `root` into `out_dir`.
+
+    Links found in each page's Markdown are followed when they stay on the
+    root's origin under `path_prefix` and within `max_depth` hops. Pages
+    whose Markdown hash matches the last saved copy are not rewritten.
+    State is committed after every page, so an interrupted crawl (or one
+    stopped by `max_pages`) resumes on the next run. Returns the number
+    of failed URLs.
+    """
+    root = normalize_url(root)
+    if root is None:
+        raise ValueError("--crawl needs an http(s) URL")
+    origin = urlparse(root)[:2]
+    prefix = path_prefix or default_prefix(root)
+
+    def in_scope(url: str) -> bool:
+        parts = urlparse(url)
+        return parts[:2] == origin and parts.path.startswith(prefix)
+
+    state = CrawlState(state_path)
+    if state.begin(root):
+        print(f"Resuming crawl of {root}: {state.queued} queued, {sum(state.counts().values()) - state.queued} "
+              f"already handled", file=sys.stderr)
+    else:
+        print(f"Crawling {root} (prefix {prefix}, depth {max_depth}, {parallel} parallel)...", file=sys.stderr)
+
+    start = time.perf_counter()
+    fetched = saved = unchanged = failed = total_bytes = 0
+    executor = ThreadPoolExecutor(max_workers=parallel)
+    in_flight: dict = {}
+    try:
+        while True:
+            while len(in_flight) < parallel and (not max_pages or fetched + len(in_flight) < max_pages):
+                item = state.next()
+                if item is None:
+                    break
+                in_flight[executor.submit(fetch_page, item[0], api_key, engine, False)] = item
+            if not in_flight:
+                break
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                url, depth = in_flight.pop(future)
+                fetched += 1
+                try:
+                    page = future.result()
+                except Exception as e:
+                    failed += 1
+                    state.mark_failed(url, str(e))
+                    state.commit()
+                    print(f"Failed: {url} ({e})", file=sys.stderr)
+                    continue
+                total_bytes += page.nbytes
+                if depth < max_depth:
+                    for link in extract_links(page.markdown, url):
+                        if in_scope(link):
+                            state.add(link, depth + 1)
+
+                digest = hashlib.sha256(page.markdown.encode("utf-8")).hexdigest()
+                out_path = Path(out_dir) / state.filename(url, url_to_filename(url) + ".md")
+                if digest == state.sha256(url) and out_path.exists():
+                    unchanged += 1
+                else:
+                    try:
+                        save_markdown(url, page.markdown, str(out_path))
+                    except OSError as e:
+                        failed += 1
+                        state.mark_failed(url, str(e))
+                        state.commit()
+                        print(f"Failed: {url} ({e})", file=sys.stderr)
+                        continue
+                    saved += 1
+                    print(str(out_path))
+                state.mark_done(url, digest)
+                state.commit()
+    except KeyboardInterrupt:
+        # Pages still in flight stay queued in the state file
+        executor.shutdown(wait=False, cancel_futures=True)
+        state.write_index(index)
+        state.close()
+        print("Interrupted; rerun with the same --crawl and --state to resume", file=sys.stderr)
+        raise
+    executor.shutdown()
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(
+        f"Done: {fetched} pages in {elapsed:.1f}s ({fetched / elapsed:.2f} pages/s, "
+        f"{total_bytes / elapsed / 1024:.1f} KB/s): {saved} saved, {unchanged} unchanged"
+        + (f", {failed} failed" if failed else "")
+        + (f", {state.queued} left queued" if state.queued else ""),
+        file=sys.stderr,
+    )
+    print(f"Connections: {POOL.format_stats()}", file=sys.stderr)
+    state.write_index(index)
+    state.close()
+    print(f"Index: {index}", file=sys.stderr)
+    return failed
+
+
+def finish_run():
+    """Persist host capabilities, report cache counters and apply LRU eviction."""
+    if PROFILE is not None and PROFILE.rows:
+        print(f"Conversion profile:\n{PROFILE.format()}", file=sys.stderr)
+    if HOSTS is not None:
+        HOSTS.save()
+    if CACHE is None:
+        return
+    removed = CACHE.prune()
+    print(f"Cache: {CACHE.format_stats()}" + (f", {removed} files evicted" if removed else ""), file=sys.stderr)
+
+
+def main():
+    global CACHE, HOSTS, MAX_BYTES, PROFILE
+    parser = argparse.ArgumentParser(description="Fetch web page as Markdown")
+    parser.add_argument("url", nargs="?", help="URL to fetch")
+    parser.add_argument("--output", "-o", help="Output file path (default: docs/<name>.md)")
+    parser.add_argument("--api-key", help="Cloudflare API key (or set CLOUDFLARE_API_KEY env)")
+    parser.add_argument("--zone-id", help="Cloudflare Zone ID (or set CLOUDFLARE_ZONE_ID env)")
+    parser.add_argument("--engine", choices=list(ENGINES), default="regex",
+                        help="HTML to Markdown engine (default: regex)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Report per-rule conversion time, matches and bytes in/out")
+    parser.add_argument("--rules", help="JSON file of extra regex rules for --engine regex")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the on-disk response cache")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR),
+                        help=f"Response cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="Cache size limit in MB before LRU eviction (default: %(default)s)")
+    parser.add_argument("--host-ttl", type=float, default=DEFAULT_HOST_TTL / 3600,
+                        help="Hours to remember whether a host serves text/markdown (default: %(default)g)")
+    parser.add_argument("--max-bytes", type=int, default=MAX_BYTES,
+                        help="Abort responses larger than this many bytes after decompression (default: 50 MB)")
+    parser.add_argument("--urls-file", help="Batch mode: file with one URL per line ('-' for stdin)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Batch mode: pages fetched in parallel (default: 8)")
+    parser.add_argument("--per-host", type=int, default=2, help="Batch/crawl mode: parallel requests per host (default: 2)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Batch mode: convert HTML in N worker processes (default: 0, convert in fetch threads)")
+    parser.add_argument("--manifest", default="docs/manifest.json",
+                        help="Batch mode: JSON manifest of every URL in input order (default: docs/manifest.json)")
+    parser.add_argument("--crawl", metavar="URL", help="Crawl mode: mirror pages linked from URL on the same origin")
+    parser.add_argument("--max-depth", type=int, default=3, help="Crawl mode: link hops from the start URL (default: 3)")
+    parser.add_argument("--path-prefix",
+                        help="Crawl mode: only follow links under this path (default: the start URL's directory)")
+    parser.add_argument("--max-pages", type=int, default=0,
+                        help="Crawl mode: stop after N pages, leaving the rest queued (default: 0, no limit)")
+    parser.add_argument("--state", default="docs/.crawl-state.sqlite",
+                        help="Crawl mode: resumable state file (default: docs/.crawl-state.sqlite)")
+    parser.add_argument("--index", default="docs/index.json",
+                        help="Crawl mode: JSON index of URL to file name (default: docs/index.json)")
+    args = parser.parse_args()
+
+    api_key = args.api_key or os.environ.get("CLOUDFLARE_API_KEY")
+
+    MAX_BYTES = args.max_bytes
+    if args.rules:
+        if args.engine != "regex":
+            parser.error("--rules requires --engine regex")
+        load_rules(args.rules)
+    if args.profile:
+        if args.workers:
+            parser.error("--profile cannot be combined with --workers")
+        PROFILE = RuleProfile()
+    if not args.no_cache:
+        CACHE = ResponseCache(args.cache_dir, args.cache_size * 1024 * 1024)
+        HOSTS = HostCapabilities(Path(args.cache_dir) / "hosts.json", args.host_ttl * 3600)
+
+    if args.crawl:
+        if args.url or args.output or args.urls_file:
+            parser.error("--crawl cannot be combined with a URL, --output or --urls-file")
+        if args.workers:
+            parser.error("--workers is only supported with --urls-file")
+        try:
+            failed = run_crawl(args.crawl, api_key, args.engine, args.per_host, args.max_depth,
+                               args.path_prefix, args.max_pages, args.state, args.index)
+        except ValueError as e:
+            parser.error(str(e))
+        except KeyboardInterrupt:
+            finish_run()
+            sys.exit(130)
+        finish_run()
+        sys.exit(1 if failed else 0)
+
+    if args.urls_file:
+        if args.url or args.output:
+            parser.error("--urls-file cannot be combined with a URL or --output")
+        urls = read_urls(args.urls_file)
+        failed = run_batch(urls, api_key, args.engine, args.concurrency, args.per_host,
+                           args.workers, args.rules, args.manifest)
+        finish_run()
+        sys.exit(1 if failed else 0)
+
+    if not args.url:
+        parser.error("a URL, --urls-file or --crawl is required")
+
+    page = fetch_page(args.url, api_key, args.engine)
+    out_path = save_markdown(args.url, page.markdown, args.output)
+    print(f"Connections: {POOL.format_stats()}", file=sys.stderr)
+    finish_run()
+    print(str(out_path))
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,320 @@
+"""Keep-alive connection pool and streamed body decoding for fetch_markdown.py.
+
+Reuses http.client connections per (scheme, host, port) so the markdown
+negotiation attempt, the HTML fallback and later URLs in the same run share
+one TCP/TLS handshake. Bodies are read in chunks, decompressed
+(gzip/deflate, plus br when the optional `brotli` package is installed) and
+decoded incrementally with a size cap. Stdlib only otherwise.
+
+Errors are raised as urllib.error.URLError / HTTPError so callers written
+against urllib.request.urlopen keep working unchanged.
+"""
+
+import codecs
+import http.client
+import re
+import ssl
+import threading
+import time
+import urllib.error
+import zlib
+from collections.abc import Iterable, Iterator
+from urllib.parse import urljoin, urlsplit
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+# Unread bodies up to this size are drained on close() to keep the connection
+DRAIN_LIMIT = 64 * 1024
+CHUNK_SIZE = 64 * 1024
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli else "gzip, deflate"
+
+_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+# How much of an HTML body is buffered to look for <meta charset>
+SNIFF_BYTES = 2048
+
+# Raised when a pooled connection was closed by the server while idle
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+
+
+class PooledResponse:
+    """An http.client response that hands its connection back to the pool on close().
+
+    The connection is only reused when the body was read to the end (small
+    unread bodies are drained) and the server did not ask to close it.
+    """
+
+    def __init__(self, pool: "ConnectionPool", key: tuple, conn: http.client.HTTPConnection,
+                 resp: http.client.HTTPResponse, url: str):
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._resp = resp
+        self.url = url
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.headers
+
+    def read(self, amt: int | None = None) -> bytes:
+        return self._resp.read(amt)
+
+    def close(self):
+        if self._conn is None:
+            return
+        resp = self._resp
+        if not resp.isclosed() and not resp.chunked and resp.length is not None and resp.length <= DRAIN_LIMIT:
+            try:
+                resp.read()
+            except (OSError, http.client.HTTPException):
+                pass
+        reusable = self._resp.isclosed() and not self._resp.will_close
+        self._resp.close()
+        if reusable:
+            self._pool._release(self._key, self._conn)
+        else:
+            self._conn.close()
+        self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ConnectionPool:
+    """Thread-safe pool of idle keep-alive connections keyed by scheme/host/port.
+
+    Connections idle for longer than `idle_timeout` seconds are closed on
+    the next checkout. `stats` counts opened, reused and evicted connections
+    plus requests sent.
+    """
+
+    def __init__(self, timeout: float = 15, idle_timeout: float = 30.0, max_idle_per_host: int = 4):
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.stats = {"requests": 0, "opened": 0, "reused": 0, "evicted": 0}
+        self._idle: dict[tuple, list[tuple[http.client.HTTPConnection, float]]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    # -- connection management --------------------------------------------
+
+    def _acquire(self, key: tuple) -> tuple[http.client.HTTPConnection, bool]:
+        """Return (connection, reused) for `key`, evicting expired idle ones."""
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                conn, last_used = idle.pop()
+                if now - last_used <= self.idle_timeout:
+                    self.stats["reused"] += 1
+                    return conn, True
+                self.stats["evicted"] += 1
+                conn.close()
+        return self._connect(key), False
+
+    def _connect(self, key: tuple) -> http.client.HTTPConnection:
+        """Open a new (lazily connected) connection for `key`."""
+        with self._lock:
+            self.stats["opened"] += 1
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self._ssl_context)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _release(self, key: tuple, conn: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def close(self):
+        """Close every idle connection."""
+        with self._lock:
+            for idle in self._idle.values():
+                for conn, _ in idle:
+                    conn.close()
+            self._idle.clear()
+
+    # -- requests ---------------------------------------------------------------
+
+    def _send(self, url: str, headers: dict, method: str) -> PooledResponse:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise urllib.error.URLError(f"unsupported URL scheme: {parts.scheme!r}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        conn, reused = self._acquire(key)
+        try:
+            try:
+                conn.request(method, target, headers=headers)
+                resp = conn.getresponse()
+            except _STALE_ERRORS:
+                if not reused:
+                    raise
+                # The server dropped the idle socket; retry once on a fresh one
+                conn.close()
+                conn = self._connect(key)
+                conn.request(method, target, headers=headers)
+                resp = conn.getresponse()
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            if isinstance(e, TimeoutError):
+                raise
+            raise urllib.error.URLError(e) from e
+
+        with self._lock:
+            self.stats["requests"] += 1
+        return PooledResponse(self, key, conn, resp, url)
+
+    def request(self, url: str, headers: dict | None = None, method: str = "GET") -> PooledResponse:
+        """Send a request, following redirects, and return the open response.
+
+        Raises urllib.error.HTTPError for 4xx/5xx statuses. The caller must
+        close() the response (or use it as a context manager) so the
+        connection can return to the pool.
+        """
+        headers = dict(headers or {})
+        for _ in range(MAX_REDIRECTS + 1):
+            resp = self._send(url, headers, method)
+            if resp.status in REDIRECT_CODES and resp.headers.get("Location"):
+                resp.read()
+                resp.close()
+                url = urljoin(url, resp.headers["Location"])
+                if resp.status == 303:
+                    method = "GET"
+                continue
+            if resp.status >= 400:
+                resp.read()
+                resp.close()
+                raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None) from None
+            return resp
+        raise urllib.error.URLError(f"too many redirects: {url}")
+
+    def format_stats(self) -> str:
+        s = self.stats
+        return (f"{s['requests']} requests over {s['opened']} connections "
+                f"({s['reused']} reused, {s['evicted']} evicted idle)")
+
+
+class ResponseTooLarge(urllib.error.URLError):
+    """The (decompressed) body exceeded the configured size cap."""
+
+
+class _Decompressor:
+    """Incremental Content-Encoding decoder for gzip, deflate and br."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding in ("gzip", "x-gzip"):
+            self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            self._obj = None  # zlib-wrapped or raw, decided on the first chunk
+        elif encoding == "br":
+            if brotli is None:
+                raise urllib.error.URLError("br-encoded response but the brotli package is not installed")
+            self._obj = brotli.Decompressor()
+        else:
+            raise urllib.error.URLError(f"unsupported Content-Encoding: {encoding}")
+
+    def decompress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(data)
+        if self._obj is None:
+            # Some servers send raw deflate despite RFC 9110 requiring the zlib wrapper
+            raw = (data[0] & 0x0F) != 8 if data else False
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS if raw else zlib.MAX_WBITS)
+        return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        if self.encoding == "br" or self._obj is None:
+            return b""
+        return self._obj.flush()
+
+
+def iter_body(resp, max_bytes: int | None = None, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the decompressed body of `resp` chunk by chunk.
+
+    Raises ResponseTooLarge as soon as the decompressed size passes
+    `max_bytes` (also guarding against decompression bombs), or up front
+    when an identity-encoded Content-Length already exceeds it.
+    """
+    encoding = (resp.headers.get("Content-Encoding") or "identity").strip().lower()
+    decompressor = None if encoding == "identity" else _Decompressor(encoding)
+    length = resp.headers.get("Content-Length")
+    if max_bytes and decompressor is None and length and length.isdigit() and int(length) > max_bytes:
+        raise ResponseTooLarge(f"response is {int(length)} bytes, over the {max_bytes} byte limit")
+
+    total = 0
+    while True:
+        chunk = resp.read(chunk_size)
+        if not chunk:
+            break
+        if decompressor is not None:
+            chunk = decompressor.decompress(chunk)
+        total += len(chunk)
+        if max_bytes and total > max_bytes:
+            raise ResponseTooLarge(f"response exceeded the {max_bytes} byte limit")
+        if chunk:
+            yield chunk
+    if decompressor is not None:
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+
+def charset_from_content_type(content_type: str) -> str | None:
+    m = _CHARSET_RE.search(content_type or "")
+    return m.group(1) if m else None
+
+
+def _codec_name(charset: str | None) -> str:
+    """Normalise a declared charset to a codec name, defaulting to UTF-8 (BOM-aware)."""
+    try:
+        name = codecs.lookup(charset or "utf-8").name
+    except LookupError:
+        name = "utf-8"
+    return "utf-8-sig" if name == "utf-8" else name
+
+
+def iter_text(chunks: Iterable[bytes], content_type: str) -> Iterator[str]:
+    """Decode byte chunks incrementally using the response charset.
+
+    The charset comes from Content-Type, or for HTML bodies from a
+    <meta charset> / http-equiv declaration in the first SNIFF_BYTES, and
+    falls back to UTF-8. Undecodable bytes are replaced.
+    """
+    it = iter(chunks)
+    head = b""
+    charset = charset_from_content_type(content_type)
+    if charset is None and "html" in (content_type or "html"):
+        buffered = []
+        for chunk in it:
+            buffered.append(chunk)
+            if sum(map(len, buffered)) >= SNIFF_BYTES:
+                break
+        head = b"".join(buffered)
+        m = _META_CHARSET_RE.search(head[:SNIFF_BYTES])
+        if m:
+            charset = m.group(1).decode("ascii")
+
+    decoder = codecs.getincrementaldecoder(_codec_name(charset))(errors="replace")
+    if head:
+        yield decoder.decode(head)
+    for chunk in it:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
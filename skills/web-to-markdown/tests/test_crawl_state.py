@@ -0,0 +1,53 @@
+"""Tests for crawl_state.CrawlState file name assignment.
+
+Run from the skill directory:
+    python -m unittest discover tests
+"""
+
+import hashlib
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from crawl_state import CrawlState  # noqa: E402
+
+ROOT = "https://docs.example.com/guide/"
+
+
+class FilenameTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.state = CrawlState(Path(self._tmp.name) / "crawl.sqlite")
+        self.state.begin(ROOT)
+
+    def tearDown(self):
+        self.state.close()
+        self._tmp.cleanup()
+
+    def assign(self, url: str, name: str) -> str:
+        self.state.add(url, 1)
+        return self.state.filename(url, name)
+
+    def test_three_colliding_urls_get_distinct_names(self):
+        first, second, third = (ROOT + "intro", ROOT + "Intro", ROOT + "intro/")
+        third_hash = hashlib.sha1(third.encode("utf-8")).hexdigest()[:8]
+
+        self.assertEqual(self.assign(first, "intro.md"), "intro.md")
+        # Holds the name the third URL falls back to first, so it needs a counter
+        self.assertEqual(self.assign(second, f"Intro-{third_hash}.md"), f"Intro-{third_hash}.md")
+        self.assertEqual(self.assign(third, "intro.md"), f"intro-{third_hash}-2.md")
+
+        names = [self.state.filename(url, "ignored.md") for url in (first, second, third)]
+        self.assertEqual(names, ["intro.md", f"Intro-{third_hash}.md", f"intro-{third_hash}-2.md"])
+
+    def test_name_is_kept_for_a_known_url(self):
+        url = ROOT + "setup"
+        self.assertEqual(self.assign(url, "setup.md"), "setup.md")
+        self.assertEqual(self.state.filename(url, "other.md"), "setup.md")
+
+
+if __name__ == "__main__":
+    unittest.main()